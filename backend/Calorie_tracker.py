@@ -1,32 +1,79 @@
 
 import sys
+import os
 import csv
-import pandas as pd
-from difflib import get_close_matches
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.neighbors import NearestNeighbors
+import io
+import threading
+import time
+import warnings
+import numpy as np
+from catalogue import FoodCatalogue
+from food_lookup import DishLookup
+from lru_cache import LRUCache
+from metrics import MATCH_TIER, observe_stage, timed
+from tracker_model import NEIGHBOR_BACKENDS, artifact_path, build_neighbors, fit_tfidf, load_model, save_model
 
 class FoodTracker:
-    def __init__(self, csv_file: str):
+    def __init__(self, csv_file: str, artifact_root: str = None, cache_size: int = 1024, cache_ttl: float = None,
+                 ml_backend: str = "exact", ml_options: dict = None):
         """
         Initialize the FoodTracker with dataset and ML model.
         Args:
             csv_file (str): Path to CSV dataset
+            artifact_root (str): Optional directory of prebuilt model artifacts.
+                A fresh artifact for this CSV is memory-mapped instead of
+                refitting; a missing one is built and saved there. Without
+                one, the TF-IDF model is fitted on the first ML lookup.
+            cache_size (int): Max dishes kept in the result cache (0 disables it)
+            cache_ttl (float): Seconds a cached result stays valid, None for no expiry
+            ml_backend (str): Nearest-neighbour search of the ML fallback:
+                "exact" scans every dish, "lsh" searches an approximate
+                index (tracker_model.LshNeighbors) for large catalogues
+            ml_options (dict): Backend knobs, e.g. {"tables": 16, "bits": 16, "probes": 1}
         """
-        # Load dataset
-        self.data = pd.read_csv(csv_file)
-        self.data["Dish Name"] = self.data["Dish Name"].str.lower().str.strip()
-
+        if ml_backend not in NEIGHBOR_BACKENDS:
+            raise ValueError(f"Unknown ML neighbours backend: {ml_backend}")
+        self.ml_backend = ml_backend
+        self.ml_options = ml_options or {}
         # Numeric columns for nutritional info
         self.numeric_cols = ["Calories (kcal)", "Carbohydrates (g)", "Protein (g)", "Fats (g)",
                              "Free Sugar (g)", "Fibre (g)", "Sodium (mg)", "Calcium (mg)",
                              "Iron (mg)", "Vitamin C (mg)", "Folate (碌g)"]
 
-        # ML model setup
-        self.vectorizer = TfidfVectorizer()
-        self.tfidf_matrix = self.vectorizer.fit_transform(self.data["Dish Name"])
-        self.nn_model = NearestNeighbors(n_neighbors=3, metric="cosine")
-        self.nn_model.fit(self.tfidf_matrix)
+        # Dataset and ML model, from a prebuilt artifact when one matches this CSV
+        model_path = artifact_path(csv_file, artifact_root) if artifact_root else None
+        model = load_model(model_path, self.numeric_cols) if model_path else None
+        if model is not None:
+            saved_tfidf, self.data = model
+            self.dish_names = self.data.text("Dish Name").tolist()
+            self._load_tfidf = saved_tfidf.load
+        else:
+            # Streamed in chunks into compact columns instead of a DataFrame
+            self.data = FoodCatalogue.from_csv(csv_file, self.numeric_cols, lower_cols=["Dish Name"])
+            self.dish_names = self.data.text("Dish Name").tolist()
+            if model_path:
+                fitted = fit_tfidf(self.dish_names)
+                save_model(model_path, *fitted, self.data)
+                self._load_tfidf = lambda: fitted
+            else:
+                self._load_tfidf = lambda: fit_tfidf(self.dish_names)
+        self.nutrition = self.data.numeric
+        # (vectorizer, nearest-neighbour model), built on the first ML lookup
+        # so scikit-learn is not imported until a dish needs it
+        self._ml = None
+        self._ml_lock = threading.Lock()
+
+        # Lookup indexes for the exact, partial and fuzzy tiers
+        self.lookup = DishLookup(self.dish_names)
+
+        # ML fallback helpers, computed once instead of per prediction
+        with warnings.catch_warnings():
+            # An all-missing column averages to NaN, like pandas' mean
+            warnings.simplefilter("ignore", RuntimeWarning)
+            self.global_avg = {col: float(np.nanmean(self.nutrition[:, i])) for i, col in enumerate(self.numeric_cols)}
+
+        # Results per normalized dish name; a reloaded dataset gets a new tracker and cache
+        self.cache = LRUCache(cache_size, cache_ttl)
 
     def get_food_info(self, dish_name: str) -> dict:
         """
@@ -38,24 +85,86 @@ class FoodTracker:
         """
         dish_name = dish_name.lower().strip()
 
-        # Exact match
-        result = self.data[self.data["Dish Name"] == dish_name]
+        cached = self.cache.get(dish_name)
+        if cached is not None:
+            MATCH_TIER.inc(("cache",))
+            return dict(cached)
 
-        # Partial match
-        if result.empty:
-            result = self.data[self.data["Dish Name"].str.contains(dish_name, na=False)]
+        row_id = self._match_row(dish_name)
+        if row_id is not None:
+            info = self.data.row(row_id)
+        else:
+            # Fallback to ML prediction
+            info = self.predict_with_ml(dish_name)
 
-        # Fuzzy match
-        if result.empty:
-            close_matches = get_close_matches(dish_name, self.data["Dish Name"].tolist(), n=1, cutoff=0.7)
-            if close_matches:
-                result = self.data[self.data["Dish Name"] == close_matches[0]]
+        self.cache.put(dish_name, info)
+        return dict(info)
 
-        if not result.empty:
-            return result.iloc[0].to_dict()
+    def get_food_info_many(self, dish_names: list) -> list:
+        """
+        Lookup nutritional info for many dishes at once. Exact, partial and fuzzy
+        matches are resolved per dish; every remaining dish goes through a single
+        batched ML prediction.
+        Args:
+            dish_names (list of str)
+        Returns:
+            list: Nutrition info dicts, in input order
+        """
+        results = [None] * len(dish_names)
+        misses = []
+        for i, dish_name in enumerate(dish_names):
+            dish_name = dish_name.lower().strip()
+            cached = self.cache.get(dish_name)
+            if cached is not None:
+                MATCH_TIER.inc(("cache",))
+                results[i] = dict(cached)
+                continue
+            row_id = self._match_row(dish_name)
+            if row_id is not None:
+                results[i] = self.data.row(row_id)
+                self.cache.put(dish_name, dict(results[i]))
+            else:
+                misses.append((i, dish_name))
+
+        if misses:
+            predictions = self.predict_with_ml_many([dish_name for _, dish_name in misses])
+            for (i, dish_name), prediction in zip(misses, predictions):
+                results[i] = prediction
+                self.cache.put(dish_name, dict(prediction))
+        return results
+
+    def _match_row(self, dish_name: str):
+        # Exact, then partial, then fuzzy match; each tier tried is timed and
+        # the one that resolves the dish is counted
+        for tier, stage, match in (
+            ("exact", "lookup_exact", self.lookup.exact),
+            ("partial", "lookup_partial", self.lookup.partial),
+            ("fuzzy", "lookup_fuzzy", self._fuzzy),
+        ):
+            start = time.perf_counter()
+            row_id = match(dish_name)
+            observe_stage(stage, time.perf_counter() - start)
+            if row_id is not None:
+                MATCH_TIER.inc((tier,))
+                return row_id
+        return None
+
+    def _fuzzy(self, dish_name: str):
+        return self.lookup.fuzzy(dish_name, cutoff=0.7)
 
-        # Fallback to ML prediction
-        return self.predict_with_ml(dish_name)
+    def ml_model(self) -> tuple:
+        """
+        The TF-IDF vectorizer and nearest-neighbour model of the ML fallback,
+        loaded (or fitted) on first use.
+        Returns:
+            tuple: (vectorizer, neighbours model of ml_backend)
+        """
+        if self._ml is None:
+            with self._ml_lock:
+                if self._ml is None:
+                    vectorizer, tfidf_matrix = self._load_tfidf()
+                    self._ml = (vectorizer, build_neighbors(self.ml_backend, tfidf_matrix, self.ml_options))
+        return self._ml
 
     def predict_with_ml(self, dish_name: str) -> dict:
         """
@@ -66,27 +175,47 @@ class FoodTracker:
         Returns:
             dict: Predicted nutrition values
         """
-        dish_vec = self.vectorizer.transform([dish_name])
-        distances, indices = self.nn_model.kneighbors(dish_vec, n_neighbors=3)
-        similar_dishes = self.data.iloc[indices[0]]
-        avg_values = similar_dishes[self.numeric_cols].mean().to_dict()
-
-        # If all distances are high (e.g., >0.6), fallback to global average
-        if all(d > 0.6 for d in distances[0]):
-            global_avg = self.data[self.numeric_cols].mean().to_dict()
-            return {
-                "Dish Name": dish_name,
-                "Prediction": True,
-                "Warning": "No close match found. This is a rough estimate based on all foods.",
-                **global_avg
-            }
-        else:
-            return {
-                "Dish Name": dish_name,
-                "Prediction": True,
-                "Based on Similar Dishes": similar_dishes["Dish Name"].tolist(),
-                **avg_values
-            }
+        return self.predict_with_ml_many([dish_name])[0]
+
+    @timed("lookup_ml")
+    def predict_with_ml_many(self, dish_names: list) -> list:
+        """
+        Batched predict_with_ml: one transform and one kneighbors call for all
+        dishes, with neighbour averages computed over the nutrition matrix.
+        Args:
+            dish_names (list of str): Normalized dish names
+        Returns:
+            list: Predicted nutrition dicts, in input order
+        """
+        MATCH_TIER.inc(("ml",), len(dish_names))
+        vectorizer, nn_model = self.ml_model()
+        dish_vecs = vectorizer.transform(dish_names)
+        distances, indices = nn_model.kneighbors(dish_vecs, n_neighbors=min(3, len(self.data)))
+
+        # Mean of each nutrient over the neighbours, skipping missing values like pandas
+        neighbours = self.nutrition[indices]
+        present = ~np.isnan(neighbours)
+        with np.errstate(invalid="ignore"):
+            averages = np.where(present, neighbours, 0.0).sum(axis=1) / present.sum(axis=1)
+
+        predictions = []
+        for dish_name, dish_distances, rows, avg in zip(dish_names, distances, indices, averages):
+            # If all distances are high (e.g., >0.6), fallback to global average
+            if all(d > 0.6 for d in dish_distances):
+                predictions.append({
+                    "Dish Name": dish_name,
+                    "Prediction": True,
+                    "Warning": "No close match found. This is a rough estimate based on all foods.",
+                    **self.global_avg
+                })
+            else:
+                predictions.append({
+                    "Dish Name": dish_name,
+                    "Prediction": True,
+                    "Based on Similar Dishes": [self.dish_names[row] for row in rows],
+                    **dict(zip(self.numeric_cols, avg.tolist()))
+                })
+        return predictions
 
 def write_results_csv(results, path):
     if not results:
@@ -98,100 +227,31 @@ def write_results_csv(results, path):
         for row in results:
             writer.writerow(row)
 
+def results_to_csv(results) -> str:
+    """
+    Render lookup results as CSV text (header + one line per dish).
+    Columns are the union of all result keys, in first-seen order.
+    """
+    if not results:
+        return ""
+    keys = list(dict.fromkeys(key for row in results for key in row))
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=keys)
+    writer.writeheader()
+    for row in results:
+        writer.writerow(row)
+    return output.getvalue()
+
 if __name__ == "__main__":
     # Usage: python Calorie_tracker.py <food_item1> <food_item2> ...
     food_items = sys.argv[1:]
     if not food_items:
         print("Usage: python Calorie_tracker.py <food_item1> <food_item2> ...")
         sys.exit(1)
-    tracker = FoodTracker("data/Calorie_tracker.csv")
-    results = [tracker.get_food_info(item) for item in food_items]
-    write_results_csv(results, "data/Calorie_tracker.csv")
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    tracker = FoodTracker(os.path.join(base_dir, "data", "Calorie_tracker.csv"), os.path.join(base_dir, "data", "artifacts"))
+    results = tracker.get_food_info_many(food_items)
+    # Results go to their own file, never over the dataset
+    write_results_csv(results, os.path.join(base_dir, "data", "Calorie_results.csv"))
     # Also print CSV to stdout for backend parsing
-    import io
-    if results:
-        keys = results[0].keys()
-        output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=keys)
-        writer.writeheader()
-        for row in results:
-            writer.writerow(row)
-        print(output.getvalue(), end="")
-# food_tracker.py
-
-import pandas as pd
-from difflib import get_close_matches
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.neighbors import NearestNeighbors
-
-class FoodTracker:
-    def __init__(self, csv_file: str):
-        """
-        Initialize the FoodTracker with dataset and ML model.
-        Args:
-            csv_file (str): Path to CSV dataset
-        """
-        # Load dataset
-        self.data = pd.read_csv(csv_file)
-        self.data["Dish Name"] = self.data["Dish Name"].str.lower().str.strip()
-
-        # Numeric columns for nutritional info
-        self.numeric_cols = ["Calories (kcal)", "Carbohydrates (g)", "Protein (g)", "Fats (g)",
-                             "Free Sugar (g)", "Fibre (g)", "Sodium (mg)", "Calcium (mg)",
-                             "Iron (mg)", "Vitamin C (mg)", "Folate (碌g)"]
-
-        # ML model setup
-        self.vectorizer = TfidfVectorizer()
-        self.tfidf_matrix = self.vectorizer.fit_transform(self.data["Dish Name"])
-        self.nn_model = NearestNeighbors(n_neighbors=3, metric="cosine")
-        self.nn_model.fit(self.tfidf_matrix)
-
-    def get_food_info(self, dish_name: str) -> dict:
-        """
-        Lookup nutritional info for a dish. Uses exact, partial, fuzzy, or ML-based prediction.
-        Args:
-            dish_name (str)
-        Returns:
-            dict: Nutrition info
-        """
-        dish_name = dish_name.lower().strip()
-
-        # Exact match
-        result = self.data[self.data["Dish Name"] == dish_name]
-
-        # Partial match
-        if result.empty:
-            result = self.data[self.data["Dish Name"].str.contains(dish_name, na=False)]
-
-        # Fuzzy match
-        if result.empty:
-            close_matches = get_close_matches(dish_name, self.data["Dish Name"].tolist(), n=1, cutoff=0.7)
-            if close_matches:
-                result = self.data[self.data["Dish Name"] == close_matches[0]]
-
-        if not result.empty:
-            return result.iloc[0].to_dict()
-
-        # Fallback to ML prediction
-        return self.predict_with_ml(dish_name)
-
-    def predict_with_ml(self, dish_name: str) -> dict:
-        """
-        Predict nutrition info for unknown dish using nearest neighbor ML.
-        Args:
-            dish_name (str)
-        Returns:
-            dict: Predicted nutrition values
-        """
-        dish_vec = self.vectorizer.transform([dish_name])
-        distances, indices = self.nn_model.kneighbors(dish_vec, n_neighbors=3)
-
-        similar_dishes = self.data.iloc[indices[0]]
-        avg_values = similar_dishes[self.numeric_cols].mean().to_dict()
-
-        return {
-            "Dish Name": dish_name,
-            "Prediction": True,
-            "Based on Similar Dishes": similar_dishes["Dish Name"].tolist(),
-            **avg_values
-        }
\ No newline at end of file
+    print(results_to_csv(results), end="")
@@ -2,63 +2,211 @@ import csv
 import sys
 import os
 import random
-import datetime
-from fpdf import FPDF
+from array import array
+import numpy as np
+from catalogue import RecordBuilder, float_column
+from food_facets import FacetIndex, bitset_rows
+from food_index import TextIndex, row_text, row_texts
+from meal_search import MEAL_SLOTS, NUTRIENT_COLUMNS, MealSearch
+from metrics import timed
+from ranking import TieBreakers, request_seed
 
 class AyurvedicDietPlanner:
-    def __init__(self, dataset: list):
+    def __init__(self, dataset: list, backend: str = "index", tie_breakers: tuple = ()):
         """
         Initialize diet planner with a dataset.
         Args:
-            dataset (list of dicts): Parsed CSV rows or food entries
+            dataset (iterable of dicts): Parsed CSV rows or food entries; read
+                in one pass, so a generator such as iter_csv works. CSV rows
+                are kept column-wise (catalogue.FoodRecords) and handed back
+                as dict-like row views
+            backend (str): "index" for the inverted index, "columnar" for
+                vectorized pandas/NumPy scoring
+            tie_breakers (tuple): Names from ranking.TIE_BREAKERS ordering
+                equally scored foods before dataset order, e.g. ("dosha", "calories")
         """
-        self.data = dataset
-
-    def filter_foods(self, goal, concern, preferences="", restrictions="") -> list:
+        self.backend = backend
+        records = RecordBuilder()
+        facets = FacetIndex()
+        # Rows sharing a food name share an id, so multi-day plans can avoid repeats
+        name_ids = array("q")
+        names = {}
+
+        def texts():
+            # Rows are stored and indexed as they stream in
+            for food in dataset:
+                records.add(food)
+                facets.add(food)
+                name_ids.append(names.setdefault(food.get("Food Name"), len(names)))
+                yield row_text(food)
+
+        if backend == "columnar":
+            from columnar_index import ColumnarIndex
+            self.index = ColumnarIndex(texts())
+        elif backend == "index":
+            # Texts are rebuilt from the compact rows when a term needs checking
+            self.index = TextIndex(texts(), texts_of=lambda row_ids: row_texts(self.data, row_ids))
+        else:
+            raise ValueError(f"Unknown planner backend: {backend}")
+        self.data = records.finish()
+        self.facets = facets.finish()
+        self.name_ids = np.frombuffer(name_ids, dtype=np.int64)
+        # Calories/carbs/fats/protein per row for multi-day plans, NaN if unknown
+        self.nutrients = np.column_stack([float_column(self.data, col) for col in NUTRIENT_COLUMNS]) \
+            if len(self.data) else np.zeros((0, len(NUTRIENT_COLUMNS)))
+        self.tie_breakers = TieBreakers(tie_breakers, self.nutrients[:, 0], self.facets)
+
+    def query_foods(self, query: str, limit: int = None) -> list:
         """
-        Filter foods based on goals, health concerns, preferences, and restrictions.
-        Returns top 5 foods.
+        Foods matching a structured facet query, in dataset order.
+        Args:
+            query (str): Facet query, e.g. "balances Pitta AND Veg AND NOT dairy"
+                (see food_facets.FacetIndex.query)
+            limit (int): Optional maximum number of foods
+        Returns:
+            list: Matching rows
+        Raises:
+            FacetQueryError: Malformed query
         """
-        goal = goal.lower()
-        concern = concern.lower()
-        preferences = preferences.lower()
-        restrictions = restrictions.lower()
-
-        scored_foods = []
-
-        for food in self.data:
-            text = " ".join(str(food.values())).lower()
+        row_ids = bitset_rows(self.facets.query(query))[:limit]
+        return [self.data[row_id] for row_id in row_ids.tolist()]
 
-            # Skip foods violating restrictions
-            if restrictions and restrictions in text:
-                continue
-
-            # Scoring
-            score = 0
-            if goal in text: score += 3
-            if concern in text: score += 2
-            if preferences and preferences in text: score += 2
-            if "tridoshic" in text: score += 1
-
-            scored_foods.append((score, food))
+    def count_foods(self, query: str) -> int:
+        """
+        Number of foods matching a facet query, without listing them.
+        Raises:
+            FacetQueryError: Malformed query
+        """
+        return self.facets.query(query).bit_count()
 
-        # Sort by score descending
-        scored_foods.sort(key=lambda x: x[0], reverse=True)
+    @timed("filter_foods")
+    def filter_foods(self, goal, concern, preferences="", restrictions="", query="", seed=None) -> list:
+        """
+        Filter foods based on goals, health concerns, preferences, and restrictions.
+        A facet query, if given, limits the candidates to the foods it matches.
+        Returns top 5 foods. If none score, 5 random foods drawn with seed, or
+        a seed derived from the request, so equal requests get equal foods.
+        """
+        return self._filter_foods(self.index.search, goal, concern, preferences, restrictions, query, seed)
 
-        top_foods = [food for score, food in scored_foods if score > 0]
+    def _filter_foods(self, search, goal, concern, preferences, restrictions, query="", seed=None) -> list:
+        goal, concern = goal.lower(), concern.lower()
+        preferences, restrictions = preferences.lower(), restrictions.lower()
+        allowed = self.facets.query(query) if query else None
+        ranked = self.index.rank(search, goal, concern, preferences, restrictions, k=5, allowed=allowed,
+                                 tie_keys=self.tie_breakers.keys(goal, concern, preferences))
+        top_foods = [self.data[row_id] for row_id in ranked]
 
         # Fallback to random if no scoring foods
         if not top_foods:
-            top_foods = random.sample(self.data, min(5, len(self.data)))
+            rnd = random.Random(request_seed(goal, concern, preferences, restrictions, query)
+                                if seed is None else seed)
+            if allowed is None:
+                top_foods = rnd.sample(self.data, min(5, len(self.data)))
+            else:
+                row_ids = bitset_rows(allowed).tolist()
+                top_foods = [self.data[row_id] for row_id in rnd.sample(row_ids, min(5, len(row_ids)))]
 
         return top_foods[:5]
 
-    def generate_plan(self, goal, concern, preferences="", restrictions="") -> dict:
+    @timed("generate_plan")
+    def generate_plan(self, goal, concern, preferences="", restrictions="", query="", seed=None) -> dict:
         """
         Generate diet plan with meals: Breakfast, Lunch, Snack, Dinner, Drink
         """
-        foods = self.filter_foods(goal, concern, preferences, restrictions)
+        foods = self.filter_foods(goal, concern, preferences, restrictions, query, seed)
+        return self._plan_from_foods(foods)
 
+    @timed("generate_plans")
+    def generate_plans(self, requests: list) -> list:
+        """
+        Generate diet plans for a whole batch of requests.
+        Identical (goal, concern, preferences, restrictions) tuples are planned
+        once, and each distinct term is looked up in the index once per batch.
+        Args:
+            requests (list of dicts): Keys "goal" and optionally "concern",
+                "preferences", "restrictions", "query" (facet query), "seed"
+                (random fallback)
+        Returns:
+            list: One plan dict per request, in request order
+        """
+        matches = {}
+
+        def search(term):
+            if term not in matches:
+                matches[term] = self.index.search(term)
+            return matches[term]
+
+        plans = {}
+        results = []
+        for request in requests:
+            key = tuple(request.get(field, "").lower()
+                        for field in ("goal", "concern", "preferences", "restrictions", "query"))
+            key += (request.get("seed"),)
+            if key not in plans:
+                plans[key] = self._plan_from_foods(self._filter_foods(search, *key))
+            results.append(dict(plans[key]))
+        return results
+
+    @timed("generate_week_plan")
+    def generate_week_plan(self, goal, concern, preferences="", restrictions="", query="", days=7,
+                           calories=2000.0, carbs=None, fats=None, protein=None, no_repeat_days=7) -> dict:
+        """
+        Plan Breakfast, Lunch, Snack, Dinner and Drink for several days.
+        Foods matching the restrictions (or outside the facet query) are never
+        used, daily totals are kept near the calorie and macro targets, foods
+        relevant to the goal/concern are preferred, and no food repeats
+        within no_repeat_days days (shortened if there are too few foods).
+        Args:
+            days (int): Number of days, 1 to 31
+            calories (float): Daily calorie target
+            carbs, fats, protein (float): Optional daily targets in grams
+            no_repeat_days (int): Window in days within which a food is not
+                repeated (1 = only not twice in one day, 0 = no limit)
+        Returns:
+            dict: "days" (per day "meals" and nutrient "totals"), "targets"
+                and the "no_repeat_days" applied, or a fallback "message"
+        """
+        if not 1 <= days <= 31:
+            raise ValueError("days must be between 1 and 31")
+        if no_repeat_days < 0:
+            raise ValueError("no_repeat_days must not be negative")
+        if not calories or calories <= 0:
+            raise ValueError("calories must be positive")
+        targets = np.array([calories, carbs, fats, protein], dtype=np.float64)
+        if np.any(targets[~np.isnan(targets)] <= 0):
+            raise ValueError("nutrient targets must be positive")
+
+        allowed = self.facets.query(query) if query else None
+        scores = self.index.score_array(self.index.search, goal.lower(), concern.lower(),
+                                        preferences.lower(), restrictions.lower(), allowed)
+        candidates = np.flatnonzero((scores >= 0) & ~np.isnan(self.nutrients).any(axis=1))
+        # The dataset lists some foods more than once; keep each name's best row
+        best_first = candidates[np.argsort(-scores[candidates], kind="stable")]
+        _, first = np.unique(self.name_ids[best_first], return_index=True)
+        candidates = np.sort(best_first[first])
+        if not candidates.size:
+            return self._plan_from_foods([])
+
+        window = min(no_repeat_days, days, candidates.size // len(MEAL_SLOTS))
+        search = MealSearch(self.nutrients[candidates], scores[candidates], targets)
+        plan = search.search(days, window)
+
+        week = []
+        for day, picks in enumerate(plan, start=1):
+            row_ids = candidates[picks]
+            week.append({
+                "day": day,
+                "meals": {slot: self.data[row_id]["Food Name"] for slot, row_id in zip(MEAL_SLOTS, row_ids.tolist())},
+                "totals": dict(zip(NUTRIENT_COLUMNS, self.nutrients[row_ids].sum(axis=0).round(1).tolist())),
+            })
+        return {
+            "days": week,
+            "targets": {col: target for col, target in zip(NUTRIENT_COLUMNS, targets.tolist()) if not np.isnan(target)},
+            "no_repeat_days": window,
+        }
+
+    def _plan_from_foods(self, foods: list) -> dict:
         if not foods:
             return {"message": "Fallback: Try basic sattvic diet (fruits, rice, lentils, ghee, herbal teas)."}
 
@@ -72,10 +220,25 @@ class AyurvedicDietPlanner:
         return plan
 
 
-def read_csv(path):
+def iter_csv(path):
+    """
+    Yield the rows of a CSV file one at a time.
+    """
     with open(path, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        return [row for row in reader]
+        yield from csv.DictReader(f)
+
+
+@timed("read_csv")
+def read_csv(path):
+    return list(iter_csv(path))
+
+
+@timed("load_planner")
+def load_planner(path, backend="index", tie_breakers=()):
+    """
+    Build a planner straight from a dataset CSV path, streaming its rows.
+    """
+    return AyurvedicDietPlanner(iter_csv(path), backend, tie_breakers)
 
 
 # Robust main for any working directory
@@ -92,76 +255,8 @@ if __name__ == "__main__":
     base_dir = os.path.dirname(os.path.abspath(__file__))
     data_path = os.path.join(base_dir, "data", "Diet_generator.csv")
     out_path = os.path.join(base_dir, "data", "Diet_chart.pdf")
-    dataset = read_csv(data_path)
-    planner = AyurvedicDietPlanner(dataset)
+    planner = load_planner(data_path)
     plan = planner.generate_plan(goal, concern, "", restrictions)
-    write_plan_pdf(plan, out_path, goal, concern, restrictions)
-# ayurvedic_diet_planner.py
-
-import random
-
-class AyurvedicDietPlanner:
-    def __init__(self, dataset: list):
-        """
-        Initialize diet planner with a dataset.
-        Args:
-            dataset (list of dicts): Parsed CSV rows or food entries
-        """
-        self.data = dataset
-
-    def filter_foods(self, goal, concern, preferences="", restrictions="") -> list:
-        """
-        Filter foods based on goals, health concerns, preferences, and restrictions.
-        Returns top 5 foods.
-        """
-        goal = goal.lower()
-        concern = concern.lower()
-        preferences = preferences.lower()
-        restrictions = restrictions.lower()
-
-        scored_foods = []
-
-        for food in self.data:
-            text = " ".join(str(food.values())).lower()
-
-            # Skip foods violating restrictions
-            if restrictions and restrictions in text:
-                continue
-
-            # Scoring
-            score = 0
-            if goal in text: score += 3
-            if concern in text: score += 2
-            if preferences and preferences in text: score += 2
-            if "tridoshic" in text: score += 1
-
-            scored_foods.append((score, food))
-
-        # Sort by score descending
-        scored_foods.sort(key=lambda x: x[0], reverse=True)
-
-        top_foods = [food for score, food in scored_foods if score > 0]
-
-        # Fallback to random if no scoring foods
-        if not top_foods:
-            top_foods = random.sample(self.data, min(5, len(self.data)))
-
-        return top_foods[:5]
-
-    def generate_plan(self, goal, concern, preferences="", restrictions="") -> dict:
-        """
-        Generate diet plan with meals: Breakfast, Lunch, Snack, Dinner, Drink
-        """
-        foods = self.filter_foods(goal, concern, preferences, restrictions)
-
-        if not foods:
-            return {"message": "Fallback: Try basic sattvic diet (fruits, rice, lentils, ghee, herbal teas)."}
-
-        plan = {
-            "Breakfast": foods[0]["Food Name"],
-            "Lunch": foods[1]["Food Name"] if len(foods) > 1 else foods[0]["Food Name"],
-            "Snack": foods[2]["Food Name"] if len(foods) > 2 else foods[0]["Food Name"],
-            "Dinner": foods[3]["Food Name"] if len(foods) > 3 else foods[0]["Food Name"],
-            "Drink": foods[4]["Food Name"] if len(foods) > 4 else "Herbal tea (Tulsi, Ginger, or Cumin)"
-        }
-        return plan
\ No newline at end of file
+    # Imported here so importing the planner does not load the PDF code
+    from simple_pdf import create_simple_diet_pdf
+    create_simple_diet_pdf(plan, out_path, goal, concern, restrictions)
@@ -1,14 +1,157 @@
-from fastapi import FastAPI, UploadFile, Form
+from fastapi import FastAPI, UploadFile, Form, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 from typing import List, Optional
+from contextlib import asynccontextmanager
 import os
+import re
+import sys
+import io
+import math
 import datetime
-import subprocess
+import zipfile
+import functools
+import threading
+import anyio
 
+# Backend modules live one level up; add them to the path once at import time
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.abspath(os.path.join(BASE_DIR, ".."))
+if BACKEND_DIR not in sys.path:
+    sys.path.append(BACKEND_DIR)
 
-app = FastAPI()
+from Diet_Generator import load_planner
+from food_facets import FacetQueryError
+from Calorie_tracker import FoodTracker, results_to_csv
+from render_pool import RenderPool, RenderPoolBusy, RenderTimeout
+from simple_pdf import TEMPLATE_VERSION, UnsupportedTextError, check_chart_text, get_template
+from pdf_cache import PdfCache
+from dataset_registry import DatasetRegistry
+from food_log import FoodLogStore
+from metrics import REGISTRY, RequestMetrics, format_value
+
+# Datasets; overridable so benchmarks can serve synthetic catalogues
+DIET_DATA_PATH = os.environ.get("DIET_DATA_PATH", os.path.join(BACKEND_DIR, "data", "Diet_generator.csv"))
+CALORIE_DATA_PATH = os.environ.get("CALORIE_DATA_PATH", os.path.join(BACKEND_DIR, "data", "Calorie_tracker.csv"))
+# Food log entries, one row per logged dish
+LOG_DB_PATH = os.environ.get("LOG_DB_PATH", os.path.join(BACKEND_DIR, "data", "food_log.sqlite3"))
+# Fitted calorie-tracker models, one directory per CSV content hash
+ARTIFACT_ROOT = os.environ.get("ARTIFACT_ROOT", os.path.join(BACKEND_DIR, "data", "artifacts"))
+
+# Rendered diet charts, keyed by a hash of the plan and patient fields
+CHART_CACHE_DIR = os.environ.get("CHART_CACHE_DIR", os.path.join(BACKEND_DIR, "data", "chart_cache"))
+CHART_CACHE_SIZE = int(os.environ.get("CHART_CACHE_SIZE", "1000"))
+
+# Scoring backend for the planner: "index" (default) or "columnar"
+DIET_PLANNER_BACKEND = os.environ.get("DIET_PLANNER_BACKEND", "index")
+# Comma-separated order for equally scored foods, e.g. "dosha,calories"; dataset order by default
+DIET_TIE_BREAKERS = tuple(filter(None, os.environ.get("DIET_TIE_BREAKERS", "").replace(" ", "").split(",")))
+
+# One planner per worker process, rebuilt only when the CSV content changes
+diet_registry = DatasetRegistry(
+    DIET_DATA_PATH,
+    lambda path: load_planner(path, DIET_PLANNER_BACKEND, DIET_TIE_BREAKERS),
+)
+
+# Nutrition lookup result cache per worker: max dishes and optional TTL in seconds
+FOOD_CACHE_SIZE = int(os.environ.get("FOOD_CACHE_SIZE", "1024"))
+FOOD_CACHE_TTL = float(os.environ["FOOD_CACHE_TTL"]) if os.environ.get("FOOD_CACHE_TTL") else None
+
+# Nearest-neighbour search for unknown dishes: "exact" (default) or "lsh" (approximate,
+# for large catalogues) with its hash tables, bits per table and multiprobe (0 or 1)
+ML_NEIGHBORS = os.environ.get("ML_NEIGHBORS", "exact")
+ML_LSH_OPTIONS = {
+    "tables": int(os.environ.get("ML_LSH_TABLES", "16")),
+    "bits": int(os.environ.get("ML_LSH_BITS", "16")),
+    "probes": int(os.environ.get("ML_LSH_PROBES", "1")),
+}
+
+# Same for the calorie tracker; workers memory-map one shared model artifact
+calorie_registry = DatasetRegistry(
+    CALORIE_DATA_PATH,
+    lambda path: FoodTracker(path, ARTIFACT_ROOT, FOOD_CACHE_SIZE, FOOD_CACHE_TTL,
+                             ML_NEIGHBORS, ML_LSH_OPTIONS if ML_NEIGHBORS == "lsh" else None),
+)
+
+chart_cache = PdfCache(CHART_CACHE_DIR, CHART_CACHE_SIZE)
+food_log = FoodLogStore(LOG_DB_PATH)
+
+# PDF rendering runs in worker processes; 0 workers renders in the request thread.
+# Beyond RENDER_QUEUE_DEPTH jobs in flight, chart requests get a 503 + Retry-After.
+# On a single core the worker round-trip only adds overhead, so the default is 0 there.
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", str(os.cpu_count() if (os.cpu_count() or 1) > 1 else 0)))
+RENDER_QUEUE_DEPTH = int(os.environ.get("RENDER_QUEUE_DEPTH", str(max(1, RENDER_WORKERS) * 4)))
+RENDER_TIMEOUT = float(os.environ.get("RENDER_TIMEOUT", "10"))
+RENDER_RETRY_AFTER = os.environ.get("RENDER_RETRY_AFTER", "1")
+
+render_pool = RenderPool(RENDER_WORKERS, RENDER_QUEUE_DEPTH, RENDER_TIMEOUT)
+
+# Opt-in sampling profiler: a share of requests (e.g. 0.01), and/or any request
+# sending "X-Profile: 1" if PROFILE_ON_REQUEST=1. Folded stacks go to PROFILE_DIR.
+# Each profile samples every thread of the worker while the request runs, so
+# requests served concurrently show up in it too.
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_ON_REQUEST = os.environ.get("PROFILE_ON_REQUEST", "0") == "1"
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(BACKEND_DIR, "data", "profiles"))
+
+def render_busy_response() -> JSONResponse:
+    return JSONResponse(
+        {"error": "Diet chart rendering is at capacity, please retry shortly."},
+        status_code=503,
+        headers={"Retry-After": RENDER_RETRY_AFTER},
+    )
+
+def render_timeout_response() -> JSONResponse:
+    return JSONResponse({"error": "Diet chart rendering timed out."}, status_code=504)
+
+# Blocking work runs in threads, with a concurrency limit per stage so one
+# slow stage cannot take every thread: "plan" (planner and zip packaging),
+# "lookup" (nutrition lookups) and "io" (log database and chart cache files).
+STAGE_CONCURRENCY = {
+    "plan": int(os.environ.get("PLAN_CONCURRENCY", "4")),
+    "lookup": int(os.environ.get("LOOKUP_CONCURRENCY", "4")),
+    "io": int(os.environ.get("IO_CONCURRENCY", "8")),
+}
+stage_limiters = {}
+
+async def run_stage(stage: str, fn, *args):
+    limiter = stage_limiters.get(stage)
+    if limiter is None:
+        limiter = stage_limiters[stage] = anyio.CapacityLimiter(STAGE_CONCURRENCY[stage])
+    return await anyio.to_thread.run_sync(functools.partial(fn, *args), limiter=limiter)
+
+
+# Load scikit-learn (ML fallback) and fpdf (chart template) in the background
+# after startup instead of on the first request that needs them
+WARM_UP = os.environ.get("WARM_UP", "1") == "1"
+
+def warm_up():
+    calorie_registry.get().ml_model()
+    if RENDER_WORKERS <= 0:
+        get_template()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the datasets before serving the first request
+    diet_registry.load()
+    calorie_registry.load()
+    render_pool.start()
+    if WARM_UP:
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    yield
+    render_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(
+    RequestMetrics,
+    profile_rate=PROFILE_SAMPLE_RATE,
+    profile_header=PROFILE_ON_REQUEST,
+    profile_dir=PROFILE_DIR,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:5173", "http://localhost:8001", "http://localhost:8002"],
@@ -22,80 +165,308 @@ class DietRequest(BaseModel):
     goal: str
     concern: str = ""
     restrictions: str = ""
+    query: str = ""  # Facet query, e.g. "balances Pitta AND Veg AND NOT dairy"
+    seed: Optional[int] = None  # Random fallback seed; derived from the request if unset
     patient_name: str = "Patient"
     patient_age: int = 30
     patient_gender: str = "Not specified"
     patient_height: Optional[float] = None
     patient_weight: Optional[float] = None
 
+def plan_for(request: DietRequest) -> dict:
+    # Generate diet plan from the shared, preloaded planner
+    planner = diet_registry.get()
+    return planner.generate_plan(request.goal, request.concern, "", request.restrictions, request.query, request.seed)
+
+def facet_query_response(e: FacetQueryError) -> JSONResponse:
+    return JSONResponse({"error": f"Invalid food query: {str(e)}"}, status_code=400)
+
+def chart_key(chart_fields: list) -> str:
+    # Also keyed by the template version and today's date, which the chart prints
+    return chart_cache.key(TEMPLATE_VERSION, datetime.date.today().isoformat(), *chart_fields)
+
+def check_patient_text(request: DietRequest):
+    # Rejected before planning; food names are checked again when rendering
+    check_chart_text(goal=request.goal, concern=request.concern, restrictions=request.restrictions,
+                     patient_name=request.patient_name, patient_gender=request.patient_gender)
+
+def chart_text_response(e: UnsupportedTextError) -> JSONResponse:
+    return JSONResponse({"error": f"Invalid chart text: {str(e)}"}, status_code=400)
+
 @app.post("/generate-diet-chart")
-def generate_diet_chart(request: DietRequest):
-    # Always resolve paths relative to this file
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    script_path = os.path.abspath(os.path.join(base_dir, "..", "Diet_Generator.py"))
-    pdf_path = os.path.abspath(os.path.join(base_dir, "..", "data", "Diet_chart.pdf"))
-    
-    # Create enhanced diet plan using the Python script directly
-    import sys
-    sys.path.append(os.path.join(base_dir, ".."))
+async def generate_diet_chart(request: DietRequest):
     try:
-        from Diet_Generator import AyurvedicDietPlanner, read_csv
-        from simple_pdf import create_simple_diet_pdf
-    except ImportError as e:
-        return JSONResponse({"error": f"Import error: {str(e)}"}, status_code=500)
-    
-    try:
-        # Read the dataset
-        data_path = os.path.join(base_dir, "..", "data", "Diet_generator.csv")
-        dataset = read_csv(data_path)
-        
-        # Generate diet plan
-        planner = AyurvedicDietPlanner(dataset)
-        plan = planner.generate_plan(request.goal, request.concern, "", request.restrictions)
-        
-        # Create enhanced PDF with patient details
-        create_simple_diet_pdf(
-            plan, 
-            pdf_path, 
-            request.goal, 
-            request.concern, 
+        check_patient_text(request)
+        plan = await run_stage("plan", plan_for, request)
+
+        # Identical plan + patient fields are served from the chart cache
+        chart_fields = [
+            plan,
+            request.goal,
+            request.concern,
             request.restrictions,
             request.patient_name,
             request.patient_age,
             request.patient_gender,
             request.patient_height,
             request.patient_weight
+        ]
+        cache_key = chart_key(chart_fields)
+        pdf_bytes = await run_stage("io", chart_cache.get, cache_key)
+        store = None
+        if pdf_bytes is None:
+            # Rendered in a worker process, into its own in-memory buffer
+            pdf_bytes = await render_pool.render_async(*chart_fields)
+            # Written to the cache after the response is sent
+            store = BackgroundTask(run_stage, "io", chart_cache.put, cache_key, pdf_bytes)
+
+        return Response(
+            pdf_bytes,
+            media_type="application/pdf",
+            headers={"Content-Disposition": 'attachment; filename="Diet_chart.pdf"'},
+            background=store,
         )
-        
-        if not os.path.exists(pdf_path):
-            return JSONResponse({"error": "Diet chart PDF was not generated."}, status_code=500)
-        return FileResponse(pdf_path, filename="Diet_chart.pdf")
+    except FacetQueryError as e:
+        return facet_query_response(e)
+    except UnsupportedTextError as e:
+        return chart_text_response(e)
+    except RenderPoolBusy:
+        return render_busy_response()
+    except RenderTimeout:
+        return render_timeout_response()
     except Exception as e:
         return JSONResponse({"error": f"Error generating diet chart: {str(e)}"}, status_code=500)
 
+# --- Batch Diet Generator Endpoint ---
+class BatchDietRequest(BaseModel):
+    requests: List[DietRequest]
+    format: str = "json"  # "json" for a list of plans, "zip" for one PDF per patient
+
+def plans_for(batch: BatchDietRequest) -> list:
+    planner = diet_registry.get()
+    return planner.generate_plans([
+        {"goal": r.goal, "concern": r.concern, "restrictions": r.restrictions, "query": r.query, "seed": r.seed}
+        for r in batch.requests
+    ])
+
+def zip_charts(batch: BatchDietRequest, pdfs: list) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for i, (r, pdf_bytes) in enumerate(zip(batch.requests, pdfs), start=1):
+            safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", r.patient_name).strip("_") or "Patient"
+            archive.writestr(f"{i:03d}_{safe_name}_Diet_chart.pdf", pdf_bytes)
+    return buffer.getvalue()
+
+@app.post("/generate-diet-charts/batch")
+async def generate_diet_charts_batch(batch: BatchDietRequest):
+    try:
+        plans = await run_stage("plan", plans_for, batch)
+
+        if batch.format != "zip":
+            return JSONResponse({"plans": [
+                {"patient_name": r.patient_name, "plan": plan}
+                for r, plan in zip(batch.requests, plans)
+            ]})
+
+        for r in batch.requests:
+            check_patient_text(r)
+        # Charts are rendered across the worker processes, one chunk per worker
+        pdfs = await render_pool.render_many_async([
+            (
+                plan,
+                r.goal,
+                r.concern,
+                r.restrictions,
+                r.patient_name,
+                r.patient_age,
+                r.patient_gender,
+                r.patient_height,
+                r.patient_weight
+            )
+            for r, plan in zip(batch.requests, plans)
+        ])
+
+        return Response(
+            await run_stage("plan", zip_charts, batch, pdfs),
+            media_type="application/zip",
+            headers={"Content-Disposition": 'attachment; filename="Diet_charts.zip"'},
+        )
+    except FacetQueryError as e:
+        return facet_query_response(e)
+    except UnsupportedTextError as e:
+        return chart_text_response(e)
+    except RenderPoolBusy:
+        return render_busy_response()
+    except RenderTimeout:
+        return render_timeout_response()
+    except Exception as e:
+        return JSONResponse({"error": f"Error generating diet charts: {str(e)}"}, status_code=500)
+
+# --- Weekly Diet Plan Endpoint ---
+class WeekPlanRequest(BaseModel):
+    goal: str
+    concern: str = ""
+    restrictions: str = ""
+    query: str = ""
+    days: int = 7
+    calories: float = 2000  # Daily targets; macros in grams, optional
+    carbs: Optional[float] = None
+    fats: Optional[float] = None
+    protein: Optional[float] = None
+    no_repeat_days: int = 7
+
+def week_plan_for(request: WeekPlanRequest) -> dict:
+    planner = diet_registry.get()
+    return planner.generate_week_plan(
+        request.goal, request.concern, "", request.restrictions, request.query, request.days,
+        request.calories, request.carbs, request.fats, request.protein, request.no_repeat_days,
+    )
+
+@app.post("/generate-week-plan")
+async def generate_week_plan(request: WeekPlanRequest):
+    # Meals for each day, kept near the calorie/macro targets without repeats in the window
+    try:
+        return await run_stage("plan", week_plan_for, request)
+    except FacetQueryError as e:
+        return facet_query_response(e)
+    except ValueError as e:
+        return JSONResponse({"error": f"Invalid week plan request: {str(e)}"}, status_code=400)
+
+# --- Food Facet Query ---
+def query_foods(query: str, limit: int) -> dict:
+    planner = diet_registry.get()
+    foods = planner.query_foods(query, limit)
+    return {"query": query, "count": planner.count_foods(query), "foods": [dict(food) for food in foods]}
+
+@app.get("/foods")
+async def get_foods(query: str = "", limit: int = Query(50, ge=0)):
+    # Foods matching a structured facet query, e.g. "balances Pitta AND Veg AND NOT dairy"
+    try:
+        return await run_stage("plan", query_foods, query, limit)
+    except FacetQueryError as e:
+        return facet_query_response(e)
+
+def food_facets() -> dict:
+    return diet_registry.get().facets.values()
+
+@app.get("/foods/facets")
+async def get_food_facets():
+    # Facet -> value -> number of foods, for building queries
+    return await run_stage("plan", food_facets)
+
 # --- Calorie Tracker Endpoint ---
 class FoodLogRequest(BaseModel):
     food_items: List[str]
-    date: Optional[str] = None  # YYYY-MM-DD
+    date: Optional[datetime.date] = None  # YYYY-MM-DD, today if unset; anything else is a 422
+    patient_id: str = ""
+
+def json_ready(info: dict) -> dict:
+    # numpy scalars -> plain Python values, NaN -> null
+    clean = {}
+    for key, value in info.items():
+        if hasattr(value, "item"):
+            value = value.item()
+        if isinstance(value, float) and math.isnan(value):
+            value = None
+        clean[key] = value
+    return clean
+
+def lookup_foods(food_items: List[str]) -> tuple:
+    tracker = calorie_registry.get()
+    results = [json_ready(info) for info in tracker.get_food_info_many(food_items)]
+    return results, tracker.numeric_cols
 
 @app.post("/track-calories")
-def track_calories(request: FoodLogRequest):
-    # Call Calorie_tracker.py with food items
-    # Assume it returns calorie/nutrient info
-    args = ["python3", "../Calorie_tracker.py"] + request.food_items
-    result = subprocess.run(args, capture_output=True, text=True)
-    # Store log by date
-    log_date = request.date or datetime.date.today().isoformat()
-    log_path = f"../data/log_{log_date}.txt"
-    with open(log_path, "a") as f:
-        f.write(result.stdout + "\n")
-    return JSONResponse({"result": result.stdout, "date": log_date})
+async def track_calories(request: FoodLogRequest):
+    log_date = (request.date or datetime.date.today()).isoformat()
+    try:
+        results, numeric_cols = await run_stage("lookup", lookup_foods, request.food_items)
+        # Store log by date
+        await run_stage("io", food_log.append, log_date, results, numeric_cols, request.patient_id)
+    except Exception as e:
+        return JSONResponse({"error": f"Error tracking calories: {str(e)}"}, status_code=500)
+    return JSONResponse({"result": results, "date": log_date})
 
 # --- Daily Log Retrieval ---
+def read_log(date: str, patient_id: Optional[str]) -> dict:
+    entries = food_log.entries(date, date, patient_id)
+    if not entries:
+        return {"log": "No log found for this date."}
+    return {
+        "log": results_to_csv(entries),
+        "entries": entries,
+        "totals": food_log.daily_totals(date, date, patient_id).get(date, {}),
+    }
+
 @app.get("/get-log/{date}")
-def get_log(date: str):
-    log_path = f"../data/log_{date}.txt"
-    if os.path.exists(log_path):
-        with open(log_path) as f:
-            return {"log": f.read()}
-    return {"log": "No log found for this date."}
+async def get_log(date: str, patient_id: Optional[str] = None):
+    return await run_stage("io", read_log, date, patient_id)
+
+# --- Log Range Query ---
+def read_logs(start: str, end: str, patient_id: Optional[str]) -> dict:
+    return {
+        "start": start,
+        "end": end,
+        "entries": food_log.entries(start, end, patient_id),
+        "daily_totals": food_log.daily_totals(start, end, patient_id),
+    }
+
+@app.get("/logs")
+async def get_logs(start: str, end: Optional[str] = None, patient_id: Optional[str] = None):
+    # Entries and per-day nutrient totals for start..end (YYYY-MM-DD, inclusive)
+    return await run_stage("io", read_logs, start, end or start, patient_id)
+
+# --- Nutrient Summary ---
+@app.get("/nutrition-summary")
+async def nutrition_summary(patient_id: Optional[str] = None, start: Optional[str] = None,
+                            end: Optional[str] = None, period: str = "day"):
+    # Daily or weekly totals from the rollups; defaults to the last 30 days
+    try:
+        end_date = datetime.date.fromisoformat(end) if end else datetime.date.today()
+        start_date = datetime.date.fromisoformat(start) if start else end_date - datetime.timedelta(days=29)
+        periods = await run_stage("io", food_log.summary, start_date.isoformat(), end_date.isoformat(), patient_id, period)
+    except ValueError as e:
+        return JSONResponse({"error": f"Invalid summary request: {str(e)}"}, status_code=400)
+    return {
+        "patient_id": patient_id,
+        "start": start_date.isoformat(),
+        "end": end_date.isoformat(),
+        "period": period,
+        "periods": periods,
+    }
+
+# --- Nutrition Cache Metrics ---
+@app.get("/metrics/cache")
+async def cache_metrics():
+    # Counters restart when the calorie dataset reloads (new tracker, new cache)
+    tracker = await run_stage("io", calorie_registry.get)
+    return {"dataset_version": calorie_registry.version, **tracker.cache.stats()}
+
+# --- Prometheus Metrics ---
+def cache_metric_lines() -> list:
+    # Nutrition cache counters and dataset versions, read at scrape time
+    lines = [
+        "# HELP aahaar_dataset_version Times each dataset has been (re)loaded by this process.",
+        "# TYPE aahaar_dataset_version gauge",
+        f'aahaar_dataset_version{{dataset="diet"}} {diet_registry.version}',
+        f'aahaar_dataset_version{{dataset="calorie"}} {calorie_registry.version}',
+    ]
+    tracker = calorie_registry.value
+    if tracker is None:
+        return lines
+    stats = tracker.cache.stats()
+    for key in ("hits", "misses", "evictions", "expirations"):
+        lines += [f"# HELP aahaar_food_cache_{key}_total Nutrition cache {key} since the dataset loaded.",
+                  f"# TYPE aahaar_food_cache_{key}_total counter",
+                  f"aahaar_food_cache_{key}_total {stats[key]}"]
+    lines += ["# HELP aahaar_food_cache_entries Dishes currently in the nutrition cache.",
+              "# TYPE aahaar_food_cache_entries gauge",
+              f"aahaar_food_cache_entries {format_value(stats['size'])}"]
+    return lines
+
+REGISTRY.add_collector(cache_metric_lines)
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    # Stage latency histograms, lookup tier counters and request latencies of this worker process
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
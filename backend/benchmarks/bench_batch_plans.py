@@ -0,0 +1,69 @@
+# Usage: python benchmarks/bench_batch_plans.py [batch_size]
+# Compares one batch of N plans against N single plans, both on the planner
+# directly and through the API (single PDF calls vs one zip of PDFs).
+
+import os
+import random
+import sys
+import time
+import warnings
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.join(BACKEND_DIR, "api"))
+
+from Diet_Generator import load_planner
+
+GOALS = ["weight_management", "digestive_health", "energy_vitality", "stress_management", "general_wellness"]
+CONCERNS = ["irregular_digestion", "low_energy", "sleep_issues", "stress_anxiety", "joint_pain", "pitta", "vata"]
+RESTRICTIONS = ["", "", "dairy", "non-veg", "nuts"]
+
+
+def roster(n, seed=0):
+    rnd = random.Random(seed)
+    return [
+        {
+            "goal": rnd.choice(GOALS),
+            "concern": rnd.choice(CONCERNS),
+            "restrictions": rnd.choice(RESTRICTIONS),
+            "patient_name": f"Patient {i}",
+        }
+        for i in range(n)
+    ]
+
+
+def report(label, n, seconds):
+    print(f"{label:<28} {seconds * 1000:9.1f} ms total  {n / seconds:9.1f} plans/s")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    requests = roster(n)
+    planner = load_planner(os.path.join(BACKEND_DIR, "data", "Diet_generator.csv"))
+
+    start = time.perf_counter()
+    for r in requests:
+        planner.generate_plan(r["goal"], r["concern"], "", r["restrictions"])
+    report("planner: single calls", n, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    planner.generate_plans(requests)
+    report("planner: generate_plans", n, time.perf_counter() - start)
+
+    warnings.simplefilter("ignore")
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as client:
+        start = time.perf_counter()
+        for r in requests:
+            client.post("/generate-diet-chart", json=r)
+        report("api: single PDF calls", n, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        client.post("/generate-diet-charts/batch", json={"requests": requests, "format": "zip"})
+        report("api: batch zip", n, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        client.post("/generate-diet-charts/batch", json={"requests": requests})
+        report("api: batch json", n, time.perf_counter() - start)
@@ -0,0 +1,58 @@
+# Usage: python benchmarks/bench_diet_chart.py [iterations]
+# Compares per-request planner latency: re-reading the CSV on every call
+# (the old /generate-diet-chart behaviour) vs. the shared DatasetRegistry.
+
+import os
+import sys
+import time
+import statistics
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BACKEND_DIR)
+
+from Diet_Generator import AyurvedicDietPlanner, read_csv, load_planner
+from dataset_registry import DatasetRegistry
+
+DATA_PATH = os.path.join(BACKEND_DIR, "data", "Diet_generator.csv")
+QUERIES = [
+    ("weight", "pitta", ""),
+    ("digestion", "vata", "dairy"),
+    ("energy", "kapha", "non-veg"),
+]
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return p50 * 1000, p99 * 1000
+
+
+def run(label, plan_once, iterations):
+    timings = []
+    for i in range(iterations):
+        goal, concern, restrictions = QUERIES[i % len(QUERIES)]
+        start = time.perf_counter()
+        plan_once(goal, concern, restrictions)
+        timings.append(time.perf_counter() - start)
+    p50, p99 = percentiles(timings)
+    print(f"{label:<10} p50={p50:8.2f} ms  p99={p99:8.2f} ms")
+
+
+def cold(goal, concern, restrictions):
+    planner = AyurvedicDietPlanner(read_csv(DATA_PATH))
+    planner.generate_plan(goal, concern, "", restrictions)
+
+
+registry = DatasetRegistry(DATA_PATH, load_planner)
+registry.load()
+
+
+def shared(goal, concern, restrictions):
+    registry.get().generate_plan(goal, concern, "", restrictions)
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    run("before", cold, iterations)
+    run("after", shared, iterations)
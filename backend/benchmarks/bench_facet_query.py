@@ -0,0 +1,53 @@
+# Usage: python benchmarks/bench_facet_query.py [rows ...]
+# Times structured facet queries (bitset AND/OR/NOT over FacetIndex) against
+# the closest substring equivalent on the planner's text index, and the
+# facet-filtered plan against the unfiltered one.
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import synthetic_diet_rows
+from Diet_Generator import AyurvedicDietPlanner
+
+QUERIES = [
+    ("balances Pitta AND Veg AND NOT dairy", ["pitta", "veg"], ["dairy"]),
+    ("virya:cooling AND rasa:sweet AND NOT allergen:gluten", ["cooling", "sweet"], ["gluten"]),
+    ("balances vata OR balances kapha AND vegan", ["vegan"], []),
+]
+
+
+def substring_query(index, required, excluded):
+    rows = set(range(index.size))
+    for term in required:
+        rows &= index.search(term)
+    for term in excluded:
+        rows -= index.search(term)
+    return rows
+
+
+def per_query_us(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [3700, 100_000, 1_000_000]
+    for n in sizes:
+        start = time.perf_counter()
+        planner = AyurvedicDietPlanner(synthetic_diet_rows(n))
+        print(f"rows={n} planner build={time.perf_counter() - start:.2f} s")
+        repeat = max(3, 200_000 // n)
+        for query, required, excluded in QUERIES:
+            matches = planner.count_foods(query)
+            facet_us = per_query_us(lambda: planner.facets.query(query), repeat * 10)
+            text_us = per_query_us(lambda: substring_query(planner.index, required, excluded), repeat)
+            plan_us = per_query_us(lambda: planner.generate_plan("weight", "", "", "", query), repeat)
+            print(f"  {query!r:58} matches={matches:8d}  facets {facet_us:9.1f} us"
+                  f"  substrings {text_us:10.1f} us  plan with query {plan_us:10.1f} us")
+        plain_us = per_query_us(lambda: planner.generate_plan("weight", ""), repeat)
+        print(f"  plan without query {plain_us:10.1f} us")
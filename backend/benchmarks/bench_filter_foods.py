@@ -0,0 +1,59 @@
+# Usage: python benchmarks/bench_filter_foods.py [rows ...]
+# Times AyurvedicDietPlanner.filter_foods (index and columnar backends)
+# against the old per-row linear scan.
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import synthetic_diet_rows
+from Diet_Generator import AyurvedicDietPlanner
+from food_index import row_text
+
+QUERIES = [
+    ("weight", "pitta", "", ""),
+    ("digestion", "vata", "", "dairy"),
+    ("sweet", "kapha", "veg", "non-veg"),
+]
+
+
+def linear_filter(data, goal, concern, preferences="", restrictions=""):
+    # Reference scorer: rebuilds every row's text and scans it per request
+    scored_foods = []
+    for food in data:
+        text = row_text(food)
+        if restrictions and restrictions in text:
+            continue
+        score = 0
+        if goal in text: score += 3
+        if concern in text: score += 2
+        if preferences and preferences in text: score += 2
+        if "tridoshic" in text: score += 1
+        scored_foods.append((score, food))
+    scored_foods.sort(key=lambda x: x[0], reverse=True)
+    return [food for score, food in scored_foods if score > 0][:5]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            fn(*query)
+    return (time.perf_counter() - start) / (repeat * len(QUERIES)) * 1000
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [3700, 100_000, 1_000_000]
+    for n in sizes:
+        data = synthetic_diet_rows(n)
+        row = f"rows={n:<9}"
+        repeat = max(1, 20_000 // n)
+        row += f" linear={timed(lambda *q: linear_filter(data, *q), repeat):9.2f} ms/query"
+        for backend in ("index", "columnar"):
+            start = time.perf_counter()
+            planner = AyurvedicDietPlanner(data, backend)
+            build_s = time.perf_counter() - start
+            row += f"  {backend}: build={build_s:6.2f} s query={timed(planner.filter_foods, repeat):9.2f} ms"
+        print(row)
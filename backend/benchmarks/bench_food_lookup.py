@@ -0,0 +1,73 @@
+# Usage: python benchmarks/bench_food_lookup.py [dishes ...]
+# Times FoodTracker.get_food_info lookup tiers against the old pandas scans.
+
+import os
+import sys
+import tempfile
+import time
+from difflib import get_close_matches
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from synthetic import write_calorie_csv
+from Calorie_tracker import FoodTracker
+
+
+def pandas_lookup(data, dish_name):
+    # Reference: the exact -> partial -> fuzzy scans get_food_info used to run
+    result = data[data["Dish Name"] == dish_name]
+    if result.empty:
+        result = data[data["Dish Name"].str.contains(dish_name, na=False)]
+    if result.empty:
+        close_matches = get_close_matches(dish_name, data["Dish Name"].tolist(), n=1, cutoff=0.7)
+        if close_matches:
+            result = data[data["Dish Name"] == close_matches[0]]
+    return None if result.empty else result.iloc[0].to_dict()
+
+
+def indexed_lookup(tracker, dish_name):
+    lookup = tracker.lookup
+    row_id = lookup.exact(dish_name)
+    if row_id is None:
+        row_id = lookup.partial(dish_name)
+    if row_id is None:
+        row_id = lookup.fuzzy(dish_name)
+    return None if row_id is None else tracker.data.row(row_id)
+
+
+def pandas_frame(csv_file):
+    data = pd.read_csv(csv_file)
+    data["Dish Name"] = data["Dish Name"].str.lower().str.strip()
+    return data
+
+
+def tier_queries(tracker):
+    names = tracker.dish_names
+    return {
+        "exact": names[len(names) // 2],
+        "partial": names[len(names) // 3].split()[-1][:5],
+        "fuzzy": names[len(names) // 4][:-2] + "zq",
+    }
+
+
+def timed(fn, dish_name, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(dish_name)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n in sizes:
+            csv_file = write_calorie_csv(os.path.join(tmp_dir, f"calories_{n}.csv"), n)
+            tracker = FoodTracker(csv_file)
+            data = pandas_frame(csv_file)
+            repeat = max(1, 20_000 // n)
+            for tier, dish_name in tier_queries(tracker).items():
+                before = timed(lambda d: pandas_lookup(data, d), dish_name, repeat)
+                after = timed(lambda d: indexed_lookup(tracker, d), dish_name, repeat)
+                print(f"dishes={n:<7} {tier:<8} before={before:9.3f} ms  after={after:9.3f} ms")
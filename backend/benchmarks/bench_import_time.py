@@ -0,0 +1,69 @@
+# Usage: python benchmarks/bench_import_time.py [budget_ms]
+# Imports each entry point in a fresh interpreter under -X importtime and
+# prints its total import time, whether scikit-learn/SciPy/fpdf were pulled
+# in eagerly, and the slowest imports it makes directly. With a budget, exits 1
+# when any entry point takes longer, so a new eager heavy import shows up.
+
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Module, directory it is imported from
+ENTRY_POINTS = [
+    ("main", os.path.join(BACKEND_DIR, "api")),
+    ("Diet_Generator", BACKEND_DIR),
+    ("Calorie_tracker", BACKEND_DIR),
+    ("simple_pdf", BACKEND_DIR),
+]
+# Packages that should only load when a request needs them
+DEFERRED = ("sklearn", "scipy", "fpdf")
+
+
+def import_times(module: str, cwd: str) -> list:
+    """
+    Returns:
+        list: (depth, module name, cumulative ms) in report order; depth 0
+        is a top-level import, deeper entries were imported by the next
+        shallower one that follows them
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=cwd, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package", nesting as indentation
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, name.strip(), int(cumulative) / 1000))
+    return rows
+
+
+def direct_imports(rows: list, module: str) -> list:
+    # Depth-1 entries are reported before the top-level import that made them
+    pending = []
+    for depth, name, ms in rows:
+        if depth == 1:
+            pending.append((name, ms))
+        elif depth == 0:
+            if name == module:
+                return pending
+            pending = []
+    return []
+
+
+if __name__ == "__main__":
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else None
+    over = False
+    for module, cwd in ENTRY_POINTS:
+        rows = import_times(module, cwd)
+        total = next(ms for depth, name, ms in rows if depth == 0 and name == module)
+        loaded = {name.split(".")[0] for _, name, _ in rows}
+        eager = [name for name in DEFERRED if name in loaded]
+        over = over or (budget is not None and total > budget)
+        print(f"{module:16} {total:8.1f} ms  eager heavy imports: {', '.join(eager) or 'none'}")
+        for name, ms in sorted(direct_imports(rows, module), key=lambda item: -item[1])[:5]:
+            print(f"    {name:28} {ms:8.1f} ms")
+    sys.exit(1 if over else 0)
@@ -0,0 +1,98 @@
+# Usage: python benchmarks/bench_ingest_memory.py [rows ...]
+# Peak RSS (VmHWM) and load time of each catalogue loader, one fresh process
+# per loader, on synthetic CSVs with the real schemas:
+#   tracker: pd.read_csv of the whole file (the old FoodTracker load) vs.
+#            FoodCatalogue.from_csv streaming chunks vs. a saved catalogue
+#            memory-mapped; then a full FoodTracker from a prebuilt artifact
+#   planner: the rows as a list of dicts (the old planner data) vs.
+#            AyurvedicDietPlanner over read_csv vs. load_planner streaming
+#            iter_csv, both of which keep the rows in compact FoodRecords
+
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import BACKEND_DIR, write_calorie_csv, write_diet_csv
+
+SETUP = """
+import sys, time
+sys.path.append({backend!r})
+NUMERIC_COLS = ["Calories (kcal)", "Carbohydrates (g)", "Protein (g)", "Fats (g)",
+                "Free Sugar (g)", "Fibre (g)", "Sodium (mg)", "Calcium (mg)",
+                "Iron (mg)", "Vitamin C (mg)", "Folate (碌g)"]
+start = time.perf_counter()
+"""
+
+LOADERS = {
+    "tracker pandas": """
+import numpy as np, pandas as pd
+data = pd.read_csv({csv!r})
+data["Dish Name"] = data["Dish Name"].str.lower().str.strip()
+names = data["Dish Name"].tolist()
+nutrition = data[NUMERIC_COLS].to_numpy(dtype=np.float64)
+""",
+    "tracker stream": """
+from catalogue import FoodCatalogue
+data = FoodCatalogue.from_csv({csv!r}, NUMERIC_COLS, lower_cols=["Dish Name"])
+names = data.text("Dish Name").tolist()
+data.save({saved!r})
+""",
+    "tracker mmap": """
+from catalogue import FoodCatalogue
+data = FoodCatalogue.load({saved!r})
+names = data.text("Dish Name").tolist()
+""",
+    "tracker full": """
+from Calorie_tracker import FoodTracker
+tracker = FoodTracker({csv!r}, {root!r})
+tracker.get_food_info("zzqx unknown dish")
+""",
+    "planner dicts": """
+from Diet_Generator import read_csv
+rows = read_csv({diet!r})
+texts = [" ".join(map(str, row.values())).lower() for row in rows]
+""",
+    "planner list": """
+from Diet_Generator import AyurvedicDietPlanner, read_csv
+planner = AyurvedicDietPlanner(read_csv({diet!r}))
+""",
+    "planner stream": """
+from Diet_Generator import load_planner
+planner = load_planner({diet!r})
+""",
+}
+
+REPORT = """
+elapsed = time.perf_counter() - start
+status = dict(line.split(":", 1) for line in open("/proc/self/status"))
+print(elapsed, *(status[key].split()[0] for key in ("VmHWM", "VmRSS")))
+"""
+
+
+def measure(loader, **paths):
+    code = (SETUP + LOADERS[loader] + REPORT).format(backend=BACKEND_DIR, **paths)
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True)
+    elapsed, peak, rss = out.stdout.split()
+    return float(elapsed), int(peak) // 1024, int(rss) // 1024
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n in sizes:
+            paths = {
+                "csv": write_calorie_csv(os.path.join(tmp_dir, f"calories_{n}.csv"), n, ayurveda=True),
+                "diet": write_diet_csv(os.path.join(tmp_dir, f"diet_{n}.csv"), n),
+                "saved": os.path.join(tmp_dir, f"catalogue_{n}"),
+                "root": os.path.join(tmp_dir, f"artifacts_{n}"),
+            }
+            size_mb = os.path.getsize(paths["csv"]) // 2 ** 20
+            print(f"rows={n} calorie csv={size_mb} MB  diet csv={os.path.getsize(paths['diet']) // 2 ** 20} MB")
+            # The artifact is built once so "tracker full" measures the load path
+            measure("tracker full", **paths)
+            for loader in LOADERS:
+                elapsed, peak, rss = measure(loader, **paths)
+                print(f"  {loader:<15} time={elapsed:7.2f} s  peak={peak:6d} MB  rss={rss:6d} MB")
@@ -0,0 +1,50 @@
+# Usage: python benchmarks/bench_lookup_cache.py [dishes] [queries]
+# Replays Zipf-distributed dish-name traces through FoodTracker.get_food_info
+# with different result-cache capacities and reports throughput and hit rate.
+
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import synthetic_dish_names, write_calorie_csv, zipf_trace
+from Calorie_tracker import FoodTracker
+
+
+def query_pool(names, size):
+    # Mix of exact names, partial words, typos and unknown dishes
+    pool = []
+    for i, name in enumerate(names[:size]):
+        kind = i % 4
+        if kind == 0:
+            pool.append(name)
+        elif kind == 1:
+            pool.append(name.split()[-1])
+        elif kind == 2:
+            pool.append(name[:-1] + "x")
+        else:
+            pool.append(f"unknown dish {i}")
+    return pool
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    pool = query_pool(synthetic_dish_names(n, seed=1), 5_000)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_file = write_calorie_csv(os.path.join(tmp_dir, "calories.csv"), n)
+        for s in (0.8, 1.1, 1.4):
+            trace = zipf_trace(pool, queries, s=s)
+            for capacity in (0, 128, 1024):
+                tracker = FoodTracker(csv_file, cache_size=capacity)
+                start = time.perf_counter()
+                for dish_name in trace:
+                    tracker.get_food_info(dish_name)
+                elapsed = time.perf_counter() - start
+                stats = tracker.cache.stats()
+                print(f"zipf s={s:<4} capacity={capacity:<5} {queries / elapsed:9.1f} lookups/s  "
+                      f"hit_rate={stats['hit_rate']:.3f}  evictions={stats['evictions']}")
@@ -0,0 +1,77 @@
+# Usage: python benchmarks/bench_metrics_overhead.py [rounds]
+# Runs the instrumented hot paths with metrics on and off, alternating
+# rounds to cancel drift, and prints the per-call time and overhead of each:
+# generate_plan, uncached nutrition lookups (exact/partial/fuzzy/ML tiers),
+# food log writes, and the RequestMetrics middleware around a trivial ASGI app
+# (whose relative overhead is meaningless; read the absolute cost per request).
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BACKEND_DIR)
+
+import metrics
+from Calorie_tracker import FoodTracker
+from Diet_Generator import load_planner
+from food_log import FoodLogStore
+
+DIET_DATA_PATH = os.path.join(BACKEND_DIR, "data", "Diet_generator.csv")
+CALORIE_DATA_PATH = os.path.join(BACKEND_DIR, "data", "Calorie_tracker.csv")
+QUERIES = [("weight", "pitta"), ("digestion", "vata"), ("energy", "kapha"), ("immunity", "")]
+DISHES = ["masala dosa", "hot tea", "dosa", "paneer tikka masala", "aloo gobi", "zzqx unknown dish"]
+
+
+async def empty_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def middleware_calls(n):
+    app = metrics.RequestMetrics(empty_app)
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+
+    async def run():
+        async def send(message):
+            pass
+        for _ in range(n):
+            await app(scope, None, send)
+    asyncio.run(run())
+
+
+def per_call_us(fn, calls):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    planner = load_planner(DIET_DATA_PATH)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # No result cache, so every lookup walks the match tiers
+        tracker = FoodTracker(CALORIE_DATA_PATH, os.path.join(tmp_dir, "artifacts"), cache_size=0)
+        store = FoodLogStore(os.path.join(tmp_dir, "log.sqlite3"))
+        results = tracker.get_food_info_many(DISHES)
+
+        workloads = {
+            "generate_plan": (lambda: [planner.generate_plan(g, c) for _ in range(25) for g, c in QUERIES], 100),
+            "lookup (all tiers)": (lambda: [tracker.get_food_info_many(DISHES) for _ in range(10)], 10),
+            "log write": (lambda: [store.append("2026-01-01", results, tracker.numeric_cols) for _ in range(20)], 20),
+            "middleware": (lambda: middleware_calls(2000), 2000),
+        }
+        best = {name: {True: float("inf"), False: float("inf")} for name in workloads}
+        for i in range(rounds):
+            # Alternate which state goes first, so WAL checkpoints and similar drift hit both
+            for state in ((True, False) if i % 2 else (False, True)):
+                metrics.enabled = state
+                for name, (fn, calls) in workloads.items():
+                    best[name][state] = min(best[name][state], per_call_us(fn, calls))
+        metrics.enabled = True
+
+    for name, times in best.items():
+        on, off = times[True], times[False]
+        print(f"{name:20} metrics off {off:9.1f} us  on {on:9.1f} us  overhead {on - off:+7.1f} us ({(on - off) / off:+6.1%})")
@@ -0,0 +1,36 @@
+# Usage: python benchmarks/bench_ml_batch.py [dishes] [meal_size ...]
+# Times a meal of unknown dishes: one get_food_info call per item vs. a single
+# get_food_info_many call that batches the ML fallback.
+
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import write_calorie_csv
+from Calorie_tracker import FoodTracker
+
+
+def unknown_meal(size):
+    return [f"qx{i} zz{i * 7} dish" if i % 2 else f"homemade qx{i}" for i in range(size)]
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    meal_sizes = [int(arg) for arg in sys.argv[2:]] or [1, 10, 50]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tracker = FoodTracker(write_calorie_csv(os.path.join(tmp_dir, "calories.csv"), n))
+        for size in meal_sizes:
+            meal = unknown_meal(size)
+            start = time.perf_counter()
+            for item in meal:
+                tracker.get_food_info(item)
+            single = time.perf_counter() - start
+            start = time.perf_counter()
+            tracker.get_food_info_many(meal)
+            batched = time.perf_counter() - start
+            print(f"dishes={n:<7} meal={size:<4} per-item={single * 1000:9.2f} ms  batched={batched * 1000:9.2f} ms")
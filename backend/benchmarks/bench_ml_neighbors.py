@@ -0,0 +1,75 @@
+# Usage: python benchmarks/bench_ml_neighbors.py [rows ...]
+# Nearest-neighbour search of the ML fallback on synthetic catalogues (default
+# 100k and 1M dishes): exact CosineNeighbors vs. LshNeighbors at several
+# (tables, bits, probes) settings. For each it prints the index build time and
+# size, per-query latency for one unknown dish at a time (as get_food_info
+# sends them), and recall@3 against the exact search: the share of the exact
+# top 3 rows found, and the share of returned neighbours as near as the
+# exact ones (names often tie, so equally good rows can differ by id).
+
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import synthetic_dish_names
+from tracker_model import CosineNeighbors, LshNeighbors, fit_tfidf
+
+QUERIES = 200
+# (tables, bits, probes)
+LSH_SETTINGS = [(8, 12, 1), (16, 12, 1), (8, 16, 1), (16, 16, 1), (32, 16, 0)]
+
+
+def unknown_dishes(names, n, seed=0):
+    # Words of two catalogue dishes plus an unseen one, so none matches exactly
+    rnd = random.Random(seed)
+    return [" ".join(rnd.choice(names).split()[:2] + rnd.choice(names).split()[-1:] + [f"qx{i}"])
+            for i in range(n)]
+
+
+def query_times(model, query_vecs):
+    results, times = [], []
+    for i in range(query_vecs.shape[0]):
+        start = time.perf_counter()
+        results.append(model.kneighbors(query_vecs[i], n_neighbors=3))
+        times.append(time.perf_counter() - start)
+    distances = np.vstack([d for d, _ in results])
+    indices = np.vstack([i for _, i in results])
+    times.sort()
+    return distances, indices, times[len(times) // 2] * 1000, times[int(len(times) * 0.95)] * 1000
+
+
+def index_mb(model):
+    if isinstance(model, LshNeighbors):
+        return (model.order.nbytes + model.sorted_codes.nbytes) / 1e6
+    return 0.0
+
+
+def report(n):
+    names = synthetic_dish_names(n)
+    start = time.perf_counter()
+    vectorizer, tfidf_matrix = fit_tfidf(names)
+    print(f"dishes={n}  vocabulary={tfidf_matrix.shape[1]}  fit {time.perf_counter() - start:.1f} s")
+    query_vecs = vectorizer.transform(unknown_dishes(names, QUERIES))
+
+    exact_d, exact_i, p50, p95 = query_times(CosineNeighbors(tfidf_matrix), query_vecs)
+    print(f"  {'exact':18} build {0:7.2f} s  index {0:7.1f} MB  p50 {p50:8.2f} ms  p95 {p95:8.2f} ms")
+    for tables, bits, probes in LSH_SETTINGS:
+        start = time.perf_counter()
+        model = LshNeighbors(tfidf_matrix, tables, bits, probes)
+        build = time.perf_counter() - start
+        d, i, p50, p95 = query_times(model, query_vecs)
+        recall = np.mean([len(set(a) & set(b)) / 3 for a, b in zip(i.tolist(), exact_i.tolist())])
+        near = np.mean(d <= exact_d + 1e-9)
+        label = f"lsh t={tables} b={bits} p={probes}"
+        print(f"  {label:18} build {build:7.2f} s  index {index_mb(model):7.1f} MB  p50 {p50:8.2f} ms"
+              f"  p95 {p95:8.2f} ms  recall@3 {recall:5.3f}  as near {near:5.3f}")
+
+
+if __name__ == "__main__":
+    for n in [int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000]:
+        report(n)
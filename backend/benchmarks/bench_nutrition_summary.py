@@ -0,0 +1,60 @@
+# Usage: python benchmarks/bench_nutrition_summary.py [entries] [days] [patients]
+# Logs random dishes through FoodLogStore and times a 30-day summary from the
+# daily rollups vs. a full recompute from the entries. That both agree is
+# checked by tests/test_food_log.py.
+
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BACKEND_DIR)
+
+from food_log import FoodLogStore
+from synthetic import CALORIE_COLUMNS
+
+NUTRIENTS = CALORIE_COLUMNS[1:12]
+
+
+def random_results(rng, n):
+    return [{"Dish Name": f"dish {rng.randrange(1000)}", **{col: round(rng.uniform(0, 500), 2) for col in NUTRIENTS}}
+            for _ in range(n)]
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    n_entries = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_days = int(sys.argv[2]) if len(sys.argv) > 2 else 365
+    n_patients = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    rng = random.Random(0)
+    first = datetime.date(2025, 1, 1)
+    last = first + datetime.timedelta(days=n_days - 1)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = FoodLogStore(os.path.join(tmp_dir, "log.sqlite3"))
+        start = time.perf_counter()
+        logged = 0
+        while logged < n_entries:
+            size = min(rng.randint(1, 8), n_entries - logged)
+            day = first + datetime.timedelta(days=rng.randrange(n_days))
+            store.append(day.isoformat(), random_results(rng, size), NUTRIENTS, f"patient-{rng.randrange(n_patients)}")
+            logged += size
+        print(f"logged {n_entries} entries in {time.perf_counter() - start:.1f}s")
+
+        window_start = (last - datetime.timedelta(days=29)).isoformat()
+        rollup_ms = best_of(lambda: store.summary(window_start, last.isoformat(), "patient-0", "day"))
+        weekly_ms = best_of(lambda: store.summary(window_start, last.isoformat(), "patient-0", "week"))
+        recompute_ms = best_of(lambda: store.recompute_daily_totals(window_start, last.isoformat(), "patient-0"))
+        print(f"30-day summary, one patient: rollups {rollup_ms:.2f} ms (weekly {weekly_ms:.2f} ms), "
+              f"full recompute {recompute_ms:.2f} ms")
@@ -0,0 +1,66 @@
+# Usage: python benchmarks/bench_render_farm.py [max_workers] [seconds] [clients]
+# Diet-chart throughput through RenderPool as the worker count goes from 0
+# (render in the calling thread) to max_workers, with `clients` threads
+# submitting single-chart jobs like concurrent /generate-diet-chart requests.
+# Jobs refused because the queue is full are counted as 503s.
+
+import os
+import sys
+import threading
+import time
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BACKEND_DIR)
+
+from render_pool import RenderPool, RenderPoolBusy
+
+PLAN = {
+    "Breakfast": "Khichdi",
+    "Lunch": "Prawn Biryani",
+    "Snack": "Fried Fish",
+    "Dinner": "Chamthong with Fish",
+    "Drink": "Chakhao with Fish",
+}
+PATIENT = ("weight_management", "irregular_digestion", "vegetarian", "John Doe", 35, "Male", 175, 80)
+
+
+def run(pool, seconds, clients):
+    latencies, busy = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                pool.render(PLAN, *PATIENT)
+            except RenderPoolBusy:
+                with lock:
+                    busy[0] += 1
+                time.sleep(0.001)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return len(latencies) / seconds, latencies, busy[0]
+
+
+if __name__ == "__main__":
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 3.0
+    clients = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+    print(f"cpus={os.cpu_count()} clients={clients} seconds={seconds}")
+    for workers in range(0, max_workers + 1):
+        pool = RenderPool(workers, max_pending=max(1, workers) * 4, timeout=10.0).start()
+        pool.render(PLAN, *PATIENT)  # wait for the workers to come up
+        rate, latencies, busy = run(pool, seconds, clients)
+        pool.shutdown()
+        p50 = latencies[len(latencies) // 2] * 1000 if latencies else float("nan")
+        p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else float("nan")
+        print(f"workers={workers:<3d} {rate:9.1f} PDFs/s   p50 {p50:7.2f} ms   p99 {p99:7.2f} ms   503s {busy}")
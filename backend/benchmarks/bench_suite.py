@@ -0,0 +1,333 @@
+# Usage: python benchmarks/bench_suite.py [--rows 1000,10000,100000] [--calls 200]
+#                                         [--seed 0] [--no-api] [--out results.json]
+#                                         [--compare baseline.json]
+# Reproducible end-to-end benchmark. For each catalogue size it writes
+# synthetic Diet_generator.csv / Calorie_tracker.csv files with the real
+# schemas, draws a Zipf-skewed workload (goal/concern/restriction queries
+# and dish names) from a fixed seed, and times:
+#   - AyurvedicDietPlanner.filter_foods and generate_plan
+#   - FoodTracker.get_food_info per match tier (exact, partial, fuzzy, ML)
+#     with the result cache off, and a mixed trace with the cache on
+#   - create_simple_diet_pdf
+#   - the FastAPI endpoints through an in-process TestClient
+# Each size runs in its own interpreter, since the API reads its dataset
+# paths at import time. Results are JSON (stdout, or --out) with per-call
+# latency percentiles; --compare prints the p50 change against an earlier
+# run, e.g. one saved from the previous commit.
+
+import argparse
+import datetime
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import BACKEND_DIR, write_calorie_csv, write_diet_csv, zipf_trace
+
+SUITE_VERSION = 1
+DEFAULT_ROWS = [1_000, 10_000, 100_000]
+
+# The choices the patient dashboard offers
+GOALS = ["weight_management", "digestive_health", "energy_vitality", "stress_management", "general_wellness"]
+CONCERNS = ["irregular_digestion", "low_energy", "sleep_issues", "stress_anxiety", "joint_pain"]
+RESTRICTIONS = ["", "vegetarian", "vegan", "jain"]
+FOOD_QUERIES = ["balances Pitta", "Veg AND NOT dairy", "rasa:sweet OR rasa:bitter",
+                "balances Vata AND NOT aggravates Kapha", "Vegan"]
+# Patients sending charts; popular ones hit the chart cache, like real traffic
+PATIENTS = [f"Patient {i}" for i in range(50)]
+TIERS = ["exact", "partial", "fuzzy", "ml"]
+TIER_POOL = 20
+
+
+def summarize(samples: list) -> dict:
+    """
+    Latency summary of per-call durations in seconds.
+    """
+    ordered = sorted(samples)
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000, 4)
+    return {
+        "calls": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 4),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def time_calls(fn, workload: list) -> dict:
+    samples = []
+    for args in workload:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def seconds(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return value, round(time.perf_counter() - start, 4)
+
+
+def tier_of(lookup, dish_name: str) -> str:
+    if lookup.exact(dish_name) is not None:
+        return "exact"
+    if lookup.partial(dish_name) is not None:
+        return "partial"
+    if lookup.fuzzy(dish_name, cutoff=0.7) is not None:
+        return "fuzzy"
+    return "ml"
+
+
+def tier_pools(tracker, seed: int) -> dict:
+    """
+    Up to TIER_POOL dish names that resolve at each match tier, found by
+    deriving candidates from catalogue names and classifying them with the
+    tracker's own lookup.
+    """
+    rnd = random.Random(seed)
+    names = [name for name in tracker.dish_names if name]
+    pools = {tier: [] for tier in TIERS}
+
+    def swap(name):
+        # Adjacent characters swapped mid-word: no longer a substring, still close
+        i = rnd.randrange(1, max(2, len(name) - 2))
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:] if len(name) > 3 else name
+
+    candidates = {
+        "exact": lambda name: name,
+        "partial": lambda name: name[1:-1],
+        "fuzzy": swap,
+        "ml": lambda name: "".join(rnd.choice("qxzjvwk") for _ in range(8)),
+    }
+    for tier, make in candidates.items():
+        for _ in range(TIER_POOL * 10):
+            if len(pools[tier]) == TIER_POOL:
+                break
+            dish_name = make(rnd.choice(names))
+            if dish_name not in pools[tier] and tier_of(tracker.lookup, dish_name) == tier:
+                pools[tier].append(dish_name)
+    return pools
+
+
+def plan_workload(calls: int, seed: int) -> list:
+    queries = list(itertools.product(GOALS, CONCERNS, RESTRICTIONS))
+    random.Random(seed).shuffle(queries)
+    return zipf_trace(queries, calls, seed=seed)
+
+
+def run_direct(diet_csv: str, calorie_csv: str, tmp_dir: str, calls: int, seed: int) -> tuple:
+    from Calorie_tracker import FoodTracker
+    from Diet_Generator import load_planner
+    from simple_pdf import create_simple_diet_pdf
+
+    setup, timings = {}, {}
+    queries = plan_workload(calls, seed)
+
+    planner, setup["load_planner_s"] = seconds(load_planner, diet_csv)
+    timings["filter_foods"] = time_calls(
+        lambda g, c, r: planner.filter_foods(g, c, "", r), queries)
+    timings["generate_plan"] = time_calls(
+        lambda g, c, r: planner.generate_plan(g, c, "", r), queries)
+
+    pdf_path = os.path.join(tmp_dir, "chart.pdf")
+    plans = [(planner.generate_plan(g, c, "", r), g, c, r) for g, c, r in queries[:max(1, calls // 4)]]
+    # The first chart builds the shared page template; not timed
+    create_simple_diet_pdf(plans[0][0], pdf_path, *plans[0][1:])
+    timings["create_simple_diet_pdf"] = time_calls(
+        lambda plan, g, c, r: create_simple_diet_pdf(plan, pdf_path, g, c, r), plans)
+    del planner, plans
+    gc.collect()
+
+    artifact_root = os.path.join(tmp_dir, "artifacts")
+    _, setup["tracker_build_s"] = seconds(FoodTracker, calorie_csv, artifact_root, 0)
+    # Second start memory-maps the artifact the first one wrote
+    tracker, setup["tracker_load_s"] = seconds(FoodTracker, calorie_csv, artifact_root, 0)
+    _, setup["ml_model_s"] = seconds(tracker.ml_model)
+
+    pools = tier_pools(tracker, seed)
+    setup["tier_pool_sizes"] = {tier: len(pool) for tier, pool in pools.items()}
+    for tier, pool in pools.items():
+        if pool:
+            trace = zipf_trace(pool, calls, seed=seed)
+            timings[f"get_food_info_{tier}"] = time_calls(tracker.get_food_info, [(name,) for name in trace])
+
+    # Mixed traffic through the result cache: mostly exact names, a tail of the rest
+    mixed = [name for tier in TIERS for name in pools[tier]]
+    cached = FoodTracker(calorie_csv, artifact_root)
+    timings["get_food_info_cached_mix"] = time_calls(
+        cached.get_food_info, [(name,) for name in zipf_trace(mixed, calls, seed=seed)])
+    return setup, timings, pools
+
+
+def run_api(calls: int, seed: int, pools: dict) -> tuple:
+    client, import_s = seconds(api_client)
+    setup = {"api_import_s": import_s}
+    rnd = random.Random(seed)
+    queries = plan_workload(calls, seed)
+    patients = zipf_trace(PATIENTS, calls, seed=seed)
+    dishes = [name for tier in TIERS for name in pools[tier]]
+    dish_trace = zipf_trace(dishes, calls * 3, seed=seed)
+
+    requests = {
+        "POST /generate-diet-chart": [
+            ("post", "/generate-diet-chart", {"json": {"goal": g, "concern": c, "restrictions": r, "patient_name": p}})
+            for (g, c, r), p in zip(queries, patients)],
+        "POST /track-calories": [
+            ("post", "/track-calories", {"json": {"food_items": dish_trace[i * 3:i * 3 + 3],
+                                                  "date": f"2026-01-{rnd.randint(1, 28):02d}",
+                                                  "patient_id": p}})
+            for i, p in enumerate(patients)],
+        "GET /foods": [
+            ("get", "/foods", {"params": {"query": q, "limit": 50}})
+            for q in zipf_trace(FOOD_QUERIES, calls, seed=seed)],
+        "POST /generate-week-plan": [
+            ("post", "/generate-week-plan", {"json": {"goal": g, "concern": c, "restrictions": r}})
+            for g, c, r in queries[:max(1, calls // 4)]],
+        "GET /nutrition-summary": [
+            ("get", "/nutrition-summary", {"params": {"patient_id": p, "start": "2026-01-01", "end": "2026-01-31"}})
+            for p in patients],
+        "GET /metrics": [("get", "/metrics", {})] * max(1, calls // 4),
+    }
+
+    timings = {}
+    start = time.perf_counter()
+    with client:
+        # Lifespan: both datasets loaded, render pool started
+        setup["api_startup_s"] = round(time.perf_counter() - start, 4)
+        for name, workload in requests.items():
+            method, path, kwargs = workload[0]
+            # First call pays one-off costs (imports, template build); not timed
+            response = getattr(client, method)(path, **kwargs)
+            if response.status_code != 200:
+                raise RuntimeError(f"{name} returned {response.status_code}: {response.text[:200]}")
+            timings[name] = time_calls(
+                lambda method, path, kwargs: getattr(client, method)(path, **kwargs), workload)
+    return setup, timings
+
+
+def api_client():
+    from fastapi.testclient import TestClient
+    import main
+    return TestClient(main.app)
+
+
+def run_size(rows: int, calls: int, seed: int, api: bool) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        diet_csv = os.path.join(tmp_dir, "Diet_generator.csv")
+        calorie_csv = os.path.join(tmp_dir, "Calorie_tracker.csv")
+        _, write_diet = seconds(write_diet_csv, diet_csv, rows, seed)
+        _, write_calorie = seconds(write_calorie_csv, calorie_csv, rows, seed, True)
+
+        setup, timings, pools = run_direct(diet_csv, calorie_csv, tmp_dir, calls, seed)
+        setup = {"write_csv_s": round(write_diet + write_calorie, 4), **setup}
+        gc.collect()
+
+        if api:
+            os.environ.update({
+                "DIET_DATA_PATH": diet_csv,
+                "CALORIE_DATA_PATH": calorie_csv,
+                "ARTIFACT_ROOT": os.path.join(tmp_dir, "artifacts"),
+                "CHART_CACHE_DIR": os.path.join(tmp_dir, "chart_cache"),
+                "LOG_DB_PATH": os.path.join(tmp_dir, "food_log.sqlite3"),
+                # Charts render in-process and nothing warms up behind the timings
+                "RENDER_WORKERS": "0",
+                "WARM_UP": "0",
+            })
+            sys.path.append(os.path.join(BACKEND_DIR, "api"))
+            api_setup, api_timings = run_api(calls, seed, pools)
+            setup.update(api_setup)
+            timings.update(api_timings)
+    return {"rows": rows, "setup": setup, "timings": timings}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict):
+    """
+    Print each timing's p50 in both runs and the ratio current / baseline.
+    """
+    before = {(size["rows"], name): stats
+              for size in baseline["sizes"] for name, stats in size["timings"].items()}
+    print(f"baseline {baseline.get('commit')} -> current {current.get('commit')}", file=sys.stderr)
+    for size in current["sizes"]:
+        for name, stats in size["timings"].items():
+            old = before.get((size["rows"], name))
+            if old is None:
+                continue
+            ratio = stats["p50_ms"] / old["p50_ms"] if old["p50_ms"] else float("inf")
+            print(f"  rows={size['rows']:<8} {name:32} p50 {old['p50_ms']:10.3f} -> {stats['p50_ms']:10.3f} ms"
+                  f"  x{ratio:5.2f}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproducible backend benchmark suite")
+    parser.add_argument("--rows", default=",".join(map(str, DEFAULT_ROWS)),
+                        help="comma-separated catalogue sizes, 1000 to 1000000")
+    parser.add_argument("--calls", type=int, default=200, help="timed calls per benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-api", action="store_true", help="skip the FastAPI endpoint timings")
+    parser.add_argument("--out", help="write the JSON results here instead of stdout")
+    parser.add_argument("--compare", help="earlier results JSON to compare p50 latencies against")
+    # Internal: run one size in this interpreter and print its JSON
+    parser.add_argument("--size-run", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.size_run:
+        print(json.dumps(run_size(args.size_run, args.calls, args.seed, not args.no_api)))
+        return
+
+    sizes = []
+    for rows in (int(value) for value in args.rows.split(",")):
+        print(f"rows={rows} ...", file=sys.stderr)
+        command = [sys.executable, os.path.abspath(__file__), "--size-run", str(rows),
+                   "--calls", str(args.calls), "--seed", str(args.seed)]
+        if args.no_api:
+            command.append("--no-api")
+        output = subprocess.run(command, cwd=BACKEND_DIR, capture_output=True, text=True)
+        if output.returncode != 0:
+            sys.stderr.write(output.stderr)
+            sys.exit(output.returncode)
+        sizes.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    results = {
+        "suite_version": SUITE_VERSION,
+        "commit": git_commit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seed": args.seed,
+        "calls": args.calls,
+        "sizes": sizes,
+    }
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
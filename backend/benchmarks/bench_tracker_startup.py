@@ -0,0 +1,44 @@
+# Usage: python benchmarks/bench_tracker_startup.py [dishes ...]
+# Cold start time and per-worker RSS of FoodTracker: refitting TF-IDF from the
+# CSV vs. memory-mapping a prebuilt model artifact. RssFile pages of the
+# artifact are shared between workers; RssAnon is private to each worker.
+
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import BACKEND_DIR, write_calorie_csv
+
+WORKER = """
+import sys, time
+sys.path.append({backend!r})
+start = time.perf_counter()
+from Calorie_tracker import FoodTracker
+tracker = FoodTracker({csv!r}, {root!r})
+tracker.get_food_info("zzqx unknown dish")
+elapsed = time.perf_counter() - start
+status = dict(line.split(":", 1) for line in open("/proc/self/status"))
+print(elapsed, *(status[key].split()[0] for key in ("VmRSS", "RssAnon", "RssFile")))
+"""
+
+
+def worker(csv_file, artifact_root):
+    code = WORKER.format(backend=BACKEND_DIR, csv=csv_file, root=artifact_root)
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True)
+    elapsed, rss, anon, file_backed = out.stdout.split()
+    return float(elapsed), int(rss) // 1024, int(anon) // 1024, int(file_backed) // 1024
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n in sizes:
+            csv_file = write_calorie_csv(os.path.join(tmp_dir, f"calories_{n}.csv"), n)
+            root = os.path.join(tmp_dir, f"artifacts_{n}")
+            for label, artifact_root in (("refit", None), ("build", root), ("artifact", root)):
+                elapsed, rss, anon, file_backed = worker(csv_file, artifact_root)
+                print(f"dishes={n:<7} {label:<8} start={elapsed:6.2f} s  rss={rss:5d} MB  "
+                      f"anon={anon:5d} MB  file={file_backed:5d} MB")
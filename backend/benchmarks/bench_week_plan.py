@@ -0,0 +1,56 @@
+# Usage: python benchmarks/bench_week_plan.py [rows ...]
+# Times AyurvedicDietPlanner.generate_week_plan (greedy + local search) for a
+# 7-day plan on the real catalogue and on synthetic ones, and reports how far
+# each day lands from its targets and whether the no-repeat window holds.
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import DIET_DATA_PATH, synthetic_diet_rows
+from Diet_Generator import AyurvedicDietPlanner, load_planner
+
+REQUESTS = [
+    ("calories only", dict(goal="weight", concern="pitta")),
+    ("calories + macros", dict(goal="digestion", concern="vata", restrictions="dairy",
+                               carbs=250, fats=60, protein=80)),
+    ("facet query, 1600 kcal", dict(goal="energy", concern="", query="balances Pitta AND Veg AND NOT dairy",
+                                    calories=1600, protein=60)),
+    ("14 days, 3-day window", dict(goal="immunity", concern="kapha", days=14, no_repeat_days=3)),
+]
+
+
+def worst_miss(plan):
+    # Largest relative miss of any day's total against its target
+    return max(abs(day["totals"][col] - target) / target
+               for day in plan["days"] for col, target in plan["targets"].items())
+
+
+def window_holds(plan):
+    window = plan["no_repeat_days"]
+    days = [list(day["meals"].values()) for day in plan["days"]]
+    for i in range(len(days)):
+        seen = [food for day in days[max(0, i - window + 1):i] for food in day]
+        if window and (len(set(days[i])) < len(days[i]) or set(days[i]) & set(seen)):
+            return False
+    return True
+
+
+def report(label, planner, repeat=20):
+    print(label)
+    for name, request in REQUESTS:
+        plan = planner.generate_week_plan(**request)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            planner.generate_week_plan(**request)
+        ms = (time.perf_counter() - start) / repeat * 1000
+        print(f"  {name:24} {ms:8.1f} ms  worst daily miss {worst_miss(plan):6.1%}"
+              f"  window={plan['no_repeat_days']} holds={window_holds(plan)}")
+
+
+if __name__ == "__main__":
+    report("catalogue Diet_generator.csv", load_planner(DIET_DATA_PATH))
+    for n in [int(arg) for arg in sys.argv[1:]] or [20_000, 100_000]:
+        report(f"synthetic rows={n}", AyurvedicDietPlanner(synthetic_diet_rows(n)), repeat=3)
@@ -0,0 +1,94 @@
+# Usage: python benchmarks/load_api.py [clients] [seconds] [port]
+# Starts the API under uvicorn against a scratch log database and has
+# `clients` concurrent httpx clients loop over a mixed workload for
+# `seconds`: a diet chart (new patient each time, so it renders), a calorie
+# log and a 30-day summary. Prints throughput and latency percentiles.
+
+import asyncio
+import itertools
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+FOOD_ITEMS = ["chai", "hot tea", "masala dosa", "dal"]
+GOALS = ["weight_management", "digestion", "energy", "immunity"]
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000 if values else float("nan")
+
+
+async def wait_until_up(client):
+    for _ in range(600):
+        try:
+            await client.get("/nutrition-summary")
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("API did not start")
+
+
+async def run(base_url, clients, seconds):
+    latencies = {"chart": [], "track": [], "summary": []}
+    errors = {name: {} for name in latencies}
+    counter = itertools.count()
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        await wait_until_up(client)
+        deadline = time.perf_counter() + seconds
+
+        async def timed(name, request):
+            start = time.perf_counter()
+            try:
+                status = (await request).status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            if status == 200:
+                latencies[name].append(time.perf_counter() - start)
+            else:
+                errors[name][status] = errors[name].get(status, 0) + 1
+
+        async def user():
+            while time.perf_counter() < deadline:
+                i = next(counter)
+                await timed("chart", client.post("/generate-diet-chart", json={
+                    "goal": GOALS[i % len(GOALS)], "patient_name": f"Load Patient {i}"}))
+                await timed("track", client.post("/track-calories", json={
+                    "food_items": FOOD_ITEMS, "date": "2026-01-01", "patient_id": f"p{i % 50}"}))
+                await timed("summary", client.get("/nutrition-summary", params={
+                    "patient_id": f"p{i % 50}", "end": "2026-01-30"}))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"clients={clients} seconds={elapsed:.1f} ok requests/s={total / elapsed:.1f}")
+    for name, values in latencies.items():
+        values.sort()
+        print(f"{name:8s} n={len(values):6d} errors={sum(errors[name].values()):4d}  p50 {percentile(values, 0.5):8.1f} ms"
+              f"  p95 {percentile(values, 0.95):8.1f} ms  p99 {percentile(values, 0.99):8.1f} ms"
+              + (f"  {errors[name]}" if errors[name] else ""))
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 20.0
+    port = int(sys.argv[3]) if len(sys.argv) > 3 else 8765
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = dict(os.environ, LOG_DB_PATH=os.path.join(tmp_dir, "food_log.sqlite3"), CHART_CACHE_SIZE="100")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=os.path.join(BACKEND_DIR, "api"), env=env,
+        )
+        try:
+            asyncio.run(run(f"http://127.0.0.1:{port}", clients, seconds))
+        finally:
+            server.terminate()
+            server.wait()
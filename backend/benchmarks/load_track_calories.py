@@ -0,0 +1,68 @@
+# Usage: python benchmarks/load_track_calories.py [requests] [concurrency]
+# Requests per second for calorie tracking: one Python subprocess per request
+# (the old /track-calories behaviour) vs. the in-process FoodTracker endpoint.
+
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.join(BACKEND_DIR, "api"))
+
+FOOD_ITEMS = ["chai", "hot tea", "masala dosa", "dal"]
+
+
+def subprocess_rps(n, concurrency):
+    # Run the CLI in a scratch copy: it overwrites data/Calorie_tracker.csv
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        shutil.copytree(os.path.join(BACKEND_DIR, "data"), os.path.join(tmp_dir, "data"),
+                        ignore=shutil.ignore_patterns("*.pdf", "log_*"))
+        script = os.path.join(BACKEND_DIR, "Calorie_tracker.py")
+
+        def call(_):
+            data_path = os.path.join(tmp_dir, "data", "Calorie_tracker.csv")
+            shutil.copy(os.path.join(BACKEND_DIR, "data", "Calorie_tracker.csv"), data_path)
+            subprocess.run([sys.executable, script] + FOOD_ITEMS, capture_output=True, text=True, cwd=tmp_dir)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(call, range(n)))
+        return n / (time.perf_counter() - start)
+
+
+async def in_process_rps(n, concurrency):
+    import httpx
+    import main
+    from food_log import FoodLogStore
+
+    main.calorie_registry.load()
+    log_dir = tempfile.mkdtemp()
+    main.food_log = FoodLogStore(os.path.join(log_dir, "food_log.sqlite3"))
+    limit = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def call():
+            async with limit:
+                response = await client.post("/track-calories", json={"food_items": FOOD_ITEMS, "date": "bench"})
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(n)))
+        elapsed = time.perf_counter() - start
+    shutil.rmtree(log_dir)
+    return n / elapsed
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    print(f"subprocess per request: {subprocess_rps(n, concurrency):9.1f} req/s")
+    print(f"in-process FoodTracker: {asyncio.run(in_process_rps(n * 25, concurrency)):9.1f} req/s")
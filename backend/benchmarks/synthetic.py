@@ -0,0 +1,108 @@
+# Synthetic catalogues with the real Diet_generator.csv and Calorie_tracker.csv
+# schemas, for benchmarks.
+
+import csv
+import os
+import random
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BACKEND_DIR)
+
+from Diet_Generator import read_csv
+
+DIET_DATA_PATH = os.path.join(BACKEND_DIR, "data", "Diet_generator.csv")
+
+
+def diet_columns():
+    base = read_csv(DIET_DATA_PATH)
+    return {key: [row[key] for row in base] for key in base[0]}
+
+
+def iter_diet_rows(n, seed=0):
+    """
+    Yield n diet rows by resampling each column of the real dataset
+    independently. Food names get a numeric suffix so they stay unique.
+    """
+    columns = diet_columns()
+    rnd = random.Random(seed)
+    for i in range(n):
+        row = {key: rnd.choice(values) for key, values in columns.items()}
+        row["Food Name"] = f"{row['Food Name']} {i}"
+        yield row
+
+
+def synthetic_diet_rows(n, seed=0):
+    return list(iter_diet_rows(n, seed))
+
+
+def write_diet_csv(path, n, seed=0):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(diet_columns()))
+        writer.writeheader()
+        writer.writerows(iter_diet_rows(n, seed))
+    return path
+
+
+CALORIE_COLUMNS = ["Dish Name", "Calories (kcal)", "Carbohydrates (g)", "Protein (g)", "Fats (g)",
+                   "Free Sugar (g)", "Fibre (g)", "Sodium (mg)", "Calcium (mg)",
+                   "Iron (mg)", "Vitamin C (mg)", "Folate (碌g)"]
+# Text columns the real Calorie_tracker.csv carries after the nutrients
+CALORIE_AYURVEDA_COLUMNS = ["Rasa (Taste)", "Guna (Qualities)", "Virya (Potency)",
+                            "Vipaka (Post-digestive Effect)", "Prabhava (Special Effect)",
+                            "Dosha Impact", "Mapped_Ingredients"]
+DISH_PREFIXES = ["", "homemade", "spicy", "sweet", "masala", "plain", "fried", "steamed", "baked",
+                 "roasted", "stuffed", "mini", "kerala", "punjabi", "bengali", "south indian",
+                 "jain", "tandoori", "instant", "restaurant style", "dhaba style", "street style",
+                 "crispy", "creamy", "dry", "gravy", "sprouted", "millet", "oats", "paneer"]
+
+
+def synthetic_dish_names(n, seed=0):
+    """
+    n unique, realistic-looking lowercase dish names built from the diet
+    dataset's food names, a style prefix and, past the combinations, a number.
+    """
+    foods = sorted({row["Food Name"].lower().strip() for row in read_csv(DIET_DATA_PATH)})
+    names = [f"{prefix} {food}".strip() for prefix in DISH_PREFIXES for food in foods]
+    random.Random(seed).shuffle(names)
+    return [names[i] if i < len(names) else f"{names[i % len(names)]} {i // len(names)}"
+            for i in range(n)]
+
+
+def iter_calorie_rows(n, seed=0, ayurveda=False):
+    """
+    Yield n rows with the Calorie_tracker.csv schema: dish name and nutrients,
+    plus the Ayurvedic text columns (resampled from the diet dataset) if
+    ayurveda is set.
+    """
+    rnd = random.Random(seed)
+    texts = diet_columns() if ayurveda else {}
+    for name in synthetic_dish_names(n, seed):
+        row = {"Dish Name": name}
+        for col in CALORIE_COLUMNS[1:]:
+            row[col] = round(rnd.uniform(0, 500), 2)
+        if ayurveda:
+            for col in CALORIE_AYURVEDA_COLUMNS:
+                row[col] = rnd.choice(texts[col])
+        yield row
+
+
+def synthetic_calorie_rows(n, seed=0):
+    return list(iter_calorie_rows(n, seed))
+
+
+def write_calorie_csv(path, n, seed=0, ayurveda=False):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CALORIE_COLUMNS + (CALORIE_AYURVEDA_COLUMNS if ayurveda else []))
+        writer.writeheader()
+        writer.writerows(iter_calorie_rows(n, seed, ayurveda))
+    return path
+
+
+def zipf_trace(items, n, s=1.1, seed=0):
+    """
+    n draws from items where the i-th item has weight 1 / (i + 1) ** s,
+    i.e. a few popular entries dominate like real query traffic.
+    """
+    weights = [1.0 / (rank + 1) ** s for rank in range(len(items))]
+    return random.Random(seed).choices(items, weights=weights, k=n)
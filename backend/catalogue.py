@@ -0,0 +1,441 @@
+import json
+import os
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+CHUNK_ROWS = 20_000
+# A text column whose first chunk has fewer distinct values than this share
+# of its rows is dictionary-encoded
+DICTIONARY_RATIO = 0.5
+
+
+def load_array(path: str):
+    # Memory-map unless the array is empty (a zero-length file cannot be mapped)
+    try:
+        return np.load(path, mmap_mode="r")
+    except ValueError:
+        return np.load(path)
+
+
+class TextColumn:
+    def __init__(self, blob, offsets, valid):
+        """
+        Strings packed like an Arrow string column: one UTF-8 byte buffer,
+        row i spanning blob[offsets[i]:offsets[i + 1]], plus a validity mask.
+        Args:
+            blob (ndarray of uint8): Concatenated UTF-8 values
+            offsets (ndarray of int64): len(rows) + 1 byte offsets into blob
+            valid (ndarray of bool): False where the CSV value was missing
+        """
+        self.blob = blob
+        self.offsets = offsets
+        self.valid = valid
+
+    def __len__(self):
+        return len(self.valid)
+
+    def __getitem__(self, row_id):
+        if not self.valid[row_id]:
+            return None
+        return self.blob[self.offsets[row_id]:self.offsets[row_id + 1]].tobytes().decode("utf-8")
+
+    def tolist(self) -> list:
+        data = self.blob.tobytes()
+        offsets = self.offsets.tolist()
+        return [data[offsets[i]:offsets[i + 1]].decode("utf-8") if ok else None
+                for i, ok in enumerate(self.valid.tolist())]
+
+    @staticmethod
+    def pack(strings: list):
+        """
+        (utf-8 bytes, int64 byte lengths) for a list of strings.
+        """
+        # Byte length equals str length for ASCII values
+        lengths = np.fromiter((len(value) if value.isascii() else len(value.encode("utf-8")) for value in strings),
+                              dtype=np.int64, count=len(strings))
+        return "".join(strings).encode("utf-8"), lengths
+
+    @classmethod
+    def from_parts(cls, blob, lengths: list, valid: list):
+        lengths = np.concatenate(lengths) if lengths else np.zeros(0, dtype=np.int64)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        valid = np.concatenate(valid) if valid else np.zeros(0, dtype=bool)
+        return cls(np.frombuffer(blob, dtype=np.uint8), offsets, valid)
+
+
+class CodedColumn:
+    def __init__(self, codes, dictionary: TextColumn):
+        """
+        Dictionary-encoded strings for columns with few distinct values:
+        an int32 code per row into a TextColumn of the distinct values.
+        Args:
+            codes (ndarray of int32): Index into dictionary, -1 where missing
+            dictionary (TextColumn): Distinct values
+        """
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, row_id):
+        code = self.codes[row_id]
+        return self.dictionary[code] if code >= 0 else None
+
+    def tolist(self) -> list:
+        values = self.dictionary.tolist()
+        return [values[code] if code >= 0 else None for code in self.codes.tolist()]
+
+
+class IntColumn:
+    def __init__(self, values):
+        """
+        Text column whose every value is a canonical integer ("150"), kept
+        as int64 and rendered back to the same string on access.
+        Args:
+            values (ndarray of int64)
+        """
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, row_id):
+        return str(self.values[row_id])
+
+    def tolist(self) -> list:
+        return [str(value) for value in self.values.tolist()]
+
+
+def as_ints(values: list):
+    """
+    values as an int64 array if each one is the canonical text of an
+    integer, so str() gives it back unchanged; otherwise None.
+    """
+    try:
+        ints = [int(value) for value in values]
+        if any(str(number) != value for number, value in zip(ints, values)):
+            return None
+        return np.array(ints, dtype=np.int64)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class TextColumnBuilder:
+    def __init__(self, ints: bool = False):
+        """
+        Builds one text column chunk by chunk. The layout is chosen from the
+        first chunk: IntColumn if ints is set and every value is an integer,
+        CodedColumn if it has few distinct values, else a plain TextColumn.
+        Values that are not str count as missing.
+        """
+        self.kind = None if ints else "text"
+        self.int_parts = []
+        self.mapping = None
+        self.codes = []
+        self.blob = bytearray()
+        self.lengths = []
+        self.valid = []
+
+    def add(self, values: list):
+        if self.kind is None:
+            self.kind = "int" if as_ints(values) is not None else "text"
+        if self.kind == "int":
+            ints = as_ints(values)
+            if ints is not None:
+                self.int_parts.append(ints)
+                return
+            # A later chunk is not all integers: store the column as text after all
+            earlier = [str(value) for part in self.int_parts for value in part.tolist()]
+            self.int_parts = []
+            self.kind = "text"
+            self._add_text(earlier)
+        self._add_text(values)
+
+    def _add_text(self, values: list):
+        if not values:
+            return
+        if self.mapping is None and not self.valid and not self.codes:
+            distinct = len(set(values))
+            self.mapping = {} if distinct < DICTIONARY_RATIO * len(values) else False
+        if self.mapping is not False:
+            mapping = self.mapping
+            self.codes.append(np.fromiter(
+                (mapping.setdefault(value, len(mapping)) if isinstance(value, str) else -1 for value in values),
+                dtype=np.int32, count=len(values),
+            ))
+        else:
+            strings = [value if isinstance(value, str) else "" for value in values]
+            blob, lengths = TextColumn.pack(strings)
+            self.blob += blob
+            self.lengths.append(lengths)
+            self.valid.append(np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=len(values)))
+
+    def finish(self):
+        if self.kind == "int":
+            return IntColumn(np.concatenate(self.int_parts) if self.int_parts else np.zeros(0, dtype=np.int64))
+        if self.mapping:
+            distinct = list(self.mapping)
+            blob, lengths = TextColumn.pack(distinct)
+            return CodedColumn(
+                np.concatenate(self.codes),
+                TextColumn.from_parts(blob, [lengths], [np.ones(len(distinct), dtype=bool)]),
+            )
+        if self.mapping == {}:
+            # Dictionary chosen but every value was missing
+            return CodedColumn(np.concatenate(self.codes), TextColumn.from_parts(b"", [], []))
+        return TextColumn.from_parts(self.blob, self.lengths, self.valid)
+
+
+class FoodCatalogue:
+    def __init__(self, columns: list, numeric_cols: list, numeric, texts: dict):
+        """
+        Column-oriented copy of a food catalogue CSV: the numeric columns as
+        one float64 matrix and every other column as a packed TextColumn
+        (or a CodedColumn when it has few distinct values). Built chunk by
+        chunk from the CSV (from_csv) and saved as .npy files that load
+        memory-mapped (save / load).
+        Args:
+            columns (list): Column names in CSV order
+            numeric_cols (list): Columns stored in numeric, in matrix order
+            numeric (ndarray): (rows, len(numeric_cols)) float64 matrix
+            texts (dict): Column name -> TextColumn or CodedColumn for the others
+        """
+        self.columns = columns
+        self.numeric_cols = numeric_cols
+        self.numeric = numeric
+        self.texts = texts
+        self.numeric_index = {col: i for i, col in enumerate(numeric_cols)}
+
+    def __len__(self):
+        return self.numeric.shape[0]
+
+    @classmethod
+    def from_csv(cls, path: str, numeric_cols: list, usecols: list = None, lower_cols=(), chunk_rows: int = CHUNK_ROWS):
+        """
+        Stream a CSV into a catalogue without holding it as a DataFrame.
+        Args:
+            path (str): CSV file
+            numeric_cols (list): Columns parsed as float64
+            usecols (list): Columns to keep, None for all
+            lower_cols (iterable): Text columns to lowercase and strip
+            chunk_rows (int): Rows parsed per chunk
+        """
+        import pandas as pd
+
+        header = list(pd.read_csv(path, nrows=0).columns)
+        columns = [col for col in header if usecols is None or col in usecols]
+        text_cols = [col for col in columns if col not in numeric_cols]
+        dtypes = {col: np.float64 for col in numeric_cols}
+        dtypes.update({col: str for col in text_cols})
+
+        numeric_parts = []
+        builders = {col: TextColumnBuilder() for col in text_cols}
+        for chunk in pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunk_rows):
+            numeric_parts.append(chunk[numeric_cols].to_numpy(dtype=np.float64))
+            for col in text_cols:
+                values = chunk[col]
+                if col in lower_cols:
+                    values = values.str.lower().str.strip()
+                # Missing values arrive as NaN, which the builder treats as missing
+                builders[col].add(values.tolist())
+
+        # Row-major, the same layout save() writes and load() maps
+        numeric = np.ascontiguousarray(np.concatenate(numeric_parts)) if numeric_parts \
+            else np.empty((0, len(numeric_cols)))
+        texts = {col: builder.finish() for col, builder in builders.items()}
+        return cls(columns, list(numeric_cols), numeric, texts)
+
+    def text(self, col: str):
+        return self.texts[col]
+
+    def row(self, row_id: int) -> dict:
+        """
+        One row as {column: value} in CSV order, like DataFrame.iloc[i].to_dict():
+        missing values are NaN.
+        """
+        row = {}
+        for col in self.columns:
+            if col in self.numeric_index:
+                row[col] = float(self.numeric[row_id, self.numeric_index[col]])
+            else:
+                value = self.texts[col][row_id]
+                row[col] = value if value is not None else float("nan")
+        return row
+
+    def save(self, path: str):
+        """
+        Write the catalogue to the directory path (created if missing).
+        """
+        os.makedirs(path, exist_ok=True)
+        text_cols = list(self.texts)
+        np.save(os.path.join(path, "numeric.npy"), np.ascontiguousarray(self.numeric, dtype=np.float64))
+        coded = []
+        # Files are numbered, column names can hold any character
+        for i, col in enumerate(text_cols):
+            column = self.texts[col]
+            if isinstance(column, CodedColumn):
+                np.save(os.path.join(path, f"text_{i}_codes.npy"), np.asarray(column.codes))
+                column = column.dictionary
+                coded.append(col)
+            np.save(os.path.join(path, f"text_{i}_blob.npy"), np.asarray(column.blob))
+            np.save(os.path.join(path, f"text_{i}_offsets.npy"), np.asarray(column.offsets))
+            np.save(os.path.join(path, f"text_{i}_valid.npy"), np.asarray(column.valid))
+        with open(os.path.join(path, "catalogue.json"), "w", encoding="utf-8") as f:
+            json.dump({"columns": self.columns, "numeric_cols": self.numeric_cols,
+                       "text_cols": text_cols, "coded_cols": coded}, f)
+
+    @classmethod
+    def load(cls, path: str):
+        """
+        Load a saved catalogue with every array memory-mapped.
+        """
+        with open(os.path.join(path, "catalogue.json"), encoding="utf-8") as f:
+            layout = json.load(f)
+        numeric = load_array(os.path.join(path, "numeric.npy"))
+        texts = {}
+        for i, col in enumerate(layout["text_cols"]):
+            column = TextColumn(*(load_array(os.path.join(path, f"text_{i}_{part}.npy"))
+                                 for part in ("blob", "offsets", "valid")))
+            if col in layout["coded_cols"]:
+                column = CodedColumn(load_array(os.path.join(path, f"text_{i}_codes.npy")), column)
+            texts[col] = column
+        return cls(layout["columns"], layout["numeric_cols"], numeric, texts)
+
+
+class FoodRow(Mapping):
+    __slots__ = ("records", "row_id")
+
+    def __init__(self, records, row_id: int):
+        """
+        Read-only dict-like view of one FoodRecords row: food["Food Name"],
+        keys(), items(), dict(food) and == with a dict all work as they did
+        for the CSV row dict.
+        """
+        self.records = records
+        self.row_id = row_id
+
+    def __getitem__(self, col):
+        column = self.records.column_map.get(col)
+        if column is None:
+            raise KeyError(col)
+        return column[self.row_id]
+
+    def __iter__(self):
+        return iter(self.records.columns)
+
+    def __len__(self):
+        return len(self.records.columns)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class FoodRecords(Sequence):
+    def __init__(self, columns: list, column_data: list, size: int):
+        """
+        Compact stand-in for a list of CSV row dicts that all share the same
+        string columns: each column is an IntColumn, CodedColumn or
+        TextColumn, and rows are FoodRow views created on access.
+        Args:
+            columns (list): Column names in CSV order
+            column_data (list): One column object per name
+            size (int): Number of rows
+        """
+        self.columns = columns
+        self.column_map = dict(zip(columns, column_data))
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row_id):
+        if isinstance(row_id, slice):
+            return [self[i] for i in range(*row_id.indices(self.size))]
+        if row_id < 0:
+            row_id += self.size
+        if not 0 <= row_id < self.size:
+            raise IndexError("FoodRecords index out of range")
+        return FoodRow(self, row_id)
+
+
+def to_floats(values: list) -> np.ndarray:
+    """
+    float64 array of values, NaN where a value is missing or not a number.
+    """
+    out = np.full(len(values), np.nan)
+    for i, value in enumerate(values):
+        try:
+            out[i] = float(value)
+        except (TypeError, ValueError):
+            pass
+    return out
+
+
+def float_column(data, col: str) -> np.ndarray:
+    """
+    One column of a FoodRecords (or list of row dicts) as float64, NaN where
+    the value is missing or not a number. Integer and dictionary-encoded
+    columns are converted without touching every row's text.
+    """
+    column = data.column_map.get(col) if isinstance(data, FoodRecords) else None
+    if isinstance(column, IntColumn):
+        return column.values.astype(np.float64)
+    if isinstance(column, CodedColumn):
+        values = np.append(to_floats(column.dictionary.tolist()), np.nan)
+        # Code -1 (missing) picks the trailing NaN
+        return values[column.codes]
+    if column is not None:
+        return to_floats(column.tolist())
+    return to_floats([row.get(col) for row in data])
+
+
+class RecordBuilder:
+    def __init__(self, chunk_rows: int = CHUNK_ROWS):
+        """
+        Collects row dicts one at a time into FoodRecords, compacting every
+        chunk_rows rows. Rows that do not fit (different keys, or values
+        that are not str) switch the builder to a plain list of dicts, so
+        any dataset still round-trips unchanged.
+        """
+        self.chunk_rows = chunk_rows
+        self.columns = None
+        self.builders = None
+        self.pending = []
+        self.size = 0
+        self.rows = None
+
+    def add(self, row: dict):
+        if self.rows is not None:
+            self.rows.append(row)
+            return
+        if self.columns is None:
+            self.columns = list(row)
+            self.builders = [TextColumnBuilder(ints=True) for _ in self.columns]
+        if list(row) != self.columns or not all(type(value) is str for value in row.values()):
+            self.rows = [dict(food) for food in self._compact()] + [row]
+            return
+        self.pending.append(row)
+        if len(self.pending) >= self.chunk_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self.pending:
+            return
+        for col, builder in zip(self.columns, self.builders):
+            builder.add([row[col] for row in self.pending])
+        self.size += len(self.pending)
+        self.pending = []
+
+    def _compact(self):
+        self._flush()
+        return FoodRecords(self.columns or [], [builder.finish() for builder in self.builders or []], self.size)
+
+    def finish(self):
+        """
+        Returns:
+            FoodRecords, or a list of dicts if the rows were not uniform
+        """
+        return self.rows if self.rows is not None else self._compact()
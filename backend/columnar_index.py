@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from food_facets import bitset_mask
+from ranking import top_k
+
+
+class ColumnarIndex:
+    def __init__(self, texts: list):
+        """
+        Columnar alternative to TextIndex: one precomputed lowercase search
+        column, scored with vectorized substring masks.
+        Args:
+            texts (iterable of str): Normalized text per row (see food_index.row_text)
+        """
+        self.text = pd.Series(list(texts), dtype=object)
+        self.size = len(self.text)
+        self.tridoshic = self.search("tridoshic")
+
+    def search(self, term: str) -> np.ndarray:
+        """
+        Return a boolean mask of rows whose text contains term.
+        """
+        if not term:
+            return np.ones(self.size, dtype=bool)
+        return self.text.str.contains(term, regex=False).to_numpy(dtype=bool)
+
+    def score_array(self, search, goal, concern, preferences, restrictions, allowed=None) -> np.ndarray:
+        """
+        Same contract as TextIndex.score_array: per-row scores, -1 for rows
+        excluded by restrictions or allowed.
+        """
+        scores = 3 * search(goal).astype(np.int64)
+        scores += 2 * search(concern)
+        if preferences:
+            scores += 2 * search(preferences)
+        scores += self.tridoshic
+        if restrictions:
+            scores[search(restrictions)] = -1
+        if allowed is not None:
+            scores[~bitset_mask(allowed, self.size)] = -1
+        return scores
+
+    def rank(self, search, goal, concern, preferences, restrictions, k=5, allowed=None, tie_keys=()) -> list:
+        """
+        Same contract as TextIndex.rank, computed over whole columns.
+        """
+        scores = self.score_array(search, goal, concern, preferences, restrictions, allowed)
+        candidates = np.flatnonzero(scores > 0)
+        return top_k(candidates, scores[candidates], k, tie_keys).tolist()
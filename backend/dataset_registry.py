@@ -0,0 +1,68 @@
+import hashlib
+import os
+import threading
+
+
+def file_digest(path: str) -> str:
+    """
+    Return the sha256 hex digest of a file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DatasetRegistry:
+    def __init__(self, path: str, loader):
+        """
+        Keep one loaded object (e.g. a planner) per dataset file and reload it
+        only when the file on disk actually changes.
+        Args:
+            path (str): Path to the dataset file
+            loader (callable): Builds the shared object from the path
+        """
+        self.path = path
+        self.loader = loader
+        self.value = None
+        self.digest = None
+        self.stamp = None
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        st = os.stat(self.path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self):
+        """
+        Check the file now, whatever its mtime/size, and return the shared
+        object: built if none is loaded yet, rebuilt only if the content hash
+        differs from the loaded one, otherwise reused as is.
+        """
+        with self._lock:
+            return self._load_locked(self._stat())
+
+    def _load_locked(self, stamp):
+        digest = file_digest(self.path)
+        if self.value is None or digest != self.digest:
+            self.value = self.loader(self.path)
+            self.digest = digest
+            self.version += 1
+        self.stamp = stamp
+        return self.value
+
+    def get(self):
+        """
+        Return the shared object, reloading it first if the file's mtime/size
+        changed and its content hash differs from the loaded one.
+        The returned object must be treated as read-only by callers.
+        """
+        stamp = self._stat()
+        if self.value is not None and stamp == self.stamp:
+            return self.value
+        with self._lock:
+            if self.value is not None and stamp == self.stamp:
+                return self.value
+            return self._load_locked(stamp)
@@ -0,0 +1,233 @@
+import re
+from array import array
+
+import numpy as np
+
+DOSHAS = ("vata", "pitta", "kapha")
+RASAS = ("sweet", "sour", "salty", "pungent", "bitter", "astringent")
+PARENS_RE = re.compile(r"\([^)]*\)")
+OPERATOR_RE = re.compile(r"\s+(and|or)\s+", re.IGNORECASE)
+
+
+def clauses(value: str) -> list:
+    """
+    Split a multi-source cell ("A; B") into its clauses, dropping the generic
+    "Varies (...)" placeholders that carry no information about the food.
+    """
+    parts = (part.strip() for part in value.split(";"))
+    return [part for part in parts if part and "(varies)" not in part.lower() and not part.lower().startswith("varies")]
+
+
+def parse_dosha(value: str) -> dict:
+    """
+    "Balances Vata & Pitta, may increase Kapha" -> balances {vata, pitta},
+    aggravates {kapha}. "Generally balances Pitta, effects on Vata/Kapha vary"
+    only balances pitta.
+    """
+    facets = {"balances": set(), "aggravates": set()}
+    for clause in clauses(value):
+        for part in clause.lower().split(","):
+            doshas = {dosha for dosha in DOSHAS if dosha in part}
+            if "tridoshic" in part:
+                facets["balances"].update(DOSHAS)
+            elif "balance" in part:
+                facets["balances"] |= doshas
+            elif "aggravat" in part or "increase" in part:
+                facets["aggravates"] |= doshas
+    return facets
+
+
+def parse_rasa(value: str) -> dict:
+    # "Sweet (ripe), Sour (unripe)" and "Slightly Sweet" keep the taste words only
+    tastes = set()
+    for clause in clauses(value):
+        tastes.update(rasa for rasa in RASAS if rasa in clause.lower())
+    return {"rasa": tastes}
+
+
+def parse_list(facet: str):
+    # Comma-separated values, lowercased, parenthetical notes removed
+    def parse(value: str) -> dict:
+        values = set()
+        for clause in clauses(value):
+            for part in PARENS_RE.sub("", clause).lower().split(","):
+                part = " ".join(part.split())
+                if part and part != "none":
+                    values.add(part)
+        return {facet: values}
+    return parse
+
+
+def parse_type(value: str) -> dict:
+    # Vegan food is also vegetarian, so "veg" matches both labels
+    food_type = value.strip().lower()
+    if not food_type:
+        return {"type": set()}
+    return {"type": {food_type, "veg"} if food_type == "vegan" else {food_type}}
+
+
+# Dataset column -> parser returning {facet: set of values}
+FACET_COLUMNS = {
+    "Dosha Impact": parse_dosha,
+    "Rasa (Taste)": parse_rasa,
+    "Guna (Qualities)": parse_list("guna"),
+    "Virya (Potency)": parse_list("virya"),
+    "Type": parse_type,
+    "Allergic Ingredients": parse_list("allergen"),
+}
+FACETS = ("balances", "aggravates", "rasa", "guna", "virya", "type", "allergen")
+
+
+class FacetQueryError(ValueError):
+    pass
+
+
+def bitset_rows(bits: int) -> np.ndarray:
+    """
+    Row ids of the set bits, in ascending order.
+    """
+    if not bits:
+        return np.zeros(0, dtype=np.int64)
+    raw = np.frombuffer(bits.to_bytes((bits.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+
+
+def bitset_mask(bits: int, size: int) -> np.ndarray:
+    """
+    Boolean mask of length size with the set bits True.
+    """
+    mask = np.zeros(size, dtype=bool)
+    mask[bitset_rows(bits)] = True
+    return mask
+
+
+class FacetIndex:
+    def __init__(self):
+        """
+        Structured Ayurvedic attributes per row, parsed from the dataset's
+        Dosha Impact, Rasa, Guna, Virya, Type and Allergic Ingredients columns,
+        with one bitset (a Python int, bit i = row i) per facet value.
+        Rows are added in order with add(), then finish() builds the bitsets.
+        """
+        self.size = 0
+        self.rows = {facet: {} for facet in FACETS}
+        self.bitsets = None
+        self.all = 0
+        self.aliases = {}
+        # (column, cell) -> row lists to append to; cells repeat a lot
+        self.parsed = {}
+
+    def add(self, food: dict):
+        row_id = self.size
+        self.size += 1
+        for column, parse in FACET_COLUMNS.items():
+            value = food.get(column)
+            if not value:
+                continue
+            targets = self.parsed.get((column, value))
+            if targets is None:
+                targets = self.parsed[(column, value)] = [
+                    self.rows[facet].setdefault(facet_value, array("I"))
+                    for facet, values in parse(str(value)).items()
+                    for facet_value in values
+                ]
+            for row_ids in targets:
+                row_ids.append(row_id)
+
+    def finish(self):
+        """
+        Turn the collected row lists into bitsets; returns self.
+        """
+        nbytes = (self.size + 7) // 8
+        self.bitsets = {}
+        for facet, values in self.rows.items():
+            self.bitsets[facet] = {}
+            for value, row_ids in values.items():
+                mask = np.zeros(nbytes * 8, dtype=bool)
+                mask[np.frombuffer(row_ids, dtype=np.uint32)] = True
+                self.bitsets[facet][value] = int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+        self.rows = self.parsed = None
+        self.all = (1 << self.size) - 1
+
+        # Bare values resolve to their facet when only one facet has them
+        owners = {}
+        for facet, values in self.bitsets.items():
+            for value in values:
+                owners.setdefault(value, []).append(facet)
+        self.aliases = owners
+        return self
+
+    def values(self) -> dict:
+        """
+        Facet -> {value: number of rows}, for building query UIs.
+        """
+        return {facet: {value: bits.bit_count() for value, bits in sorted(values.items())}
+                for facet, values in self.bitsets.items()}
+
+    def bitset(self, facet: str, value: str) -> int:
+        """
+        Rows having value for facet (0 if none do).
+        Raises:
+            FacetQueryError: Unknown facet
+        """
+        if facet not in self.bitsets:
+            raise FacetQueryError(f"Unknown facet '{facet}' (expected one of {', '.join(FACETS)})")
+        return self.bitsets[facet].get(value, 0)
+
+    def _resolve(self, atom: str) -> tuple:
+        # "facet:value", "facet value" or a bare value owned by a single facet
+        if ":" in atom:
+            facet, value = atom.split(":", 1)
+            return facet.strip(), " ".join(value.split())
+        words = atom.split()
+        if len(words) > 1 and words[0] in self.bitsets:
+            return words[0], " ".join(words[1:])
+        value = " ".join(words)
+        facets = self.aliases.get(value)
+        if not facets:
+            raise FacetQueryError(f"Unknown facet value '{value}'")
+        if len(facets) > 1:
+            raise FacetQueryError(f"Ambiguous facet value '{value}', use one of: "
+                                  + ", ".join(f"{facet}:{value}" for facet in facets))
+        return facets[0], value
+
+    def _atom(self, atom: str) -> int:
+        negate = False
+        words = atom.split()
+        if words and words[0] == "not":
+            negate = True
+            atom = " ".join(words[1:])
+        if not atom:
+            raise FacetQueryError("Empty facet query term")
+        bits = self.bitset(*self._resolve(atom))
+        return self.all & ~bits if negate else bits
+
+    def query(self, expression: str) -> int:
+        """
+        Evaluate a facet query such as "balances Pitta AND Veg AND NOT dairy".
+        Terms are joined by AND / OR (AND binds looser: "a OR b AND c" is
+        (a OR b) AND c) and may be negated with NOT. A term is "facet:value",
+        "facet value" or a bare value that only one facet has (e.g. "veg",
+        "dairy", "cooling"). Matching is case-insensitive.
+        Args:
+            expression (str): Facet query; empty matches every row
+        Returns:
+            int: Bitset of matching rows
+        Raises:
+            FacetQueryError: Unknown facet, unknown or ambiguous bare value
+        """
+        expression = expression.strip().lower()
+        if not expression:
+            return self.all
+
+        # re.split keeps the operators: [term, op, term, op, ...]
+        parts = OPERATOR_RE.split(expression)
+        bits = self.all
+        clause = self._atom(parts[0])
+        for op, atom in zip(parts[1::2], parts[2::2]):
+            if op == "or":
+                clause |= self._atom(atom)
+            else:
+                bits &= clause
+                clause = self._atom(atom)
+        return bits & clause
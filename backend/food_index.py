@@ -0,0 +1,204 @@
+import re
+from array import array
+
+import numpy as np
+
+from catalogue import FoodRecords
+from food_facets import bitset_rows
+from ranking import top_k
+
+TOKEN_RE = re.compile(r"\w+")
+SYMBOL_RE = re.compile(r"[^\w\s]")
+GRAM_SIZE = 3
+
+
+def row_text(food: dict) -> str:
+    """
+    Normalized search text for one dataset row: all values, lowercased.
+    """
+    return " ".join(str(value) for value in food.values()).lower()
+
+
+def row_texts(data, row_ids: list) -> list:
+    """
+    row_text of each row in row_ids. FoodRecords are read a column at a
+    time instead of through one FoodRow view per row.
+    Args:
+        data (FoodRecords or list of dict): Dataset rows
+        row_ids (list of int)
+    """
+    if not isinstance(data, FoodRecords) or not data.columns:
+        return [row_text(data[row_id]) for row_id in row_ids]
+    columns = []
+    for column in data.column_map.values():
+        if len(row_ids) * 4 >= len(column):
+            # Most rows: decoding the whole column beats row-by-row access
+            values = column.tolist()
+            columns.append([values[row_id] for row_id in row_ids])
+        else:
+            columns.append([column[row_id] for row_id in row_ids])
+    return [" ".join(values).lower() for values in zip(*columns)]
+
+
+def grams(token: str) -> set:
+    return {token[i:i + GRAM_SIZE] for i in range(len(token) - GRAM_SIZE + 1)}
+
+
+class TextIndex:
+    def __init__(self, texts: list, texts_of=None):
+        """
+        Inverted index answering "which rows contain this substring" queries.
+        Rows are split into word tokens (row postings), and the token
+        vocabulary is indexed by character trigrams so a query piece only
+        has to be compared against tokens that can contain it. Punctuation
+        characters get row postings of their own, for terms without words.
+        Args:
+            texts (iterable of str): Normalized text per row (see row_text),
+                consumed in one pass
+            texts_of (callable): List of row ids -> the same texts, to check
+                the rows the postings cannot settle (terms with several
+                word-runs or with punctuation). If None the index keeps its
+                own copy of every text. Not called during construction.
+        """
+        self.vocab = []
+        self.postings = []
+        self.symbols = {}
+        self.size = 0
+        token_ids = {}
+        kept = [] if texts_of is None else None
+
+        for row_id, text in enumerate(texts):
+            if kept is not None:
+                kept.append(text)
+            for token in set(TOKEN_RE.findall(text)):
+                token_id = token_ids.get(token)
+                if token_id is None:
+                    token_id = token_ids[token] = len(self.vocab)
+                    self.vocab.append(token)
+                    self.postings.append(array("I"))
+                self.postings[token_id].append(row_id)
+            for symbol in set(SYMBOL_RE.findall(text)):
+                self.symbols.setdefault(symbol, array("I")).append(row_id)
+            self.size = row_id + 1
+        self.texts_of = (lambda row_ids: [kept[row_id] for row_id in row_ids]) if kept is not None else texts_of
+
+        self.gram_tokens = {}
+        for token_id, token in enumerate(self.vocab):
+            for gram in grams(token):
+                self.gram_tokens.setdefault(gram, array("I")).append(token_id)
+
+        self.tridoshic = self.search("tridoshic")
+
+    def _tokens_containing(self, piece: str):
+        if len(piece) < GRAM_SIZE:
+            return [i for i, token in enumerate(self.vocab) if piece in token]
+
+        candidates = None
+        for gram in sorted(grams(piece), key=lambda g: len(self.gram_tokens.get(g, ()))):
+            token_ids = self.gram_tokens.get(gram)
+            if not token_ids:
+                return []
+            candidates = set(token_ids) if candidates is None else candidates.intersection(token_ids)
+            if not candidates:
+                return []
+        return [i for i in candidates if piece in self.vocab[i]]
+
+    def _rows_with_piece(self, piece: str, starts: bool = False, ends: bool = False) -> set:
+        rows = set()
+        for token_id in self._tokens_containing(piece):
+            token = self.vocab[token_id]
+            if (starts and not token.startswith(piece)) or (ends and not token.endswith(piece)):
+                continue
+            rows.update(self.postings[token_id])
+        return rows
+
+    def search(self, term: str) -> set:
+        """
+        Return ids of rows whose text contains term (already lowercased).
+        Args:
+            term (str)
+        Returns:
+            set: Matching row ids
+        """
+        if not term:
+            return set(range(self.size))
+
+        # Any run of word characters in the term must sit inside one token of
+        # a matching row, so the posting lists give a candidate superset. A
+        # run next to a non-word character in the term must also start or end
+        # its token there, e.g. "no dairy" needs a token ending in "no".
+        pieces = sorted({(m.group(), m.start() > 0, m.end() < len(term)) for m in TOKEN_RE.finditer(term)},
+                        key=lambda piece: len(piece[0]), reverse=True)
+        if pieces:
+            candidates = self._rows_with_piece(*pieces[0])
+            for piece in pieces[1:]:
+                if not candidates:
+                    break
+                candidates &= self._rows_with_piece(*piece)
+            if pieces[0][0] == term:
+                # A single word-run is found exactly by the token lookup
+                return candidates
+        else:
+            # Only punctuation and spaces: rows with every punctuation character
+            symbols = sorted(set(SYMBOL_RE.findall(term)), key=lambda symbol: len(self.symbols.get(symbol, ())))
+            if not symbols:
+                candidates = range(self.size)
+            else:
+                candidates = set(self.symbols.get(symbols[0], ()))
+                for symbol in symbols[1:]:
+                    candidates.intersection_update(self.symbols.get(symbol, ()))
+                if symbols[0] == term:
+                    return candidates
+
+        candidates = list(candidates)
+        return {row_id for row_id, text in zip(candidates, self.texts_of(candidates)) if term in text}
+
+    def _scores(self, search, goal, concern, preferences, restrictions, allowed) -> tuple:
+        # Rows matching each scoring term
+        excluded = search(restrictions) if restrictions else set()
+        weighted = [(search(goal), 3), (search(concern), 2)]
+        if preferences:
+            weighted.append((search(preferences), 2))
+        weighted.append((self.tridoshic, 1))
+        if allowed is not None:
+            allowed_rows = set(bitset_rows(allowed).tolist())
+            weighted = [(rows & allowed_rows, points) for rows, points in weighted]
+
+        # Scoring (only rows matching at least one term can score above 0)
+        scores = {}
+        for rows, points in weighted:
+            for row_id in rows:
+                if row_id not in excluded:
+                    scores[row_id] = scores.get(row_id, 0) + points
+        return scores, excluded
+
+    def rank(self, search, goal, concern, preferences, restrictions, k=5, allowed=None, tie_keys=()) -> list:
+        """
+        Score rows for lowercased query terms and return the top k row ids,
+        best score first, then by tie_keys, then dataset order.
+        Args:
+            search (callable): Term -> matching rows (self.search or a memo of it)
+            allowed (int): Optional bitset (see food_facets) of the only rows
+                that may be ranked
+            tie_keys (list of ndarray): Per-row tie-breaker keys (see ranking.top_k)
+        Returns:
+            list: Row ids with a positive score
+        """
+        scores, _ = self._scores(search, goal, concern, preferences, restrictions, allowed)
+        row_ids = np.fromiter(scores, dtype=np.int64, count=len(scores))
+        points = np.fromiter(scores.values(), dtype=np.int64, count=len(scores))
+        return top_k(row_ids, points, k, tie_keys).tolist()
+
+    def score_array(self, search, goal, concern, preferences, restrictions, allowed=None) -> np.ndarray:
+        """
+        The scores rank() orders by, for every row: int64, 0 for rows matching
+        no term and -1 for rows excluded by restrictions or allowed.
+        """
+        scores, excluded = self._scores(search, goal, concern, preferences, restrictions, allowed)
+        out = np.zeros(self.size, dtype=np.int64)
+        if allowed is not None:
+            out[:] = -1
+            out[bitset_rows(allowed)] = 0
+        out[list(excluded)] = -1
+        out[list(scores)] = list(scores.values())
+        return out
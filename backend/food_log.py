@@ -0,0 +1,263 @@
+import datetime
+import json
+import sqlite3
+import threading
+
+from metrics import timed
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    logged_at TEXT NOT NULL,
+    log_date TEXT NOT NULL,
+    dish TEXT NOT NULL,
+    predicted INTEGER NOT NULL,
+    record TEXT NOT NULL,
+    patient_id TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS entries_by_date ON entries (log_date, id);
+CREATE TABLE IF NOT EXISTS entry_nutrients (
+    entry_id INTEGER NOT NULL REFERENCES entries (id),
+    log_date TEXT NOT NULL,
+    nutrient TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS nutrients_by_date ON entry_nutrients (log_date, nutrient);
+"""
+
+# Per patient, day and nutrient: running total and number of entries,
+# updated in the same transaction as every append
+ROLLUP_SCHEMA = """
+CREATE INDEX IF NOT EXISTS entries_by_patient ON entries (patient_id, log_date, id);
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    patient_id TEXT NOT NULL,
+    log_date TEXT NOT NULL,
+    nutrient TEXT NOT NULL,
+    total REAL NOT NULL,
+    entries INTEGER NOT NULL,
+    PRIMARY KEY (patient_id, log_date, nutrient)
+) WITHOUT ROWID;
+"""
+
+FULL_TOTALS = """
+SELECT e.patient_id, n.log_date, n.nutrient, SUM(n.value), COUNT(*)
+FROM entry_nutrients n JOIN entries e ON e.id = n.entry_id
+"""
+
+
+class _Append:
+    def __init__(self, rows):
+        self.rows = rows
+        self.done = False
+        self.error = None
+
+
+class FoodLogStore:
+    def __init__(self, path: str):
+        """
+        Append-only food log in SQLite (WAL mode). Every logged dish is one
+        entry with its resolved nutrients, indexed by date so range queries
+        and daily totals run in the database instead of re-parsing text logs.
+        Args:
+            path (str): Database file, created if missing
+        """
+        self.path = path
+        self._local = threading.local()
+        self._pending = []
+        self._writing = False
+        self._cond = threading.Condition()
+
+        self._writer = self._connect(check_same_thread=False)
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.executescript(SCHEMA)
+        columns = [row[1] for row in self._writer.execute("PRAGMA table_info(entries)")]
+        if "patient_id" not in columns:
+            # Logs written before entries were tagged with a patient
+            self._writer.execute("ALTER TABLE entries ADD COLUMN patient_id TEXT NOT NULL DEFAULT ''")
+        has_rollups = self._writer.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_rollups'"
+        ).fetchone()
+        self._writer.executescript(ROLLUP_SCHEMA)
+        self._writer.commit()
+        if not has_rollups:
+            self.rebuild_rollups()
+
+    def _connect(self, check_same_thread=True):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=check_same_thread)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _reader(self):
+        # One read connection per thread; WAL readers never block the writer
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect()
+        return conn
+
+    @timed("log_write")
+    def append(self, log_date: str, results: list, nutrient_cols: list, patient_id: str = ""):
+        """
+        Log one batch of lookup results. Batches from concurrent callers are
+        committed together: whichever caller finds the writer idle writes
+        every pending batch in one transaction while the others wait.
+        Args:
+            log_date (str): YYYY-MM-DD the dishes are logged under
+            results (list of dict): FoodTracker results, JSON-ready
+            nutrient_cols (list): Result keys to total as nutrients
+            patient_id (str): Patient the dishes are logged for, "" if unknown
+        """
+        logged_at = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        rows = []
+        for info in results:
+            nutrients = [(col, float(info[col])) for col in nutrient_cols
+                         if isinstance(info.get(col), (int, float))]
+            rows.append((patient_id, logged_at, log_date, str(info.get("Dish Name", "")),
+                         int(bool(info.get("Prediction"))), json.dumps(info), nutrients))
+        job = _Append(rows)
+
+        with self._cond:
+            self._pending.append(job)
+            while not job.done:
+                if self._writing:
+                    self._cond.wait()
+                    continue
+                self._writing = True
+                batch, self._pending = self._pending, []
+                self._cond.release()
+                try:
+                    error = self._write(batch)
+                finally:
+                    self._cond.acquire()
+                    self._writing = False
+                for queued in batch:
+                    queued.done = True
+                    queued.error = error
+                self._cond.notify_all()
+
+        if job.error is not None:
+            raise job.error
+
+    def _write(self, batch):
+        try:
+            with self._writer:
+                for job in batch:
+                    for patient_id, logged_at, log_date, dish, predicted, record, nutrients in job.rows:
+                        entry_id = self._writer.execute(
+                            "INSERT INTO entries (patient_id, logged_at, log_date, dish, predicted, record) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            (patient_id, logged_at, log_date, dish, predicted, record),
+                        ).lastrowid
+                        self._writer.executemany(
+                            "INSERT INTO entry_nutrients (entry_id, log_date, nutrient, value) VALUES (?, ?, ?, ?)",
+                            [(entry_id, log_date, col, value) for col, value in nutrients],
+                        )
+                        self._writer.executemany(
+                            "INSERT INTO daily_rollups (patient_id, log_date, nutrient, total, entries) "
+                            "VALUES (?, ?, ?, ?, 1) ON CONFLICT (patient_id, log_date, nutrient) "
+                            "DO UPDATE SET total = total + excluded.total, entries = entries + 1",
+                            [(patient_id, log_date, col, value) for col, value in nutrients],
+                        )
+        except Exception as e:
+            return e
+        return None
+
+    def rebuild_rollups(self):
+        """
+        Recompute every rollup from the logged entries.
+        """
+        with self._cond:
+            # Appenders queue up behind the lock until the rebuild commits
+            while self._writing:
+                self._cond.wait()
+            with self._writer:
+                self._writer.execute("DELETE FROM daily_rollups")
+                self._writer.execute(
+                    "INSERT INTO daily_rollups (patient_id, log_date, nutrient, total, entries) "
+                    + FULL_TOTALS + "GROUP BY e.patient_id, n.log_date, n.nutrient"
+                )
+
+    def entries(self, start: str, end: str = None, patient_id: str = None) -> list:
+        """
+        Logged entries with start <= log_date <= end, in logging order.
+        Args:
+            patient_id (str): Only this patient's entries; None for everyone
+        Returns:
+            list of dict: The stored result plus "Date" and "Logged At"
+        """
+        query = "SELECT log_date, logged_at, record FROM entries WHERE log_date BETWEEN ? AND ?"
+        params = [start, end or start]
+        if patient_id is not None:
+            query += " AND patient_id = ?"
+            params.append(patient_id)
+        rows = self._reader().execute(query + " ORDER BY log_date, id", params).fetchall()
+        return [{"Date": log_date, "Logged At": logged_at, **json.loads(record)}
+                for log_date, logged_at, record in rows]
+
+    def daily_totals(self, start: str, end: str = None, patient_id: str = None) -> dict:
+        """
+        Sum of each nutrient per day for start <= log_date <= end, read from
+        the rollups: one row per (day, nutrient) however many dishes were logged.
+        Args:
+            patient_id (str): Only this patient's entries; None for everyone
+        Returns:
+            dict: {date: {nutrient: total}} for days with entries
+        """
+        query = "SELECT log_date, nutrient, SUM(total) FROM daily_rollups WHERE log_date BETWEEN ? AND ?"
+        params = [start, end or start]
+        if patient_id is not None:
+            query += " AND patient_id = ?"
+            params.append(patient_id)
+        return self._totals(self._reader().execute(query + " GROUP BY log_date, nutrient", params))
+
+    def recompute_daily_totals(self, start: str, end: str = None, patient_id: str = None) -> dict:
+        """
+        Same result as daily_totals, aggregated from every logged entry
+        instead of the rollups. Used to check them.
+        """
+        query = FULL_TOTALS + "WHERE n.log_date BETWEEN ? AND ?"
+        params = [start, end or start]
+        if patient_id is not None:
+            query += " AND e.patient_id = ?"
+            params.append(patient_id)
+        rows = self._reader().execute(query + " GROUP BY n.log_date, n.nutrient", params)
+        return self._totals((log_date, nutrient, total) for _, log_date, nutrient, total, _ in rows)
+
+    @staticmethod
+    def _totals(rows):
+        totals = {}
+        for log_date, nutrient, total in sorted(rows):
+            totals.setdefault(log_date, {})[nutrient] = total
+        return totals
+
+    def summary(self, start: str, end: str, patient_id: str = None, period: str = "day") -> list:
+        """
+        Nutrient totals per day or per week (Monday to Sunday, clipped to
+        start..end), built from daily_totals.
+        Args:
+            period (str): "day" or "week"
+        Returns:
+            list of dict: {"start", "end", "days_logged", "totals"} per period
+            with entries, oldest first
+        """
+        if period not in ("day", "week"):
+            raise ValueError(f"Unknown period: {period}")
+        first, last = datetime.date.fromisoformat(start), datetime.date.fromisoformat(end)
+
+        periods = {}
+        for log_date, totals in self.daily_totals(start, end, patient_id).items():
+            day = datetime.date.fromisoformat(log_date)
+            if period == "week":
+                bucket_start = max(first, day - datetime.timedelta(days=day.weekday()))
+                bucket_end = min(last, day + datetime.timedelta(days=6 - day.weekday()))
+            else:
+                bucket_start = bucket_end = day
+            bucket = periods.setdefault(bucket_start, {
+                "start": bucket_start.isoformat(),
+                "end": bucket_end.isoformat(),
+                "days_logged": 0,
+                "totals": {},
+            })
+            bucket["days_logged"] += 1
+            for nutrient, total in totals.items():
+                bucket["totals"][nutrient] = bucket["totals"].get(nutrient, 0.0) + total
+        return [periods[key] for key in sorted(periods)]
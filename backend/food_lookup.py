@@ -0,0 +1,97 @@
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+
+import numpy as np
+
+from food_index import TextIndex
+
+REGEX_CHARS = set(".^$*+?{}[]\\|()")
+
+
+class DishLookup:
+    def __init__(self, names: list):
+        """
+        Indexes over a dish-name column, built once so each lookup tier of
+        FoodTracker.get_food_info avoids a full scan of the dataset.
+        Args:
+            names (list): Normalized dish name per row, None for missing names
+        """
+        self.names = names
+
+        # Exact tier: name -> first row with that name
+        self.exact_rows = {}
+        for row_id, name in enumerate(names):
+            if name is not None and name not in self.exact_rows:
+                self.exact_rows[name] = row_id
+
+        # Partial tier: substring index over the names
+        self.text_index = TextIndex((name if name is not None else "" for name in names),
+                                    texts_of=lambda row_ids: [self.names[row_id] or "" for row_id in row_ids])
+
+        # Fuzzy tier: per-name character counts, an upper bound on difflib's ratio
+        self.fuzzy_names = list(self.exact_rows)
+        self.fuzzy_lengths = np.array([len(name) for name in self.fuzzy_names], dtype=np.int64)
+        self.alphabet = {ch: i for i, ch in enumerate(sorted({ch for name in self.fuzzy_names for ch in name}))}
+        self.char_counts = np.zeros((len(self.fuzzy_names), len(self.alphabet)), dtype=np.uint16)
+        for i, name in enumerate(self.fuzzy_names):
+            for ch, count in Counter(name).items():
+                self.char_counts[i, self.alphabet[ch]] = count
+
+    def exact(self, dish_name: str):
+        """
+        Row id of the first dish named exactly dish_name, or None.
+        """
+        return self.exact_rows.get(dish_name)
+
+    def partial(self, dish_name: str):
+        """
+        Row id of the first dish whose name matches dish_name the way
+        pandas' str.contains does (as a regex), or None.
+        """
+        if REGEX_CHARS.intersection(dish_name):
+            pattern = re.compile(dish_name)
+            return next((row_id for row_id, name in enumerate(self.names)
+                         if name is not None and pattern.search(name)), None)
+
+        rows = self.text_index.search(dish_name)
+        return min((row_id for row_id in rows if self.names[row_id] is not None), default=None)
+
+    def fuzzy(self, dish_name: str, cutoff: float = 0.7):
+        """
+        Row id of the first dish named like difflib.get_close_matches(dish_name,
+        names, n=1, cutoff) would pick, or None. Names are only compared with
+        SequenceMatcher when their character-count bound can still beat the
+        best ratio found so far.
+        """
+        if not self.fuzzy_names:
+            return None
+
+        query = np.zeros(len(self.alphabet), dtype=np.uint16)
+        for ch, count in Counter(dish_name).items():
+            if ch in self.alphabet:
+                query[self.alphabet[ch]] = count
+
+        # Same bounds as SequenceMatcher.real_quick_ratio and quick_ratio
+        lengths = len(dish_name) + self.fuzzy_lengths
+        length_bound = 2.0 * np.minimum(len(dish_name), self.fuzzy_lengths) / lengths
+        candidates = np.flatnonzero(length_bound >= cutoff)
+        matches = np.minimum(self.char_counts[candidates], query).sum(axis=1, dtype=np.int64)
+        bounds = 2.0 * matches / lengths[candidates]
+        order = np.argsort(-bounds, kind="stable")
+
+        best = None
+        matcher = SequenceMatcher()
+        matcher.set_seq2(dish_name)
+        for i in order:
+            bound = bounds[i]
+            if bound < cutoff or (best is not None and bound < best[0]):
+                break
+            name = self.fuzzy_names[candidates[i]]
+            matcher.set_seq1(name)
+            ratio = matcher.ratio()
+            # get_close_matches keeps the largest (ratio, name) pair
+            if ratio >= cutoff and (best is None or (ratio, name) > best):
+                best = (ratio, name)
+
+        return self.exact_rows[best[1]] if best is not None else None
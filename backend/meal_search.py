@@ -0,0 +1,99 @@
+import numpy as np
+
+# Meal slot -> share of the day's calories it should carry
+MEAL_SLOTS = {"Breakfast": 0.25, "Lunch": 0.35, "Snack": 0.10, "Dinner": 0.25, "Drink": 0.05}
+# Dataset columns the targets apply to, calories first
+NUTRIENT_COLUMNS = ["Total Calories", "Total Carbs", "Total Fats", "Total Protein"]
+
+# Cost weights: a meal's calories straying from its slot share, and the
+# bonus for a food's relevance to the goal/concern (normalized to 0..1),
+# both relative to a day's squared relative miss on each target
+SLOT_WEIGHT = 0.5
+RELEVANCE_WEIGHT = 0.01
+MAX_PASSES = 5
+
+
+class MealSearch:
+    def __init__(self, nutrients, relevance, targets, slots: dict = None):
+        """
+        Fills meal slots over several days from a candidate pool, keeping
+        each day's nutrient totals close to the targets: a greedy pass picks
+        slot by slot, then local search swaps single meals while that lowers
+        the day's cost. Ties go to the earlier candidate, so results are
+        deterministic.
+        Args:
+            nutrients (ndarray): (candidates, len(NUTRIENT_COLUMNS)) float64
+            relevance (ndarray): Per-candidate goal/concern score, >= 0
+            targets (ndarray): Daily target per nutrient column, NaN for none;
+                the calorie target is required
+            slots (dict): Slot name -> calorie share (default MEAL_SLOTS)
+        """
+        self.slots = list((slots or MEAL_SLOTS).items())
+        targeted = ~np.isnan(targets)
+        self.targets = targets[targeted]
+        # Nutrients scaled by their daily target; a day on target sums to 1
+        self.scaled = nutrients[:, targeted] / self.targets
+        self.calories = nutrients[:, 0] / targets[0]
+        top = relevance.max() if len(relevance) else 0
+        self.bonus = RELEVANCE_WEIGHT * (relevance / top if top > 0 else np.zeros(len(relevance)))
+        self.size = len(nutrients)
+
+    def _slot_costs(self, slot: int) -> np.ndarray:
+        # Per-candidate cost of filling a slot, apart from the day totals
+        share = self.slots[slot][1]
+        return SLOT_WEIGHT * (self.calories - share) ** 2 - self.bonus
+
+    def _forbidden(self, plan: list, day: int, slot: int, window: int) -> list:
+        # Foods already used within the no-repeat window around (day, slot)
+        if window <= 0:
+            return []
+        used = []
+        for other in range(max(0, day - window + 1), min(len(plan), day + window)):
+            used.extend(food for s, food in enumerate(plan[other])
+                        if food is not None and (other, s) != (day, slot))
+        return used
+
+    def search(self, days: int, window: int) -> list:
+        """
+        Plan days of meals with no candidate repeated within window days.
+        Args:
+            days (int): Number of days
+            window (int): No-repeat window in days; 1 only forbids repeats
+                within a day, 0 allows any repeat
+        Returns:
+            list: Per day, one candidate index per slot
+        """
+        n_slots = len(self.slots)
+        slot_costs = [self._slot_costs(s) for s in range(n_slots)]
+        plan = [[None] * n_slots for _ in range(days)]
+
+        # Greedy: each slot moves the day's totals toward its cumulative share
+        for day in range(days):
+            totals = np.zeros(len(self.targets))
+            share = 0.0
+            for slot in range(n_slots):
+                share += self.slots[slot][1]
+                cost = ((totals + self.scaled - share) ** 2).sum(axis=1) + slot_costs[slot]
+                cost[self._forbidden(plan, day, slot, window)] = np.inf
+                food = int(np.argmin(cost))
+                plan[day][slot] = food
+                totals += self.scaled[food]
+
+        # Local search: replace one meal at a time while the day gets cheaper
+        for _ in range(MAX_PASSES):
+            improved = False
+            for day in range(days):
+                totals = self.scaled[plan[day]].sum(axis=0)
+                for slot in range(n_slots):
+                    current = plan[day][slot]
+                    base = totals - self.scaled[current]
+                    cost = ((base + self.scaled - 1) ** 2).sum(axis=1) + slot_costs[slot]
+                    cost[self._forbidden(plan, day, slot, window)] = np.inf
+                    food = int(np.argmin(cost))
+                    if cost[food] < cost[current] - 1e-12:
+                        plan[day][slot] = food
+                        totals = base + self.scaled[food]
+                        improved = True
+            if not improved:
+                break
+        return plan
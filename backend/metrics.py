@@ -0,0 +1,285 @@
+import functools
+import os
+import random
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+
+# Set METRICS_ENABLED=0 to turn every timer and counter into a no-op
+enabled = os.environ.get("METRICS_ENABLED", "1") != "0"
+
+# Seconds; the last bucket (+Inf) is implicit
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def format_labels(labelnames: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{escape(str(value))}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: tuple = ()):
+        """
+        Monotonic counter per label combination, Prometheus "counter" type.
+        Args:
+            name (str): Metric name, ending in _total by convention
+            help_text (str): HELP line
+            labelnames (tuple): Label names; inc() takes values in this order
+        """
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        if not enabled:
+            return
+        with self._lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self.values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        """
+        Latency histogram per label combination, Prometheus "histogram" type:
+        cumulative bucket counts, sum and count.
+        Args:
+            name (str): Metric name, in seconds by convention
+            help_text (str): HELP line
+            labelnames (tuple): Label names; observe() takes values in this order
+            buckets (tuple): Increasing upper bounds, +Inf added implicitly
+        """
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self.series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        if not enabled:
+            return
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self.series.items())
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else format_value(bound)
+                bucket_labels = format_labels(self.labelnames, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labelnames, labels)} {total!r}")
+            lines.append(f"{self.name}_count{format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        """
+        Metrics of this process, rendered together in the Prometheus text
+        exposition format. Collectors add lines computed at scrape time.
+        """
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector):
+        """
+        Args:
+            collector (callable): Returns a list of exposition lines
+        """
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "aahaar_stage_seconds", "Time spent in each backend stage.", ("stage",)))
+MATCH_TIER = REGISTRY.register(Counter(
+    "aahaar_food_match_total", "Dishes resolved by each nutrition lookup tier.", ("tier",)))
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.observe((stage,), seconds)
+
+
+def timed(stage: str):
+    """
+    Decorator recording each call's duration under stage in STAGE_SECONDS.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                STAGE_SECONDS.observe((stage,), time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+class ProcessSamplingProfiler:
+    def __init__(self, interval: float = 0.001):
+        """
+        Samples the Python stacks of every thread in the process except its
+        own every interval seconds while running, and counts them in folded
+        form ("module:function;module:function") as used by flame graph tools.
+        All threads are sampled because request work runs in thread pools,
+        out of reach of a per-thread profiler like cProfile. The profile is
+        process-wide: it also contains other requests served meanwhile, plus
+        idle pool and server threads.
+        """
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="process-sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                folded = ";".join(reversed(stack))
+                self.stacks[folded] = self.stacks.get(folded, 0) + 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        """
+        One "stack count" line per distinct stack, most frequent first.
+        """
+        return "".join(f"{stack} {count}\n"
+                       for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1]))
+
+
+HTTP_SECONDS = REGISTRY.register(Histogram(
+    "aahaar_http_request_seconds", "Request latency by route and response status.", ("method", "route", "status")))
+PROFILES = REGISTRY.register(Counter(
+    "aahaar_profiles_total", "Requests run under the process-wide sampling profiler."))
+
+
+class RequestMetrics:
+    def __init__(self, app, profile_rate: float = 0.0, profile_header: bool = False,
+                 profile_dir: str = None, profile_interval: float = 0.001):
+        """
+        ASGI middleware timing every HTTP request into HTTP_SECONDS, labelled
+        with the route template (e.g. /get-log/{date}) rather than the raw path.
+        Optionally runs a ProcessSamplingProfiler for the duration of a request
+        and writes its folded stacks to profile_dir: a random profile_rate
+        share of requests, plus requests sending "X-Profile: 1" when
+        profile_header is set. The stacks cover the whole worker process, not
+        only that request. With both off the profiler costs one comparison
+        per request.
+        """
+        self.app = app
+        self.profile_rate = profile_rate
+        self.profile_header = profile_header
+        self.profile_dir = profile_dir
+        self.profile_interval = profile_interval
+
+    def _wants_profile(self, scope) -> bool:
+        if self.profile_rate and random.random() < self.profile_rate:
+            return True
+        return self.profile_header and (b"x-profile", b"1") in scope.get("headers", ())
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profiler = None
+        if (self.profile_rate or self.profile_header) and self._wants_profile(scope):
+            profiler = ProcessSamplingProfiler(self.profile_interval).start()
+        status = 500
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            HTTP_SECONDS.observe((scope["method"], getattr(route, "path", "unmatched"), str(status)), elapsed)
+            if profiler is not None:
+                profiler.stop()
+                PROFILES.inc()
+                # asyncio is imported here so CLI users of the timers do not load it
+                import asyncio
+                await asyncio.to_thread(self._write_profile, profiler, scope, elapsed)
+
+    def _write_profile(self, profiler, scope, elapsed):
+        if not self.profile_dir:
+            return
+        os.makedirs(self.profile_dir, exist_ok=True)
+        route = getattr(scope.get("route"), "path", "unmatched")
+        # <unix ms>-<route>-<duration>ms.folded
+        name = f"{int(time.time() * 1000)}-{re.sub(r'[^A-Za-z0-9]+', '_', route).strip('_') or 'root'}-{int(elapsed * 1000)}ms"
+        with open(os.path.join(self.profile_dir, name + ".folded"), "w", encoding="utf-8") as f:
+            f.write(profiler.folded())
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+
+class PdfCache:
+    def __init__(self, directory: str, max_entries: int = 1000):
+        """
+        Content-addressed on-disk cache of rendered PDFs. Each entry is named
+        by the sha256 of the fields it was rendered from, so identical
+        requests map to the same file and different ones never collide.
+        Args:
+            directory (str): Cache directory, created if missing
+            max_entries (int): Oldest entries are pruned beyond this count
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(*fields) -> str:
+        payload = json.dumps(fields, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key: str):
+        """
+        Return the cached PDF bytes for key, or None.
+        """
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes):
+        # Write to a unique temp file, then rename: readers never see partial PDFs
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % 100 == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """
+        Delete the oldest entries beyond max_entries.
+        """
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pdf"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    continue
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
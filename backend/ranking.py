@@ -0,0 +1,106 @@
+import zlib
+
+import numpy as np
+
+from food_facets import DOSHAS, bitset_rows
+from meal_search import MEAL_SLOTS
+
+# Calories of an average meal on a 2000 kcal day, for the "calories" tie-breaker
+MEAL_CALORIES = 2000.0 / len(MEAL_SLOTS)
+TIE_BREAKERS = ("calories", "dosha")
+
+
+def top_k(row_ids: np.ndarray, scores: np.ndarray, k: int, tie_keys: list = ()) -> np.ndarray:
+    """
+    The k best candidate rows: highest score first, then each tie key
+    ascending, then dataset order. Rather than sorting every candidate, each
+    key in turn partitions only the rows still tied for the k-th place, so
+    selection is O(n) per key; just the k winners get sorted.
+    Args:
+        row_ids (ndarray): Candidate row ids (int64), each once
+        scores (ndarray): Score per candidate
+        k (int): Number of rows to return
+        tie_keys (list of ndarray): Per-row keys indexed by row id, lower
+            first, without NaN
+    Returns:
+        ndarray: Up to k row ids, best first
+    """
+    if k <= 0:
+        return row_ids[:0]
+    if not tie_keys and np.issubdtype(np.asarray(scores).dtype, np.integer):
+        # Integer scores and no tie keys fold into one unique key, one partition
+        keys = row_ids - scores * (int(row_ids.max(initial=0)) + 1)
+        if len(keys) > k:
+            top = np.argpartition(keys, k - 1)[:k]
+            row_ids, keys = row_ids[top], keys[top]
+        return row_ids[np.argsort(keys)]
+    keys = [-np.asarray(scores)] + [key[row_ids] for key in tie_keys] + [row_ids]
+    chosen = []
+    tied = np.arange(len(row_ids))
+    need = k
+    for key in keys:
+        if len(tied) <= need:
+            break
+        values = key[tied]
+        kth = np.partition(values, need - 1)[need - 1]
+        ahead = values < kth
+        chosen.append(tied[ahead])
+        need -= int(ahead.sum())
+        tied = tied[values == kth]
+    picked = np.concatenate(chosen + [tied])
+    order = np.lexsort([key[picked] for key in reversed(keys)])
+    return row_ids[picked[order]]
+
+
+def request_seed(*fields) -> int:
+    """
+    Seed for the random fallback derived from the request fields, so equal
+    requests get equal plans in every process (hash() is salted per process).
+    """
+    return zlib.crc32("\x1f".join(fields).encode("utf-8"))
+
+
+class TieBreakers:
+    def __init__(self, names, calories: np.ndarray, facets):
+        """
+        Orders foods that score the same for a request. Keys apply in the
+        order named; dataset order settles whatever they leave tied.
+            "calories": closest to MEAL_CALORIES first, unknown calories last
+            "dosha": foods balancing the doshas the request names (e.g. a
+                "pitta" concern) first, foods aggravating them last
+        Args:
+            names (iterable of str): Tie-breakers from TIE_BREAKERS
+            calories (ndarray): Calories per row, NaN if unknown
+            facets (FacetIndex): Finished facet index of the same rows
+        Raises:
+            ValueError: Unknown tie-breaker
+        """
+        self.names = tuple(names)
+        for name in self.names:
+            if name not in TIE_BREAKERS:
+                raise ValueError(f"Unknown tie-breaker: {name} (expected one of {', '.join(TIE_BREAKERS)})")
+        self.facets = facets
+        self.size = len(calories)
+        self.calories = np.nan_to_num(np.abs(calories - MEAL_CALORIES), nan=np.inf) \
+            if "calories" in self.names else None
+        # Named doshas -> key array; at most 2 ** len(DOSHAS) of them
+        self._dosha_keys = {}
+
+    def _dosha_key(self, terms: tuple) -> np.ndarray:
+        doshas = tuple(dosha for dosha in DOSHAS if any(dosha in term for term in terms))
+        key = self._dosha_keys.get(doshas)
+        if key is None:
+            key = np.zeros(self.size, dtype=np.int64)
+            for dosha in doshas:
+                key[bitset_rows(self.facets.bitset("balances", dosha))] -= 1
+                key[bitset_rows(self.facets.bitset("aggravates", dosha))] += 1
+            self._dosha_keys[doshas] = key
+        return key
+
+    def keys(self, *terms) -> list:
+        """
+        Key arrays for one request, for top_k.
+        Args:
+            terms (str): The request's lowercased goal, concern and preferences
+        """
+        return [self.calories if name == "calories" else self._dosha_key(terms) for name in self.names]
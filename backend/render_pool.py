@@ -0,0 +1,160 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+
+from metrics import observe_stage
+from simple_pdf import get_template, render_diet_pdf
+
+
+class RenderPoolBusy(Exception):
+    """Raised when the pool already has max_pending jobs queued or running."""
+
+
+class RenderTimeout(Exception):
+    """Raised when a render job does not finish within the pool's timeout."""
+
+
+def _warm_worker():
+    # Build the PDF template once per worker process instead of on its first job
+    get_template()
+
+
+def _render_chunk(jobs):
+    return [render_diet_pdf(*job) for job in jobs]
+
+
+class RenderPool:
+    def __init__(self, workers: int = None, max_pending: int = None, timeout: float = 10.0):
+        """
+        Diet-chart rendering on a pool of worker processes, so PDF rendering
+        is not limited by the API process's GIL. Workers come from a fork
+        server, not a fork of the API process: forking a threaded process
+        can copy a lock another thread holds (e.g. a metric's) into the child,
+        where it never gets released.
+        Args:
+            workers (int): Worker processes; 0 renders in the calling thread
+            max_pending (int): Jobs allowed in flight before RenderPoolBusy
+            timeout (float): Seconds to wait for one job before RenderTimeout
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending if max_pending is not None else max(1, self.workers) * 4
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._executor is None and self.workers > 0:
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("forkserver"),
+                                                     initializer=_warm_worker)
+        return self
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _submit(self, fn, jobs):
+        if not self._slots.acquire(blocking=False):
+            raise RenderPoolBusy()
+        future = self.start()._executor.submit(fn, jobs)
+        # The slot frees when the job really ends, even if the caller gave up
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _run(self, fn, jobs, timeout):
+        if self.workers <= 0:
+            if not self._slots.acquire(blocking=False):
+                raise RenderPoolBusy()
+            try:
+                return fn(jobs)
+            finally:
+                self._slots.release()
+
+        start = time.perf_counter()
+        future = self._submit(fn, jobs)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise RenderTimeout()
+        finally:
+            # Wait plus render in a worker; the worker's own timers stay in that process
+            observe_stage("render_pool_job", time.perf_counter() - start)
+
+    async def _run_async(self, fn, jobs, timeout):
+        if self.workers <= 0:
+            return await asyncio.to_thread(self._run, fn, jobs, timeout)
+
+        start = time.perf_counter()
+        future = self._submit(fn, jobs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise RenderTimeout()
+        finally:
+            observe_stage("render_pool_job", time.perf_counter() - start)
+
+    def render(self, *args) -> bytes:
+        """
+        Render one chart (same arguments as simple_pdf.render_diet_pdf).
+        """
+        return self._run(_render_chunk, [args], self.timeout)[0]
+
+    async def render_async(self, *args) -> bytes:
+        """
+        render() for async handlers: waits on the worker without holding a thread.
+        """
+        return (await self._run_async(_render_chunk, [args], self.timeout))[0]
+
+    def render_many(self, jobs: list) -> list:
+        """
+        Render a batch of charts, split into one chunk per worker (at most
+        max_pending chunks). Each chunk counts against max_pending once.
+        Args:
+            jobs (list of tuples): render_diet_pdf arguments per chart
+        Returns:
+            list: PDF bytes per job, in order
+        """
+        chunks, timeout = self._chunks(jobs)
+        if not chunks:
+            return []
+        if self.workers <= 0:
+            return self._run(_render_chunk, jobs, timeout)
+
+        start = time.perf_counter()
+        futures = [self._submit(_render_chunk, chunk) for chunk in chunks]
+        try:
+            return [pdf for future in futures for pdf in future.result(timeout=timeout)]
+        except FutureTimeout:
+            for future in futures:
+                future.cancel()
+            raise RenderTimeout()
+        finally:
+            observe_stage("render_pool_job", time.perf_counter() - start)
+
+    async def render_many_async(self, jobs: list) -> list:
+        """
+        render_many() for async handlers.
+        """
+        chunks, timeout = self._chunks(jobs)
+        if not chunks:
+            return []
+        if self.workers <= 0:
+            return await self._run_async(_render_chunk, jobs, timeout)
+        results = await asyncio.gather(*(self._run_async(_render_chunk, chunk, timeout) for chunk in chunks))
+        return [pdf for chunk in results for pdf in chunk]
+
+    def _chunks(self, jobs):
+        # One chunk per worker, at most max_pending; the timeout scales with chunk size
+        if not jobs:
+            return [], self.timeout
+        chunk_size = math.ceil(len(jobs) / max(1, min(self.workers, self.max_pending)))
+        return [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)], self.timeout * chunk_size
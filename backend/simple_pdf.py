@@ -1,122 +1,323 @@
-import csv
-import sys
-import os
-import random
 import datetime
-from fpdf import FPDF
+import threading
+import zlib
+from metrics import timed
 
+# Page geometry, in mm unless noted (A4 with FPDF's default margins)
+K = 72 / 25.4  # points per mm
+PAGE_W, PAGE_H = 210.0, 297.0
+LEFT_MARGIN = 10.0
+CELL_MARGIN = 1.0
+CONTENT_W = PAGE_W - 2 * LEFT_MARGIN
+
+# Bump whenever the chart layout or wording changes, so cached charts are not reused
+TEMPLATE_VERSION = 2
+
+GREEN = (0, 100, 0)
+BLACK = (0, 0, 0)
+GREY = (100, 100, 100)
+
+# Font style -> (resource name, base font)
+FONTS = {"B": ("F1", "Helvetica-Bold"), "": ("F2", "Helvetica"), "I": ("F3", "Helvetica-Oblique")}
+
+MEAL_TIMES = {
+    "Breakfast": "8:00 AM",
+    "Lunch": "12:30 PM",
+    "Snack": "4:00 PM",
+    "Dinner": "7:00 PM",
+    "Drink": "Throughout the day"
+}
+
+PRINCIPLES = [
+    "- Eat at regular times to maintain digestive fire (Agni)",
+    "- Include all six tastes (sweet, sour, salty, bitter, pungent, astringent)",
+    "- Favor warm, cooked foods over cold, raw foods",
+    "- Drink warm water throughout the day",
+    "- Practice mindful eating without distractions",
+    "- Include seasonal and locally available foods"
+]
+
+_metrics_pdf = None
+_metrics_lock = threading.Lock()
+
+
+def string_width(style, size, text):
+    """
+    Width in mm of text in Helvetica, measured with FPDF's core-font metrics.
+    """
+    global _metrics_pdf
+    with _metrics_lock:
+        if _metrics_pdf is None:
+            # fpdf is only needed for its font metrics, once per process
+            from fpdf import FPDF
+            _metrics_pdf = FPDF()
+        _metrics_pdf.set_font("Helvetica", style, size)
+        return _metrics_pdf.get_string_width(text)
+
+
+# (style, size) -> {character: width in mm}, filled once per font under the metrics lock
+_glyph_widths = {}
+
+
+def text_width(style, size, text):
+    """
+    Width in mm of Latin-1 text in Helvetica, summed from a per-font table of
+    glyph widths so that only the first measurement of a font takes the
+    metrics lock. Core-font widths have no kerning, so the sum matches
+    string_width.
+    """
+    widths = _glyph_widths.get((style, size))
+    if widths is None:
+        widths = {chr(c): string_width(style, size, chr(c)) for c in range(256)}
+        _glyph_widths[(style, size)] = widths
+    try:
+        return sum(widths[c] for c in text)
+    except KeyError:
+        return string_width(style, size, text)
+
+
+class UnsupportedTextError(ValueError):
+    """Raised for chart text outside Latin-1, which the standard PDF fonts cannot show."""
+
+
+def check_chart_text(**fields):
+    """
+    Raise UnsupportedTextError naming the first text field the chart cannot
+    print, rather than letting its characters turn into "?".
+    Args:
+        fields (str): Field name -> text; non-string values are skipped
+    """
+    for name, value in fields.items():
+        if isinstance(value, str):
+            try:
+                value.encode("latin-1")
+            except UnicodeEncodeError as e:
+                raise UnsupportedTextError(
+                    f"{name} contains characters the diet chart cannot print: {value[e.start:e.end]!r}") from None
+
+
+def pdf_string(text):
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").replace("\r", "") + ")"
+
+
+class PageLayout:
+    def __init__(self, y=10.0):
+        """
+        Flowing single-column layout with FPDF-style cell()/ln() calls that
+        emits PDF content-stream operators instead of a whole document.
+        Args:
+            y (float): Starting vertical position in mm
+        """
+        self.y = y
+        self.style = ""
+        self.size = 12
+        self.color = BLACK
+        self.ops = []
+
+    def set_font(self, style, size):
+        self.style, self.size = style, size
+
+    def set_text_color(self, r, g, b):
+        self.color = (r, g, b)
+
+    def cell(self, h, text, align="L"):
+        if align == "C":
+            x = LEFT_MARGIN + (CONTENT_W - text_width(self.style, self.size, text)) / 2
+        else:
+            x = LEFT_MARGIN + CELL_MARGIN
+        baseline = PAGE_H - (self.y + 0.5 * h + 0.3 * self.size / K)
+        r, g, b = (c / 255 for c in self.color)
+        self.ops.append(f"BT /{FONTS[self.style][0]} {self.size:.2f} Tf {r:.4f} {g:.4f} {b:.4f} rg "
+                        f"{x * K:.2f} {baseline * K:.2f} Td {pdf_string(text)} Tj ET")
+        self.y += h
+
+    def ln(self, h):
+        self.y += h
+
+    def line(self, x1, y1, x2, y2, width=0.5, color=GREEN):
+        r, g, b = (c / 255 for c in color)
+        self.ops.append(f"{r:.4f} {g:.4f} {b:.4f} RG {width * K:.2f} w "
+                        f"{x1 * K:.2f} {(PAGE_H - y1) * K:.2f} m {x2 * K:.2f} {(PAGE_H - y2) * K:.2f} l S")
+
+    def content(self) -> str:
+        return "\n".join(self.ops)
+
+
+class DietChartTemplate:
+    def __init__(self):
+        """
+        Prebuilt one-page diet chart. The header, principles block, footer,
+        fonts and every PDF object except the page content and info dict are
+        rendered once; render() only lays out the patient and plan fields.
+        """
+        header = PageLayout()
+        header.set_font("B", 20)
+        header.set_text_color(*GREEN)
+        header.cell(12, "Ved-Aahaar", align="C")
+        header.set_font("", 14)
+        header.set_text_color(*BLACK)
+        header.cell(8, "Personalized Ayurvedic Diet Plan", align="C")
+        header.line(20, 35, 190, 35)
+        header.line(20, 270, 190, 270)
+        self.header = header.content()
+        self.body_top = header.y + 5
+
+        # Principles and footer notice, laid out from y=0 and shifted into place
+        closing = PageLayout(y=0.0)
+        closing.set_font("B", 14)
+        closing.set_text_color(*GREEN)
+        closing.cell(10, "Ayurvedic Principles")
+        closing.ln(2)
+        closing.set_font("", 10)
+        closing.set_text_color(*BLACK)
+        for principle in PRINCIPLES:
+            closing.cell(5, principle)
+        closing.ln(8)
+        closing.ln(5)
+        closing.set_font("I", 9)
+        closing.set_text_color(*GREY)
+        closing.cell(5, "This diet plan is based on Ayurvedic principles. Please consult with a healthcare professional", align="C")
+        closing.cell(5, "before making significant dietary changes.", align="C")
+        self.closing = closing.content()
+        self.generated_on_offset = closing.y
+        # The centered header and notice lines are measured above, once; the
+        # footer's glyph widths are loaded now so render() never takes the metrics lock
+        text_width("I", 9, "")
+
+        # Static objects; the page contents (4) and info dict (9) are appended per document
+        objects = [
+            (1, "<< /Type /Pages /Kids [3 0 R] /Count 1 /MediaBox [0 0 %.2f %.2f] >>" % (PAGE_W * K, PAGE_H * K)),
+            (2, "<< /Type /Catalog /Pages 1 0 R /OpenAction [3 0 R /FitH null] /PageLayout /OneColumn >>"),
+            (3, "<< /Type /Page /Parent 1 0 R /Resources 5 0 R /Contents 4 0 R >>"),
+            (5, "<< /Font << /F1 6 0 R /F2 7 0 R /F3 8 0 R >> /ProcSet [/PDF /Text] >>"),
+        ]
+        for number, (name, base_font) in zip((6, 7, 8), FONTS.values()):
+            objects.append((number, f"<< /Type /Font /Subtype /Type1 /BaseFont /{base_font} /Encoding /WinAnsiEncoding >>"))
+
+        prefix = bytearray(b"%PDF-1.3\n%\xe9\xeb\xf1\xbf\n")
+        self.offsets = {}
+        for number, body in objects:
+            self.offsets[number] = len(prefix)
+            prefix += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+        self.prefix = bytes(prefix)
+
+    def render(self, plan, goal, concern, restrictions, patient_name="Patient", patient_age=30,
+               patient_gender="Not specified", patient_height=None, patient_weight=None) -> bytes:
+        """
+        Render one diet chart and return the PDF bytes.
+        Raises:
+            UnsupportedTextError: A field or food name is not Latin-1 text
+        """
+        check_chart_text(patient_name=patient_name, patient_gender=patient_gender, goal=goal,
+                         concern=concern, restrictions=restrictions, **plan)
+        page = PageLayout(y=self.body_top)
+
+        # Patient Info
+        page.set_font("B", 14)
+        page.set_text_color(*GREEN)
+        page.ln(7)
+        page.cell(10, "Patient Information")
+        page.set_font("", 11)
+        page.set_text_color(*BLACK)
+        page.cell(6, f"Name: {patient_name}")
+        page.cell(6, f"Age: {patient_age} years")
+        page.cell(6, f"Gender: {patient_gender}")
+        if patient_height:
+            page.cell(6, f"Height: {patient_height} cm")
+        if patient_weight:
+            page.cell(6, f"Weight: {patient_weight} kg")
+
+        # Health Assessment
+        page.set_font("B", 14)
+        page.set_text_color(*GREEN)
+        page.cell(10, "Health Assessment")
+        page.ln(2)
+        page.set_font("", 11)
+        page.set_text_color(*BLACK)
+        page.cell(6, f"Health Goal: {goal.replace('_', ' ').title()}")
+        page.cell(6, f"Primary Concern: {concern.replace('_', ' ').title()}")
+        if restrictions:
+            page.cell(6, f"Dietary Preferences: {restrictions}")
+        page.ln(8)
+
+        # Diet Plan
+        page.set_font("B", 14)
+        page.set_text_color(*GREEN)
+        page.cell(10, "Personalized Diet Plan")
+        page.ln(2)
+        page.set_text_color(*BLACK)
+        for meal, food in plan.items():
+            if meal in MEAL_TIMES:
+                page.set_font("B", 11)
+                page.cell(6, f"{meal} ({MEAL_TIMES[meal]}):")
+                page.set_font("", 11)
+                page.cell(6, f"  {food}")
+                page.ln(2)
+        page.ln(5)
+
+        # Principles and footer from the template, then the generation time
+        closing_top = page.y
+        now = datetime.datetime.now()
+        footer = PageLayout(y=closing_top + self.generated_on_offset)
+        footer.set_font("I", 9)
+        footer.set_text_color(*GREY)
+        footer.cell(5, f"Generated on: {now.strftime('%B %d, %Y at %I:%M %p')}", align="C")
+
+        content = "\n".join([
+            self.header,
+            page.content(),
+            f"q 1 0 0 1 0 {-closing_top * K:.2f} cm",
+            self.closing,
+            "Q",
+            footer.content(),
+        ]).encode("latin-1")
+        return self._document(zlib.compress(content), now)
+
+    def _document(self, stream: bytes, created: datetime.datetime) -> bytes:
+        out = bytearray(self.prefix)
+        offsets = dict(self.offsets)
+        offsets[4] = len(out)
+        out += b"4 0 obj\n<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream)
+        out += stream + b"\nendstream\nendobj\n"
+        offsets[9] = len(out)
+        out += f"9 0 obj\n<< /CreationDate (D:{created.strftime('%Y%m%d%H%M%S')}) >>\nendobj\n".encode("latin-1")
+
+        xref = len(out)
+        out += b"xref\n0 10\n0000000000 65535 f \n"
+        for number in range(1, 10):
+            out += b"%010d 00000 n \n" % offsets[number]
+        out += b"trailer\n<< /Size 10 /Root 2 0 R /Info 9 0 R >>\nstartxref\n%d\n%%%%EOF\n" % xref
+        return bytes(out)
+
+
+_template = None
+_template_lock = threading.Lock()
+
+
+def get_template() -> DietChartTemplate:
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = DietChartTemplate()
+    return _template
+
+
+@timed("render_diet_pdf")
+def render_diet_pdf(plan, goal, concern, restrictions, patient_name="Patient", patient_age=30, patient_gender="Not specified", patient_height=None, patient_weight=None) -> bytes:
+    """
+    Render a diet chart PDF in memory from the shared prebuilt template.
+    """
+    return get_template().render(plan, goal, concern, restrictions, patient_name, patient_age,
+                                 patient_gender, patient_height, patient_weight)
+
+
+@timed("create_simple_diet_pdf")
 def create_simple_diet_pdf(plan, path, goal, concern, restrictions, patient_name="Patient", patient_age=30, patient_gender="Not specified", patient_height=None, patient_weight=None):
-    pdf = FPDF()
-    pdf.add_page()
-    
-    # Header
-    pdf.set_font("Arial", "B", 20)
-    pdf.set_text_color(0, 100, 0)
-    pdf.cell(0, 12, "Ved-Aahaar", ln=True, align="C")
-    pdf.set_font("Arial", "", 14)
-    pdf.set_text_color(0, 0, 0)
-    pdf.cell(0, 8, "Personalized Ayurvedic Diet Plan", ln=True, align="C")
-    
-    # Line
-    pdf.set_draw_color(0, 100, 0)
-    pdf.set_line_width(0.5)
-    pdf.line(20, 35, 190, 35)
-    pdf.ln(5)
-    # Patient Info
-    pdf.set_font("Arial", "B", 14)
-    pdf.set_text_color(0, 100, 0)
-    pdf.ln(7)
-    pdf.cell(0, 10, "Patient Information", ln=True)
-    
-    
-    pdf.set_font("Arial", "", 11)
-    pdf.set_text_color(0, 0, 0)
-    pdf.cell(0, 6, f"Name: {patient_name}", ln=True)
-    pdf.cell(0, 6, f"Age: {patient_age} years", ln=True)
-    pdf.cell(0, 6, f"Gender: {patient_gender}", ln=True)
-    if patient_height:
-        pdf.cell(0, 6, f"Height: {patient_height} cm", ln=True)
-    if patient_weight:
-        pdf.cell(0, 6, f"Weight: {patient_weight} kg", ln=True)
-    
-    
-    
-    # Health Assessment
-    pdf.set_font("Arial", "B", 14)
-    pdf.set_text_color(0, 100, 0)
-    pdf.cell(0, 10, "Health Assessment", ln=True)
-    pdf.ln(2)
-    
-    pdf.set_font("Arial", "", 11)
-    pdf.set_text_color(0, 0, 0)
-    pdf.cell(0, 6, f"Health Goal: {goal.replace('_', ' ').title()}", ln=True)
-    pdf.cell(0, 6, f"Primary Concern: {concern.replace('_', ' ').title()}", ln=True)
-    if restrictions:
-        pdf.cell(0, 6, f"Dietary Preferences: {restrictions}", ln=True)
-    
-    pdf.ln(8)
-    
-    # Diet Plan
-    pdf.set_font("Arial", "B", 14)
-    pdf.set_text_color(0, 100, 0)
-    pdf.cell(0, 10, "Personalized Diet Plan", ln=True)
-    pdf.ln(2)
-    
-    pdf.set_font("Arial", "", 11)
-    pdf.set_text_color(0, 0, 0)
-    
-    meal_times = {
-        "Breakfast": "8:00 AM",
-        "Lunch": "12:30 PM", 
-        "Snack": "4:00 PM",
-        "Dinner": "7:00 PM",
-        "Drink": "Throughout the day"
-    }
-    
-    for meal, food in plan.items():
-        if meal in meal_times:
-            pdf.set_font("Arial", "B", 11)
-            pdf.cell(0, 6, f"{meal} ({meal_times[meal]}):", ln=True)
-            pdf.set_font("Arial", "", 11)
-            pdf.cell(0, 6, f"  {food}", ln=True)
-            pdf.ln(2)
-    
-    pdf.ln(5)
-    
-    # Principles
-    pdf.set_font("Arial", "B", 14)
-    pdf.set_text_color(0, 100, 0)
-    pdf.cell(0, 10, "Ayurvedic Principles", ln=True)
-    pdf.ln(2)
-    
-    pdf.set_font("Arial", "", 10)
-    pdf.set_text_color(0, 0, 0)
-    principles = [
-        "- Eat at regular times to maintain digestive fire (Agni)",
-        "- Include all six tastes (sweet, sour, salty, bitter, pungent, astringent)",
-        "- Favor warm, cooked foods over cold, raw foods",
-        "- Drink warm water throughout the day",
-        "- Practice mindful eating without distractions",
-        "- Include seasonal and locally available foods"
-    ]
-    
-    for principle in principles:
-        pdf.cell(0, 5, principle, ln=True)
-    
-    pdf.ln(8)
-    
-    # Footer
-    pdf.set_draw_color(0, 100, 0)
-    pdf.line(20, 270, 190, 270)
-    pdf.ln(5)
-    
-    pdf.set_font("Arial", "I", 9)
-    pdf.set_text_color(100, 100, 100)
-    pdf.cell(0, 5, "This diet plan is based on Ayurvedic principles. Please consult with a healthcare professional", ln=True, align="C")
-    pdf.cell(0, 5, "before making significant dietary changes.", ln=True, align="C")
-    pdf.cell(0, 5, f"Generated on: {datetime.datetime.now().strftime('%B %d, %Y at %I:%M %p')}", ln=True, align="C")
-    
-    pdf.output(path)
+    pdf_bytes = render_diet_pdf(plan, goal, concern, restrictions, patient_name, patient_age,
+                                patient_gender, patient_height, patient_weight)
+    with open(path, "wb") as f:
+        f.write(pdf_bytes)
 
 if __name__ == "__main__":
     # Test the function
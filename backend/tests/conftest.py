@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.abspath(os.path.join(TESTS_DIR, ".."))
+# Backend and API modules import by bare name
+for path in (BACKEND_DIR, os.path.join(BACKEND_DIR, "api")):
+    if path not in sys.path:
+        sys.path.append(path)
+
+
+@pytest.fixture(scope="session")
+def api(tmp_path_factory):
+    """
+    The API module, configured before import to keep its log, chart cache and
+    profiles in a temporary directory and to render in the request thread.
+    """
+    data = tmp_path_factory.mktemp("api")
+    os.environ.update({
+        "LOG_DB_PATH": str(data / "food_log.sqlite3"),
+        "CHART_CACHE_DIR": str(data / "chart_cache"),
+        "PROFILE_DIR": str(data / "profiles"),
+        "ARTIFACT_ROOT": str(data / "artifacts"),
+        "RENDER_WORKERS": "0",
+        "WARM_UP": "0",
+    })
+    import main
+    return main
+
+
+@pytest.fixture(scope="session")
+def client(api):
+    from fastapi.testclient import TestClient
+    with TestClient(api.app) as client:
+        yield client
@@ -0,0 +1,65 @@
+# Reference implementations and synthetic catalogues the tests check
+# against. Kept apart from benchmarks/, which are edited for timing.
+
+import os
+import random
+
+from Diet_Generator import read_csv
+from food_index import row_text
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DIET_DATA_PATH = os.path.join(BACKEND_DIR, "data", "Diet_generator.csv")
+NUTRIENT_COLUMNS = ["Calories (kcal)", "Carbohydrates (g)", "Protein (g)", "Fats (g)", "Free Sugar (g)",
+                    "Fibre (g)", "Sodium (mg)", "Calcium (mg)", "Iron (mg)", "Vitamin C (mg)"]
+DISH_PREFIXES = ["", "homemade", "spicy", "masala", "plain", "fried", "south indian", "street style"]
+
+
+def linear_filter(data, goal, concern, preferences="", restrictions=""):
+    # The planner's original scorer: rebuilds every row's text and scans it per request
+    scored_foods = []
+    for food in data:
+        text = row_text(food)
+        if restrictions and restrictions in text:
+            continue
+        score = 0
+        if goal in text: score += 3
+        if concern in text: score += 2
+        if preferences and preferences in text: score += 2
+        if "tridoshic" in text: score += 1
+        scored_foods.append((score, food))
+    scored_foods.sort(key=lambda x: x[0], reverse=True)
+    return [food for score, food in scored_foods if score > 0][:5]
+
+
+def synthetic_diet_rows(n, seed=0):
+    """
+    n diet rows made by resampling each column of the real dataset
+    independently; food names get a numeric suffix so they stay unique.
+    """
+    base = read_csv(DIET_DATA_PATH)
+    columns = {key: [row[key] for row in base] for key in base[0]}
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        row = {key: rnd.choice(values) for key, values in columns.items()}
+        row["Food Name"] = f"{row['Food Name']} {i}"
+        rows.append(row)
+    return rows
+
+
+def synthetic_dish_names(n, seed=0):
+    """
+    n unique lowercase dish names: a style prefix and a food name from the
+    diet dataset, numbered past the combinations.
+    """
+    foods = sorted({row["Food Name"].lower().strip() for row in read_csv(DIET_DATA_PATH)})
+    names = [f"{prefix} {food}".strip() for prefix in DISH_PREFIXES for food in foods]
+    random.Random(seed).shuffle(names)
+    return [names[i] if i < len(names) else f"{names[i % len(names)]} {i // len(names)}" for i in range(n)]
+
+
+def unknown_dishes(names, n, seed=0):
+    # Words of two catalogue dishes plus an unseen one, so none matches exactly
+    rnd = random.Random(seed)
+    return [" ".join(rnd.choice(names).split()[:2] + rnd.choice(names).split()[-1:] + [f"qx{i}"])
+            for i in range(n)]
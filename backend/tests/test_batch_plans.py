@@ -0,0 +1,57 @@
+import pytest
+
+from Diet_Generator import AyurvedicDietPlanner, load_planner
+from helpers import DIET_DATA_PATH, synthetic_diet_rows
+
+FIELDS = ("goal", "concern", "preferences", "restrictions", "query", "seed")
+# Duplicates (also differing only in case), shared terms across distinct
+# requests, facet queries, and terms nothing matches (the seeded random fallback)
+REQUESTS = [
+    {"goal": "weight_management", "concern": "pitta"},
+    {"goal": "digestion", "concern": "vata", "restrictions": "dairy"},
+    {"goal": "weight_management", "concern": "pitta"},
+    {"goal": "Weight_Management", "concern": "PITTA"},
+    {"goal": "weight_management", "concern": "kapha", "preferences": "veg"},
+    {"goal": "digestion", "concern": "pitta", "query": "balances Pitta AND NOT dairy"},
+    {"goal": "xyz", "concern": "qqq"},
+    {"goal": "xyz", "concern": "qqq", "seed": 7},
+    {"goal": "xyz", "concern": "qqq"},
+    {"goal": "digestion", "concern": "vata", "restrictions": "dairy"},
+    {"goal": "", "concern": "", "restrictions": "non-veg"},
+]
+
+
+@pytest.fixture(scope="module", params=["real", "synthetic"])
+def planner(request):
+    if request.param == "real":
+        return load_planner(DIET_DATA_PATH)
+    return AyurvedicDietPlanner(synthetic_diet_rows(2000, seed=5))
+
+
+def separate_plans(planner, requests):
+    return [planner.generate_plan(*(r.get(field, "") if field != "seed" else r.get("seed") for field in FIELDS))
+            for r in requests]
+
+
+def test_batch_matches_separate_plans(planner):
+    plans = planner.generate_plans(REQUESTS)
+    assert plans == separate_plans(planner, REQUESTS)
+    # Deduplicated requests still get plans of their own
+    plans[0]["Breakfast"] = "changed"
+    assert plans[2]["Breakfast"] != "changed"
+
+
+def test_batch_order_follows_requests(planner):
+    reordered = REQUESTS[::-1]
+    assert planner.generate_plans(reordered) == separate_plans(planner, reordered)
+
+
+def test_batch_endpoint_returns_plans_in_request_order(api, client):
+    requests = [dict(r, patient_name=f"Patient {i}") for i, r in enumerate(REQUESTS)]
+    response = client.post("/generate-diet-charts/batch", json={"requests": requests})
+    assert response.status_code == 200
+    planner = api.diet_registry.get()
+    assert response.json()["plans"] == [
+        {"patient_name": r["patient_name"], "plan": plan}
+        for r, plan in zip(requests, separate_plans(planner, REQUESTS))
+    ]
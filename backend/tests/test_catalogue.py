@@ -0,0 +1,156 @@
+import csv
+import math
+
+import numpy as np
+import pytest
+
+import Diet_Generator
+from catalogue import CodedColumn, FoodCatalogue, FoodRecords, IntColumn, RecordBuilder, TextColumn
+from Diet_Generator import AyurvedicDietPlanner, iter_csv
+from helpers import synthetic_diet_rows
+
+NUMERIC_COLS = ["Total Calories", "Total Carbs", "Total Fats", "Total Protein", "Total Sugar", "Total Sodium"]
+CHUNK_ROWS = 64
+
+
+@pytest.fixture(scope="module")
+def csv_path(tmp_path_factory):
+    """
+    A diet CSV with empty cells in every kind of column, non-ASCII text, a
+    column that is all integers until a later chunk, and one that is empty
+    throughout.
+    """
+    rows = synthetic_diet_rows(600, seed=11)
+    for i, row in enumerate(rows):
+        if i % 7 == 0:
+            row["Vitamin Content"] = ""
+        if i % 11 == 0:
+            row["Type"] = ""
+        if i % 13 == 0:
+            row["Food Name"] = f"  Crème Brûlée Ça {i} "
+        if i % 17 == 0:
+            row["Total Fats"] = ""
+        if i > 3 * CHUNK_ROWS and i % 19 == 0:
+            row["Total Calories"] = ""
+        row["Notes"] = ""
+    path = tmp_path_factory.mktemp("catalogue") / "diet.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def source_rows(csv_path):
+    return list(iter_csv(csv_path))
+
+
+def test_record_builder_rows_equal_csv_dicts(source_rows):
+    builder = RecordBuilder(chunk_rows=CHUNK_ROWS)
+    for row in source_rows:
+        builder.add(row)
+    records = builder.finish()
+    assert isinstance(records, FoodRecords)
+    kinds = {col: type(column) for col, column in records.column_map.items()}
+    assert kinds["Total Carbs"] is IntColumn
+    # Integers until a later chunk had an empty cell
+    assert kinds["Total Calories"] is not IntColumn
+    assert kinds["Type"] is CodedColumn and kinds["Notes"] is CodedColumn
+    assert kinds["Food Name"] is TextColumn
+
+    assert len(records) == len(source_rows)
+    for food, row in zip(records, source_rows):
+        assert food == row
+        assert list(food.items()) == list(row.items())
+    assert records[-1] == source_rows[-1]
+    assert records[5:9] == source_rows[5:9]
+    with pytest.raises(IndexError):
+        records[len(source_rows)]
+    with pytest.raises(KeyError):
+        records[0]["Missing"]
+
+
+def test_record_builder_keeps_rows_that_do_not_fit(source_rows):
+    rows = source_rows[:CHUNK_ROWS + 5] + [dict(source_rows[0], **{"Total Calories": 150})] + source_rows[-3:]
+    builder = RecordBuilder(chunk_rows=CHUNK_ROWS)
+    for row in rows:
+        builder.add(row)
+    assert builder.finish() == rows
+
+
+def same(value, expected):
+    if isinstance(expected, float) and math.isnan(expected):
+        return isinstance(value, float) and math.isnan(value)
+    return value == expected
+
+
+def dataframe_rows(csv_path):
+    # What the tracker read before the catalogue: pandas rows with lowercased names
+    import pandas as pd
+    data = pd.read_csv(csv_path)
+    data["Food Name"] = data["Food Name"].str.lower().str.strip()
+    return [data.iloc[i].to_dict() for i in range(len(data))]
+
+
+def test_catalogue_round_trips_through_memory_mapped_files(csv_path, source_rows, tmp_path):
+    built = FoodCatalogue.from_csv(csv_path, NUMERIC_COLS, lower_cols=["Food Name"], chunk_rows=CHUNK_ROWS)
+    built.save(str(tmp_path / "saved"))
+    loaded = FoodCatalogue.load(str(tmp_path / "saved"))
+    assert isinstance(loaded.numeric, np.memmap)
+    assert isinstance(loaded.text("Type"), CodedColumn)
+    assert isinstance(loaded.text("Food Name").blob, np.memmap)
+
+    expected_rows = dataframe_rows(csv_path)
+    # Empty cells, and pandas' NA markers such as "None", are missing
+    assert sum(same(row["Allergic Ingredients"], float("nan")) for row in expected_rows)
+    for catalogue in (built, loaded):
+        assert len(catalogue) == len(source_rows)
+        assert catalogue.columns == list(source_rows[0])
+        for row_id, expected in enumerate(expected_rows):
+            got = catalogue.row(row_id)
+            assert list(got) == list(expected)
+            assert all(same(got[col], expected[col]) for col in expected), row_id
+        assert catalogue.text("Food Name").tolist() == [row["Food Name"] for row in expected_rows]
+        assert catalogue.text("Notes").tolist() == [None] * len(source_rows)
+
+
+class ListBuilder:
+    # The planner's original storage: the CSV row dicts as they came
+    def __init__(self):
+        self.rows = []
+
+    def add(self, row):
+        self.rows.append(row)
+
+    def finish(self):
+        return self.rows
+
+
+REQUESTS = [
+    ("weight_management", "pitta"),
+    ("digestion", "vata", "veg", "dairy"),
+    ("immunity", "kapha", "", "", "balances Kapha AND NOT nuts"),
+    ("xyz", "qqq"),
+    ("xyz", "qqq", "", "", "Veg"),
+    ("crème", ""),
+    ("", "", "", "non-veg"),
+]
+
+
+@pytest.mark.parametrize("backend", ["index", "columnar"])
+@pytest.mark.parametrize("tie_breakers", [(), ("calories", "dosha")])
+def test_compact_planner_matches_dict_rows(csv_path, backend, tie_breakers, monkeypatch):
+    compact = AyurvedicDietPlanner(iter_csv(csv_path), backend, tie_breakers)
+    assert isinstance(compact.data, FoodRecords)
+    monkeypatch.setattr(Diet_Generator, "RecordBuilder", ListBuilder)
+    rows = AyurvedicDietPlanner(iter_csv(csv_path), backend, tie_breakers)
+    assert isinstance(rows.data, list)
+
+    for fields in REQUESTS:
+        assert compact.generate_plan(*fields) == rows.generate_plan(*fields), fields
+        assert compact.filter_foods(*fields) == rows.filter_foods(*fields), fields
+    assert compact.query_foods("balances Pitta AND Veg") == rows.query_foods("balances Pitta AND Veg")
+    assert compact.generate_week_plan("weight_management", "pitta", days=3) == \
+        rows.generate_week_plan("weight_management", "pitta", days=3)
+    assert np.array_equal(compact.nutrients, rows.nutrients, equal_nan=True)
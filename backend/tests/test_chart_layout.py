@@ -0,0 +1,169 @@
+import datetime
+import io
+import re
+import types
+
+import pytest
+
+import simple_pdf
+from simple_pdf import MEAL_TIMES, PRINCIPLES, render_diet_pdf
+
+pypdf = pytest.importorskip("pypdf")
+fpdf = pytest.importorskip("fpdf")
+
+NOW = datetime.datetime(2024, 3, 9, 16, 5, 42)
+
+CHARTS = [
+    ({"Breakfast": "Khichdi", "Lunch": "Prawn Biryani", "Snack": "Fried Fish", "Dinner": "Chamthong with Fish",
+      "Drink": "Chakhao with Fish"},
+     "weight_management", "irregular_digestion", "vegetarian", "John Doe", 35, "Male", 175, 80),
+    ({"Lunch": "Dal (Tadka)", "Breakfast": "Poha", "Notes": "not a meal"},
+     "stress_relief", "vata", "", "Asha", 61, "Female", None, None),
+    ({"Dinner": "Crème brûlée \\ soup"},
+     "digestive_health", "pitta_kapha", "no onion (garlic ok)", "José (Müller)", 7, "Not specified", 120.5, None),
+]
+
+
+class FrozenDatetime(datetime.datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+def fpdf_chart(plan, goal, concern, restrictions, patient_name, patient_age, patient_gender,
+               patient_height, patient_weight) -> bytes:
+    # The chart as it was drawn with FPDF before the prebuilt template
+    pdf = fpdf.FPDF()
+    pdf.add_page()
+
+    def cell(h, text, align="L"):
+        pdf.cell(0, h, text, new_x="LMARGIN", new_y="NEXT", align=align)
+
+    pdf.set_font("Helvetica", "B", 20)
+    pdf.set_text_color(0, 100, 0)
+    cell(12, "Ved-Aahaar", align="C")
+    pdf.set_font("Helvetica", "", 14)
+    pdf.set_text_color(0, 0, 0)
+    cell(8, "Personalized Ayurvedic Diet Plan", align="C")
+    pdf.set_draw_color(0, 100, 0)
+    pdf.set_line_width(0.5)
+    pdf.line(20, 35, 190, 35)
+    pdf.ln(5)
+    pdf.set_font("Helvetica", "B", 14)
+    pdf.set_text_color(0, 100, 0)
+    pdf.ln(7)
+    cell(10, "Patient Information")
+    pdf.set_font("Helvetica", "", 11)
+    pdf.set_text_color(0, 0, 0)
+    cell(6, f"Name: {patient_name}")
+    cell(6, f"Age: {patient_age} years")
+    cell(6, f"Gender: {patient_gender}")
+    if patient_height:
+        cell(6, f"Height: {patient_height} cm")
+    if patient_weight:
+        cell(6, f"Weight: {patient_weight} kg")
+    pdf.set_font("Helvetica", "B", 14)
+    pdf.set_text_color(0, 100, 0)
+    cell(10, "Health Assessment")
+    pdf.ln(2)
+    pdf.set_font("Helvetica", "", 11)
+    pdf.set_text_color(0, 0, 0)
+    cell(6, f"Health Goal: {goal.replace('_', ' ').title()}")
+    cell(6, f"Primary Concern: {concern.replace('_', ' ').title()}")
+    if restrictions:
+        cell(6, f"Dietary Preferences: {restrictions}")
+    pdf.ln(8)
+    pdf.set_font("Helvetica", "B", 14)
+    pdf.set_text_color(0, 100, 0)
+    cell(10, "Personalized Diet Plan")
+    pdf.ln(2)
+    pdf.set_font("Helvetica", "", 11)
+    pdf.set_text_color(0, 0, 0)
+    for meal, food in plan.items():
+        if meal in MEAL_TIMES:
+            pdf.set_font("Helvetica", "B", 11)
+            cell(6, f"{meal} ({MEAL_TIMES[meal]}):")
+            pdf.set_font("Helvetica", "", 11)
+            cell(6, f"  {food}")
+            pdf.ln(2)
+    pdf.ln(5)
+    pdf.set_font("Helvetica", "B", 14)
+    pdf.set_text_color(0, 100, 0)
+    cell(10, "Ayurvedic Principles")
+    pdf.ln(2)
+    pdf.set_font("Helvetica", "", 10)
+    pdf.set_text_color(0, 0, 0)
+    for principle in PRINCIPLES:
+        cell(5, principle)
+    pdf.ln(8)
+    pdf.set_draw_color(0, 100, 0)
+    pdf.line(20, 270, 190, 270)
+    pdf.ln(5)
+    pdf.set_font("Helvetica", "I", 9)
+    pdf.set_text_color(100, 100, 100)
+    cell(5, "This diet plan is based on Ayurvedic principles. Please consult with a healthcare professional", align="C")
+    cell(5, "before making significant dietary changes.", align="C")
+    cell(5, f"Generated on: {NOW.strftime('%B %d, %Y at %I:%M %p')}", align="C")
+    return bytes(pdf.output())
+
+
+def text_runs(pdf: bytes) -> list:
+    # (text, x, y, font, size) of every shown string, in page coordinates (points)
+    runs = []
+
+    def visit(text, cm, tm, font, size):
+        if text.strip():
+            x = cm[0] * tm[4] + cm[2] * tm[5] + cm[4]
+            y = cm[1] * tm[4] + cm[3] * tm[5] + cm[5]
+            runs.append((text, x, y, font["/BaseFont"], size))
+
+    reader = pypdf.PdfReader(io.BytesIO(pdf), strict=True)
+    assert len(reader.pages) == 1
+    reader.pages[0].extract_text(visitor_text=visit)
+    return runs
+
+
+@pytest.mark.parametrize("chart", CHARTS)
+def test_text_matches_fpdf_chart(chart, monkeypatch):
+    monkeypatch.setattr(simple_pdf, "datetime", types.SimpleNamespace(datetime=FrozenDatetime))
+    ours = text_runs(render_diet_pdf(*chart))
+    reference = text_runs(fpdf_chart(*chart))
+    assert [run[0] for run in ours] == [run[0] for run in reference]
+    for (text, x, y, font, size), (_, ref_x, ref_y, ref_font, ref_size) in zip(ours, reference):
+        assert (font, size) == (ref_font, ref_size), text
+        assert x == pytest.approx(ref_x, abs=0.02), text
+        assert y == pytest.approx(ref_y, abs=0.02), text
+
+
+@pytest.mark.parametrize("chart", CHARTS)
+def test_xref_offsets_point_at_their_objects(chart):
+    pdf = render_diet_pdf(*chart)
+    assert pdf.startswith(b"%PDF-1.3\n") and pdf.endswith(b"%%EOF\n")
+    xref = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", pdf).group(1))
+    header = re.match(rb"xref\n0 (\d+)\n", pdf[xref:])
+    assert header
+    count = int(header.group(1))
+    entries = pdf[xref + header.end():].split(b"\n")[:count]
+    assert entries[0] == b"0000000000 65535 f "
+    for number, entry in enumerate(entries[1:], start=1):
+        offset, generation, kind = entry.split()
+        assert (generation, kind) == (b"00000", b"n")
+        assert pdf[int(offset):].startswith(b"%d 0 obj\n" % number), number
+    assert b"/Size %d " % count in pdf[xref:]
+    # Every object a strict reader resolves through the xref
+    reader = pypdf.PdfReader(io.BytesIO(pdf), strict=True)
+    for number in range(1, count):
+        assert reader.get_object(number) is not None
+    assert reader.metadata.creation_date is not None
+
+
+def test_render_does_not_measure_text(monkeypatch):
+    # Centered widths come from the template and the cached glyph table, not the locked FPDF metrics
+    simple_pdf.get_template()
+
+    def string_width(style, size, text):
+        raise AssertionError(f"measured {text!r} at render time")
+
+    monkeypatch.setattr(simple_pdf, "string_width", string_width)
+    for chart in CHARTS:
+        render_diet_pdf(*chart)
@@ -0,0 +1,51 @@
+import random
+
+import numpy as np
+import pytest
+
+from columnar_index import ColumnarIndex
+from Diet_Generator import read_csv
+from food_facets import FacetIndex
+from food_index import TextIndex, row_text
+from helpers import DIET_DATA_PATH, linear_filter, synthetic_diet_rows
+
+TERMS = ["", "weight", "pitta", "vata", "kapha", "dairy", "veg", "non-veg", "sweet", "balances pitta",
+         "a", "pi", "ta, ", "rice", "gluten", "heavy, dry", "aggravates vata & kapha", "&", "xyz"]
+FACET_QUERIES = [None, "balances pitta", "veg and not dairy", "rasa:sweet or rasa:bitter", "aggravates kapha"]
+
+
+@pytest.fixture(scope="module", params=["real", "synthetic"])
+def catalogue(request):
+    rows = read_csv(DIET_DATA_PATH) if request.param == "real" else synthetic_diet_rows(2000, seed=5)
+    texts = [row_text(food) for food in rows]
+    facets = FacetIndex()
+    for food in rows:
+        facets.add(food)
+    return rows, TextIndex(texts), ColumnarIndex(texts), facets.finish()
+
+
+def queries(n, seed=0):
+    rnd = random.Random(seed)
+    return [tuple(rnd.choice(TERMS) for _ in range(4)) for _ in range(n)]
+
+
+@pytest.mark.parametrize("k", [1, 5, 20])
+def test_backends_rank_like_the_reference(catalogue, k):
+    rows, text_index, columnar_index, _ = catalogue
+    for query in queries(80, seed=k):
+        ranked = text_index.rank(text_index.search, *query, k=k)
+        assert columnar_index.rank(columnar_index.search, *query, k=k) == ranked, query
+        if k == 5:
+            assert [rows[row_id] for row_id in ranked] == linear_filter(rows, *query), query
+
+
+@pytest.mark.parametrize("facet_query", FACET_QUERIES)
+def test_backends_agree_on_scores(catalogue, facet_query):
+    _, text_index, columnar_index, facets = catalogue
+    allowed = facets.query(facet_query) if facet_query else None
+    for query in queries(60):
+        text_scores = text_index.score_array(text_index.search, *query, allowed)
+        columnar_scores = columnar_index.score_array(columnar_index.search, *query, allowed)
+        np.testing.assert_array_equal(text_scores, columnar_scores, err_msg=str(query))
+        assert text_index.rank(text_index.search, *query, allowed=allowed) == \
+            columnar_index.rank(columnar_index.search, *query, allowed=allowed), query
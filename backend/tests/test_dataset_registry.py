@@ -0,0 +1,45 @@
+import os
+
+from dataset_registry import DatasetRegistry
+
+
+def registry_for(path):
+    loads = []
+
+    def loader(p):
+        with open(p) as f:
+            loads.append(f.read())
+        return loads[-1]
+
+    return DatasetRegistry(str(path), loader), loads
+
+
+def test_load_rebuilds_only_when_content_changes(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a\n")
+    registry, loads = registry_for(path)
+
+    assert registry.load() == "a\n"
+    assert registry.load() == "a\n"
+    assert loads == ["a\n"] and registry.version == 1
+
+    # Same content with a new mtime: checked, not rebuilt
+    os.utime(path, ns=(1, 1))
+    assert registry.get() == "a\n"
+    assert loads == ["a\n"]
+
+    path.write_text("bb\n")
+    assert registry.load() == "bb\n"
+    assert loads == ["a\n", "bb\n"] and registry.version == 2
+
+
+def test_get_notices_changed_files(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a\n")
+    registry, loads = registry_for(path)
+    assert registry.get() == "a\n"
+    path.write_text("changed\n")
+    os.utime(path, ns=(10 ** 18, 10 ** 18))
+    assert registry.get() == "changed\n"
+    assert registry.get() == "changed\n"
+    assert len(loads) == 2
@@ -0,0 +1,73 @@
+import datetime
+import re
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from simple_pdf import UnsupportedTextError, render_diet_pdf
+
+PLAN = {"Breakfast": "Khichdi", "Lunch": "Dal Rice", "Snack": "Fruit Chaat", "Dinner": "Vegetable Soup",
+        "Drink": "Buttermilk"}
+
+
+def page_text(pdf: bytes) -> bytes:
+    # The page content is the one compressed stream; text is shown as (literal) strings
+    stream = re.search(rb"stream\n(.*?)\nendstream", pdf, re.S).group(1)
+    return zlib.decompress(stream)
+
+
+def test_latin1_text_is_printed():
+    pdf = render_diet_pdf(PLAN, "weight_management", "pitta", "", "José Müller")
+    assert "Name: José Müller".encode("latin-1") in page_text(pdf)
+
+
+@pytest.mark.parametrize("fields", [
+    {"patient_name": "李 Wei"},
+    {"patient_gender": "Ж"},
+    {"restrictions": "no ghee ✓"},
+    {"plan": dict(PLAN, Lunch="Paneer ₹ Tikka")},
+])
+def test_unprintable_text_is_rejected(fields):
+    args = dict(plan=PLAN, goal="weight_management", concern="pitta", restrictions="")
+    args.update(fields)
+    with pytest.raises(UnsupportedTextError):
+        render_diet_pdf(**args)
+
+
+def test_unprintable_patient_name_is_a_bad_request(client):
+    body = {"goal": "weight_management", "patient_name": "李 Wei"}
+    response = client.post("/generate-diet-chart", json=body)
+    assert response.status_code == 400
+    assert "patient_name" in response.json()["error"]
+
+    response = client.post("/generate-diet-charts/batch", json={"requests": [body], "format": "zip"})
+    assert response.status_code == 400
+
+
+def test_chart_key_covers_date_and_template(api, monkeypatch):
+    fields = [PLAN, "weight_management", "pitta", "", "Asha", 30, "Female", None, None]
+    key = api.chart_key(fields)
+    assert key == api.chart_cache.key(api.TEMPLATE_VERSION, datetime.date.today().isoformat(), *fields)
+    assert key != api.chart_cache.key(api.TEMPLATE_VERSION, "2000-01-01", *fields)
+    monkeypatch.setattr(api, "TEMPLATE_VERSION", api.TEMPLATE_VERSION + 1)
+    assert api.chart_key(fields) != key
+
+
+def test_concurrent_charts_get_their_own_patient(client):
+    names = [f"Patient {i:02d}" for i in range(12)]
+    goals = ["weight_management", "digestive_health", "stress_relief"]
+
+    def chart(i):
+        body = {"goal": goals[i % len(goals)], "patient_name": names[i % len(names)], "patient_age": 20 + i % 50}
+        response = client.post("/generate-diet-chart", json=body)
+        assert response.status_code == 200
+        return i, page_text(response.content)
+
+    # Each name is requested several times, so cache hits race with renders and writes
+    with ThreadPoolExecutor(8) as pool:
+        for i, text in pool.map(chart, range(4 * len(names))):
+            assert f"Name: {names[i % len(names)]}".encode() in text
+            assert f"Age: {20 + i % 50} years".encode() in text
+            others = [name for name in names if name != names[i % len(names)]]
+            assert not any(f"Name: {name})".encode() in text for name in others)
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from Diet_Generator import read_csv
+from catalogue import RecordBuilder
+from food_index import TextIndex, row_text, row_texts
+from helpers import DIET_DATA_PATH, linear_filter, synthetic_diet_rows
+
+# Single words, multi-word phrases, punctuation, fragments, empty and unknown terms
+TERMS = ["", "weight", "pitta", "vata", "kapha", "dairy", "veg", "non-veg", "sweet", "balances pitta",
+         "a", "pi", "ta, ", "rice", "gluten", "nuts", "bengal", "vitamin c", "  ", "&", ",",
+         "heavy, dry", "aggravates vata & kapha", "tridoshic", "xyz", "no dairy", "-", "(", ", &"]
+
+
+def random_queries(n, seed=0):
+    rnd = random.Random(seed)
+    return [tuple(rnd.choice(TERMS) for _ in range(4)) for _ in range(n)]
+
+
+@pytest.fixture(scope="module", params=["real", "synthetic"])
+def catalogue(request):
+    rows = read_csv(DIET_DATA_PATH) if request.param == "real" else synthetic_diet_rows(2000, seed=3)
+    return rows, TextIndex(row_text(food) for food in rows)
+
+
+def ranked_foods(index, rows, query):
+    return [rows[row_id] for row_id in index.rank(index.search, *query)]
+
+
+def test_rank_matches_linear_scorer(catalogue):
+    rows, index = catalogue
+    for query in random_queries(300):
+        assert ranked_foods(index, rows, query) == linear_filter(rows, *query), query
+
+
+@pytest.mark.parametrize("query", [
+    ("weight", "pitta", "", ""),
+    ("digestion", "vata", "", "dairy"),
+    ("balances pitta", "heavy, dry", "veg", "non-veg"),
+    ("", "", "", ""),
+    ("xyz", "xyz", "", ""),
+])
+def test_rank_matches_linear_scorer_fixed(catalogue, query):
+    rows, index = catalogue
+    assert ranked_foods(index, rows, query) == linear_filter(rows, *query)
+
+
+def test_restriction_excludes_every_matching_row(catalogue):
+    rows, index = catalogue
+    for restriction in ("dairy", "non-veg", "gluten", "ta, "):
+        for row_id in index.rank(index.search, "", "", "", restriction, k=len(rows)):
+            assert restriction not in row_text(rows[row_id])
+
+
+def random_substrings(texts, n, seed=1):
+    # Spans of real rows, so they cut tokens and cross punctuation anywhere
+    rnd = random.Random(seed)
+    spans = []
+    for _ in range(n):
+        text = rnd.choice(texts)
+        start = rnd.randrange(len(text))
+        spans.append(text[start:start + rnd.randint(1, 12)])
+    return spans
+
+
+def test_search_matches_substring_scan(catalogue):
+    rows, index = catalogue
+    texts = [row_text(food) for food in rows]
+    # The planner's layout: no texts kept, candidates checked against the compact rows
+    builder = RecordBuilder()
+    for food in rows:
+        builder.add(food)
+    records = builder.finish()
+    compact = TextIndex(iter(texts), texts_of=lambda row_ids: row_texts(records, row_ids))
+    for term in TERMS + random_substrings(texts, 300):
+        expected = {row_id for row_id, text in enumerate(texts) if term in text}
+        assert index.search(term) == expected, term
+        assert compact.search(term) == expected, term
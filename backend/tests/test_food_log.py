@@ -0,0 +1,143 @@
+import datetime
+import json
+import random
+import sqlite3
+import threading
+
+import pytest
+
+from food_log import FoodLogStore
+from helpers import NUTRIENT_COLUMNS
+
+
+def test_track_calories_rejects_malformed_dates(client):
+    body = {"food_items": ["Khichdi"], "patient_id": "date-check"}
+    for bad in ["2026-10-1", "01/10/2026", "yesterday"]:
+        response = client.post("/track-calories", json=dict(body, date=bad))
+        assert response.status_code == 422
+    assert client.get("/logs", params={"start": "2000-01-01", "end": "2100-01-01",
+                                       "patient_id": "date-check"}).json()["entries"] == []
+
+    response = client.post("/track-calories", json=dict(body, date="2026-10-01"))
+    assert response.status_code == 200
+    assert response.json()["date"] == "2026-10-01"
+    summary = client.get("/nutrition-summary", params={"patient_id": "date-check", "start": "2026-10-01",
+                                                       "end": "2026-10-07"})
+    assert summary.status_code == 200
+    assert [period["start"] for period in summary.json()["periods"]] == ["2026-10-01"]
+
+
+LEGACY_SCHEMA = """
+CREATE TABLE entries (
+    id INTEGER PRIMARY KEY,
+    logged_at TEXT NOT NULL,
+    log_date TEXT NOT NULL,
+    dish TEXT NOT NULL,
+    predicted INTEGER NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE TABLE entry_nutrients (
+    entry_id INTEGER NOT NULL REFERENCES entries (id),
+    log_date TEXT NOT NULL,
+    nutrient TEXT NOT NULL,
+    value REAL NOT NULL
+);
+"""
+NUTRIENTS = NUTRIENT_COLUMNS[:5]
+FIRST = datetime.date(2026, 1, 1)
+DAYS = 20
+PATIENTS = ["", "patient-0", "patient-1", "patient-2"]
+
+
+def random_results(rng, n):
+    return [{"Dish Name": f"dish {rng.randrange(100)}",
+             **{col: round(rng.uniform(0, 500), 2) for col in NUTRIENTS if rng.random() < 0.9}}
+            for _ in range(n)]
+
+
+def log_random(store, seed, batches=200, threads=4):
+    # Concurrent appends, so batches from several callers share transactions
+    def worker(offset):
+        rng = random.Random(seed * 100 + offset)
+        for _ in range(batches // threads):
+            day = FIRST + datetime.timedelta(days=rng.randrange(DAYS))
+            store.append(day.isoformat(), random_results(rng, rng.randint(1, 6)), NUTRIENTS, rng.choice(PATIENTS))
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+
+def assert_same_totals(actual, expected):
+    assert actual.keys() == expected.keys()
+    for day in actual:
+        assert actual[day] == pytest.approx(expected[day], rel=1e-9)
+
+
+def assert_rollups_match(store):
+    start, end = FIRST.isoformat(), (FIRST + datetime.timedelta(days=DAYS)).isoformat()
+    day = (FIRST + datetime.timedelta(days=3)).isoformat()
+    for patient_id in [None] + PATIENTS + ["nobody"]:
+        assert_same_totals(store.daily_totals(start, end, patient_id),
+                           store.recompute_daily_totals(start, end, patient_id))
+        # And for a single day, as /get-log reads them
+        assert_same_totals(store.daily_totals(day, day, patient_id),
+                           store.recompute_daily_totals(day, day, patient_id))
+
+
+def test_rollups_match_recompute(tmp_path):
+    store = FoodLogStore(str(tmp_path / "log.sqlite3"))
+    log_random(store, seed=1)
+    assert_rollups_match(store)
+
+    # Reopening keeps them; a rebuild recomputes the same totals
+    store = FoodLogStore(str(tmp_path / "log.sqlite3"))
+    log_random(store, seed=2, batches=40)
+    assert_rollups_match(store)
+    store.rebuild_rollups()
+    assert_rollups_match(store)
+
+
+def test_rebuild_repairs_rollups(tmp_path):
+    path = str(tmp_path / "log.sqlite3")
+    store = FoodLogStore(path)
+    log_random(store, seed=3)
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE daily_rollups SET total = total + 1 WHERE patient_id = 'patient-1'")
+        conn.execute("DELETE FROM daily_rollups WHERE patient_id = 'patient-2'")
+    assert store.daily_totals("2026-01-01", "2026-12-31") != store.recompute_daily_totals("2026-01-01", "2026-12-31")
+    store.rebuild_rollups()
+    assert_rollups_match(store)
+
+
+def test_rollups_are_built_for_a_log_from_before_them(tmp_path):
+    # A log written before patients and rollups: the first open adds both
+    path = str(tmp_path / "log.sqlite3")
+    rng = random.Random(4)
+    expected = {}
+    with sqlite3.connect(path) as conn:
+        conn.executescript(LEGACY_SCHEMA)
+        for _ in range(300):
+            day = (FIRST + datetime.timedelta(days=rng.randrange(DAYS))).isoformat()
+            info = random_results(rng, 1)[0]
+            entry_id = conn.execute(
+                "INSERT INTO entries (logged_at, log_date, dish, predicted, record) VALUES (?, ?, ?, 0, ?)",
+                ("2026-01-01T00:00:00+00:00", day, info["Dish Name"], json.dumps(info)),
+            ).lastrowid
+            for col in NUTRIENTS:
+                if col in info:
+                    conn.execute("INSERT INTO entry_nutrients VALUES (?, ?, ?, ?)", (entry_id, day, col, info[col]))
+                    expected.setdefault(day, {}).setdefault(col, 0.0)
+                    expected[day][col] += info[col]
+
+    store = FoodLogStore(path)
+    totals = store.daily_totals("2026-01-01", "2026-12-31")
+    assert_same_totals(totals, expected)
+    assert store.daily_totals("2026-01-01", "2026-12-31", "") == totals
+    assert_rollups_match(store)
+
+    # New entries update the migrated rollups incrementally
+    log_random(store, seed=5)
+    assert_rollups_match(store)
@@ -0,0 +1,103 @@
+import csv
+import random
+import re
+import warnings
+from difflib import get_close_matches
+
+import pandas as pd
+import pytest
+
+from Calorie_tracker import FoodTracker
+from helpers import NUTRIENT_COLUMNS, synthetic_dish_names
+
+COLUMNS = ["Dish Name"] + NUTRIENT_COLUMNS + ["Folate (碌g)"]
+# Names the partial tier reads as regexes, like pandas' str.contains did
+REGEX_NAMES = ["Dal (Tadka)", "c++ curry", "rice.bowl", "paneer|tikka", "50% sugar? no", "dosa [mini]",
+               "star*fruit", "aloo^2", "$pecial thali", "chole {bhature}", "back\\slash bhaji"]
+
+
+def old_match(data: pd.DataFrame, dish_name: str):
+    """
+    The original FoodTracker.get_food_info cascade (exact, pandas
+    str.contains, difflib): the matched row as a dict, or None for the ML
+    fallback.
+    """
+    dish_name = dish_name.lower().strip()
+    result = data[data["Dish Name"] == dish_name]
+    if result.empty:
+        with warnings.catch_warnings():
+            # pandas warns about patterns with groups, e.g. "(tadka)"
+            warnings.simplefilter("ignore", UserWarning)
+            result = data[data["Dish Name"].str.contains(dish_name, na=False)]
+    if result.empty:
+        close_matches = get_close_matches(dish_name, data["Dish Name"].tolist(), n=1, cutoff=0.7)
+        if close_matches:
+            result = data[data["Dish Name"] == close_matches[0]]
+    return None if result.empty else result.iloc[0].to_dict()
+
+
+def typo(rnd, name):
+    i = rnd.randrange(len(name))
+    return name[:i] + rnd.choice("aeiouxyz ") + name[i + 1:]
+
+
+@pytest.fixture(scope="module")
+def catalogue(tmp_path_factory):
+    rnd = random.Random(2)
+    names = synthetic_dish_names(1500, seed=2) + REGEX_NAMES + ["  Masala Dosa  ", "MASALA DOSA"]
+    rnd.shuffle(names)
+    path = tmp_path_factory.mktemp("lookup") / "calories.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for name in names:
+            writer.writerow([name] + [round(rnd.uniform(0, 500), 2) for _ in COLUMNS[1:]])
+    data = pd.read_csv(path)
+    data["Dish Name"] = data["Dish Name"].str.lower().str.strip()
+    return data, FoodTracker(str(path), cache_size=0), names
+
+
+def queries(names, n=250, seed=3):
+    rnd = random.Random(seed)
+    out = []
+    for _ in range(n):
+        name = rnd.choice(names).lower().strip()
+        start = rnd.randrange(len(name))
+        out += [
+            name,                                       # exact
+            name[start:start + rnd.randint(2, 8)],      # partial
+            typo(rnd, typo(rnd, name)),                 # fuzzy, or partial through a lucky fragment
+            f"{name} qx{rnd.randrange(9)}",              # near a name: fuzzy or the ML fallback
+            f"qzv {name.split()[-1][:3]} wkx",          # unknown: the ML fallback
+        ]
+    # Regex behaviour of the partial tier
+    out += ["(tadka)", "dal (tadka)", "c\\+\\+", "rice.bowl", "rice bowl", "paneer|tikka", "tikka|zzz",
+            "50% sugar?", "star*", "^aloo", "thali$", "dosa [mini]", "[mini]", "\\$pecial", "back\\\\slash"]
+    return out
+
+
+def test_lookup_matches_old_cascade(catalogue):
+    data, tracker, names = catalogue
+    for dish_name in queries(names + REGEX_NAMES):
+        try:
+            expected = old_match(data, dish_name)
+        except re.error:
+            with pytest.raises(re.error):
+                tracker.get_food_info(dish_name)
+            continue
+        info = tracker.get_food_info(dish_name)
+        if expected is None:
+            assert info.get("Prediction"), dish_name
+        else:
+            assert not info.get("Prediction"), dish_name
+            assert info["Dish Name"] == expected["Dish Name"], dish_name
+            assert [info[col] for col in COLUMNS[1:]] == pytest.approx([expected[col] for col in COLUMNS[1:]])
+
+
+def test_invalid_regex_fails_like_pandas(catalogue):
+    data, tracker, _ = catalogue
+    for dish_name in ["(", "c**", "dosa [mini", "*fruit"]:
+        with pytest.raises(re.error):
+            old_match(data, dish_name)
+        with pytest.raises(re.error):
+            tracker.get_food_info(dish_name)
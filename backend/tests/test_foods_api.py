@@ -0,0 +1,23 @@
+import pytest
+
+
+@pytest.mark.parametrize("query", ["", "Veg", "balances Pitta AND NOT dairy"])
+def test_foods_counts_every_match_and_lists_limit(api, client, query):
+    expected = api.diet_registry.get().query_foods(query)
+    for limit in (0, 3, len(expected) + 10):
+        body = client.get("/foods", params={"query": query, "limit": limit}).json()
+        assert body["count"] == len(expected)
+        assert body["foods"] == [dict(food) for food in expected[:limit]]
+
+
+def test_foods_rejects_negative_limit(client):
+    assert client.get("/foods", params={"limit": -1}).status_code == 422
+
+
+def test_facet_counts_match_queries(api, client):
+    planner = api.diet_registry.get()
+    facets = client.get("/foods/facets").json()
+    assert facets
+    for facet, values in facets.items():
+        for value, count in values.items():
+            assert count == bin(planner.facets.bitset(facet, value)).count("1")
@@ -0,0 +1,130 @@
+import pytest
+
+from lru_cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_evicts_least_recently_used_first():
+    cache = LRUCache(3)
+    for key in "abc":
+        cache.put(key, key.upper())
+    # Reading "a" makes "b" the oldest entry
+    assert cache.get("a") == "A"
+    cache.put("d", "D")
+    assert cache.get("b") is None
+    # Overwriting "c" refreshes it, so "a" goes next
+    cache.put("c", "C2")
+    cache.put("e", "E")
+    assert cache.get("a") is None
+    assert [cache.get(key) for key in "cde"] == ["C2", "D", "E"]
+    assert cache.stats()["evictions"] == 2
+    assert cache.stats()["size"] == 3
+
+
+def test_zero_capacity_stores_nothing():
+    cache = LRUCache(0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = LRUCache(4, ttl=10, clock=clock)
+    cache.put("a", 1)
+    clock.now += 5
+    cache.put("b", 2)
+    clock.now += 4.9
+    assert cache.get("a") == 1
+    # Reading does not extend the expiry
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    clock.now += 5
+    assert cache.get("b") is None
+    assert cache.stats()["expirations"] == 2
+    assert cache.stats()["size"] == 0
+    # A put restarts the entry's lifetime
+    cache.put("a", 3)
+    clock.now += 9
+    assert cache.get("a") == 3
+
+
+def test_no_ttl_never_expires():
+    clock = FakeClock()
+    cache = LRUCache(4, clock=clock)
+    cache.put("a", 1)
+    clock.now += 1e9
+    assert cache.get("a") == 1
+    assert cache.stats()["expirations"] == 0
+
+
+def test_stats_count_hits_and_misses():
+    clock = FakeClock()
+    cache = LRUCache(2, ttl=60, clock=clock)
+    assert cache.stats()["hit_rate"] == 0.0
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("z")
+    clock.now += 60
+    cache.get("a")
+    assert cache.stats() == {
+        "capacity": 2,
+        "ttl": 60,
+        "size": 0,
+        "hits": 2,
+        "misses": 2,
+        "evictions": 0,
+        "expirations": 1,
+        "hit_rate": 0.5,
+    }
+    cache.clear()
+    assert cache.stats()["hits"] == 2
+
+
+@pytest.fixture()
+def tracker_cache(api, monkeypatch):
+    clock = FakeClock()
+    tracker = api.calorie_registry.get()
+    monkeypatch.setattr(tracker, "cache", LRUCache(2, ttl=30, clock=clock))
+    return tracker, clock
+
+
+def test_cache_metrics_report_tracker_lookups(api, client, tracker_cache):
+    tracker, clock = tracker_cache
+    # Distinct cache keys that all resolve against the dataset
+    name = tracker.dish_names[0]
+    dishes = [name, name.split()[0], name.split()[1]]
+    tracker.get_food_info(dishes[0])
+    tracker.get_food_info(dishes[0].upper() + " ")
+    tracker.get_food_info(dishes[1])
+    tracker.get_food_info(dishes[2])
+    clock.now += 30
+    tracker.get_food_info(dishes[2])
+
+    body = client.get("/metrics/cache").json()
+    assert body == {
+        "dataset_version": api.calorie_registry.version,
+        "capacity": 2,
+        "ttl": 30,
+        "size": 2,
+        "hits": 1,
+        "misses": 4,
+        "evictions": 1,
+        "expirations": 1,
+        "hit_rate": 0.2,
+    }
+
+    lines = client.get("/metrics").text.splitlines()
+    for key in ("hits", "misses", "evictions", "expirations"):
+        assert f"aahaar_food_cache_{key}_total {body[key]}" in lines
+    assert "aahaar_food_cache_entries 2" in lines
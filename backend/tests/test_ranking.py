@@ -0,0 +1,114 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from Diet_Generator import AyurvedicDietPlanner
+from helpers import BACKEND_DIR
+from ranking import MEAL_CALORIES, TieBreakers, request_seed, top_k
+
+
+def sorted_top_k(row_ids, scores, k, tie_keys=()):
+    # Full sort on (score desc, tie keys asc, row id asc)
+    score_of = dict(zip(row_ids.tolist(), np.asarray(scores).tolist()))
+    order = sorted(score_of, key=lambda row_id: (-score_of[row_id], *(key[row_id] for key in tie_keys), row_id))
+    return order[:max(k, 0)]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_top_k_matches_sorted_reference(seed):
+    rng = np.random.default_rng(seed)
+    size = int(rng.integers(1, 300))
+    row_ids = rng.permutation(size)[:int(rng.integers(1, size + 1))].astype(np.int64)
+    # Few distinct scores and keys, so most of the k-th place is tied
+    scores = rng.integers(0, 4, len(row_ids))
+    if seed % 2:
+        scores = scores / 2.0
+    tie_keys = [rng.integers(-2, 3, size).astype(np.int64),
+                np.where(rng.random(size) < 0.2, np.inf, rng.integers(0, 3, size).astype(float))][:seed % 3]
+    for k in sorted({0, 1, 2, 5, len(row_ids) // 2, len(row_ids) - 1, len(row_ids), len(row_ids) + 3}):
+        expected = sorted_top_k(row_ids, scores, k, tie_keys)
+        assert top_k(row_ids, scores, k, tie_keys).tolist() == expected, k
+
+
+def test_top_k_without_candidates():
+    empty = np.zeros(0, dtype=np.int64)
+    assert top_k(empty, empty, 5).tolist() == []
+    assert top_k(empty, empty.astype(float), 5, [np.zeros(3)]).tolist() == []
+
+
+# Every food names all three doshas outside "Dosha Impact", so a dosha in the
+# request scores them alike; MEAL_CALORIES is 400 with the five meal slots
+TIE_FOODS = [
+    ("A", "900", "Aggravates Pitta"),
+    ("B", "", "Balances Pitta"),
+    ("C", "400", ""),
+    ("D", "350", "Balances Vata & Pitta"),
+    ("E", "450", "Balances Kapha"),
+    ("F", "400", "Balances Pitta, aggravates Kapha"),
+]
+
+
+@pytest.mark.parametrize("tie_breakers, concern, expected", [
+    ((), "pitta", "ABCDE"),
+    # Closest to 400 kcal first, unknown calories last
+    (("calories",), "pitta", "CFDEA"),
+    # Balancing the named dosha first, aggravating it last
+    (("dosha",), "pitta", "BDFCE"),
+    (("dosha",), "kapha", "EABCD"),
+    (("dosha",), "", "ABCDE"),
+    # Keys apply in the order named, then dataset order
+    (("dosha", "calories"), "pitta", "FDBCE"),
+    (("calories", "dosha"), "pitta", "FCDEA"),
+])
+def test_tie_breakers_order_equal_scores(tie_breakers, concern, expected):
+    assert MEAL_CALORIES == 400
+    rows = [{"Food Name": name, "Type": "Soup", "Total Calories": calories, "Dosha Impact": dosha,
+             "Notes": "vata pitta kapha"} for name, calories, dosha in TIE_FOODS]
+    for backend in ("index", "columnar"):
+        planner = AyurvedicDietPlanner(rows, backend, tie_breakers)
+        foods = planner.filter_foods("soup", concern)
+        assert "".join(food["Food Name"] for food in foods) == expected, backend
+
+
+def test_tie_breakers_reject_unknown_names():
+    with pytest.raises(ValueError, match="Unknown tie-breaker"):
+        TieBreakers(["price"], np.zeros(1), None)
+
+
+# Requests whose terms match foods, and ones that fall back to seeded random foods
+HASH_SEED_REQUESTS = [("weight_management", "pitta", "", "", ""), ("digestion", "vata", "", "dairy", ""),
+                      ("xyz", "qqq", "", "", ""), ("xyz", "qqq", "", "", "balances Kapha"),
+                      ("", "", "", "non-veg", "")]
+
+PLANS_SCRIPT = """
+import json
+from Diet_Generator import AyurvedicDietPlanner, load_planner
+from helpers import DIET_DATA_PATH, synthetic_diet_rows
+from ranking import request_seed
+from test_ranking import HASH_SEED_REQUESTS
+
+planners = [load_planner(DIET_DATA_PATH), load_planner(DIET_DATA_PATH, tie_breakers=("dosha", "calories")),
+            AyurvedicDietPlanner(synthetic_diet_rows(500, seed=2), tie_breakers=("calories",))]
+print(json.dumps({
+    "seeds": [request_seed(*fields) for fields in HASH_SEED_REQUESTS],
+    "plans": [[planner.generate_plan(*fields) for fields in HASH_SEED_REQUESTS] for planner in planners],
+}))
+"""
+
+
+def test_plans_do_not_depend_on_hash_seed():
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([BACKEND_DIR, os.path.dirname(__file__)]))
+    outputs = set()
+    for hash_seed in ("0", "1", "12345", "random"):
+        env["PYTHONHASHSEED"] = hash_seed
+        result = subprocess.run([sys.executable, "-c", PLANS_SCRIPT], env=env, cwd=BACKEND_DIR,
+                                capture_output=True, text=True, check=True)
+        outputs.add(result.stdout)
+    assert len(outputs) == 1
+    out = json.loads(outputs.pop())
+    assert out["seeds"] == [request_seed(*fields) for fields in HASH_SEED_REQUESTS]
+    assert all(plan for plans in out["plans"] for plan in plans)
@@ -0,0 +1,31 @@
+import threading
+
+from metrics import STAGE_SECONDS
+from render_pool import RenderPool
+
+PLAN = {"Breakfast": "Khichdi", "Lunch": "Dal Rice", "Dinner": "Vegetable Soup"}
+
+
+def test_workers_do_not_inherit_held_locks():
+    # Another thread holds a metric lock while the first job starts the worker;
+    # a forked worker would copy it held and hang in @timed until the timeout
+    held, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        with STAGE_SECONDS._lock:
+            held.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    held.wait()
+    pool = RenderPool(workers=1, timeout=10)
+    try:
+        # Released once the worker is up; the pool's own timing waits for it
+        threading.Timer(1.0, release.set).start()
+        pdf = pool.render(PLAN, "weight_management", "pitta", "", "Asha")
+    finally:
+        release.set()
+        holder.join()
+        pool.shutdown()
+    assert pdf.startswith(b"%PDF")
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from helpers import synthetic_dish_names, unknown_dishes
+from tracker_model import CosineNeighbors, LshNeighbors, fit_tfidf
+
+
+@pytest.fixture(scope="module")
+def tfidf():
+    names = synthetic_dish_names(3000)
+    vectorizer, tfidf_matrix = fit_tfidf(names)
+    return tfidf_matrix, vectorizer.transform(unknown_dishes(names, 100) + ["zzqx unseen"])
+
+
+def test_exact_matches_dense_scan(tfidf):
+    tfidf_matrix, queries = tfidf
+    distances, indices = CosineNeighbors(tfidf_matrix).kneighbors(queries, n_neighbors=5)
+    dense = np.clip(1.0 - (queries @ tfidf_matrix.T).toarray(), 0.0, 2.0)
+    rows = np.arange(dense.shape[1])
+    for i in range(dense.shape[0]):
+        order = np.lexsort((rows, dense[i]))[:5]
+        assert indices[i].tolist() == order.tolist()
+        assert np.allclose(distances[i], dense[i, order])
+
+
+def test_lsh_index_depends_only_on_seed(tfidf):
+    # Every worker process builds the same index without storing hyperplanes
+    tfidf_matrix, _ = tfidf
+    first, second = LshNeighbors(tfidf_matrix, seed=3), LshNeighbors(tfidf_matrix, seed=3)
+    assert np.array_equal(first.sorted_codes, second.sorted_codes)
+    assert np.array_equal(first.order, second.order)
+    assert not np.array_equal(first.sorted_codes, LshNeighbors(tfidf_matrix, seed=4).sorted_codes)
+    planes = first.planes(np.arange(tfidf_matrix.shape[1]))
+    assert planes.shape == (tfidf_matrix.shape[1], first.tables * first.bits)
+    assert np.array_equal(planes[[5, 1]], first.planes(np.array([5, 1])))
+
+
+def test_lsh_with_few_candidates_searches_exactly(tfidf):
+    # One 30-bit table leaves most queries fewer than k candidates
+    tfidf_matrix, queries = tfidf
+    distances, indices = LshNeighbors(tfidf_matrix, tables=1, bits=30, probes=0).kneighbors(queries)
+    exact_distances, exact_indices = CosineNeighbors(tfidf_matrix).kneighbors(queries)
+    assert np.array_equal(indices, exact_indices)
+    assert np.allclose(distances, exact_distances)
@@ -0,0 +1,21 @@
+import pytest
+
+
+@pytest.mark.parametrize("fields", [{"no_repeat_days": -1}, {"days": 0}, {"days": 32}, {"calories": 0}])
+def test_invalid_week_plan_is_a_bad_request(client, fields):
+    response = client.post("/generate-week-plan", json={"goal": "weight_management", **fields})
+    assert response.status_code == 400
+    assert response.json()["error"].startswith("Invalid week plan request")
+
+
+def test_week_plan_avoids_repeats_in_window(client):
+    body = {"goal": "weight_management", "concern": "pitta", "days": 4, "no_repeat_days": 2}
+    plan = client.post("/generate-week-plan", json=body).json()
+    assert plan["no_repeat_days"] == 2
+    days = [set(day["meals"].values()) for day in plan["days"]]
+    assert len(days) == 4
+    for today, tomorrow in zip(days, days[1:]):
+        assert not today & tomorrow
+
+    body["no_repeat_days"] = 0
+    assert client.post("/generate-week-plan", json=body).status_code == 200
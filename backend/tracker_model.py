@@ -0,0 +1,323 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import numpy as np
+
+from catalogue import FoodCatalogue
+from dataset_registry import file_digest
+
+# Bump when the on-disk layout changes so stale artifacts are rebuilt
+ARTIFACT_VERSION = 2
+TFIDF_PARTS = ("data", "indices", "indptr")
+# Queries whose similarity rows are materialised at once
+QUERY_CHUNK = 64
+# Rows projected at once while hashing, about 34 MB of float32 projections at the defaults
+LSH_CHUNK_ROWS = 32768
+# SplitMix64 increment (2**64 / golden ratio), used to derive the LSH hyperplanes
+SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+
+class CosineNeighbors:
+    def __init__(self, tfidf_matrix):
+        """
+        Exact cosine nearest neighbours over an L2-normalized TF-IDF matrix.
+        Unlike sklearn's NearestNeighbors it keeps a reference to the matrix
+        instead of a copy, so a memory-mapped artifact stays shared.
+        Args:
+            tfidf_matrix (csr_matrix): One row per dish, rows L2-normalized
+        """
+        self.tfidf_matrix = tfidf_matrix
+
+    def kneighbors(self, query_vecs, n_neighbors=3):
+        """
+        Same return shape as NearestNeighbors.kneighbors: (distances, indices),
+        each (n_queries, n_neighbors), nearest first, row order on ties.
+        Works on the sparse similarity product, QUERY_CHUNK queries at a
+        time: a row sharing no term with a query is exactly at distance 1,
+        so no dense (queries x rows) matrix is ever built.
+        """
+        rows = self.tfidf_matrix.shape[0]
+        k = min(n_neighbors, rows)
+        distances = np.empty((query_vecs.shape[0], k))
+        indices = np.empty((query_vecs.shape[0], k), dtype=np.int64)
+        for start in range(0, query_vecs.shape[0], QUERY_CHUNK):
+            similarities = (query_vecs[start:start + QUERY_CHUNK] @ self.tfidf_matrix.T).tocsr()
+            for i in range(similarities.shape[0]):
+                lo, hi = similarities.indptr[i], similarities.indptr[i + 1]
+                distances[start + i], indices[start + i] = nearest_rows(
+                    similarities.indices[lo:hi], similarities.data[lo:hi], k)
+        return distances, indices
+
+
+def nearest_rows(cols: np.ndarray, similarities: np.ndarray, k: int) -> tuple:
+    """
+    The k nearest rows for one query, given its nonzero similarities: the
+    rows nearer than distance 1 by (distance, row id), then the lowest row
+    ids among the rest, which all sit at distance 1.
+    Returns:
+        tuple: (distances, row ids), each of length k
+    """
+    row_distances = np.clip(1.0 - similarities, 0.0, 2.0)
+    near = row_distances < 1.0
+    cols, row_distances = cols[near].astype(np.int64), row_distances[near]
+    if len(cols) > k:
+        kth = np.partition(row_distances, k - 1)[k - 1]
+        keep = row_distances <= kth
+        cols, row_distances = cols[keep], row_distances[keep]
+    order = np.lexsort((cols, row_distances))[:k]
+    cols, row_distances = cols[order], row_distances[order]
+    if len(cols) < k:
+        fill = np.setdiff1d(np.arange(2 * k), cols)[:k - len(cols)]
+        cols = np.concatenate([cols, fill])
+        row_distances = np.concatenate([row_distances, np.ones(len(fill))])
+    return row_distances, cols
+
+
+class LshNeighbors:
+    def __init__(self, tfidf_matrix, tables: int = 16, bits: int = 16, probes: int = 1, seed: int = 0):
+        """
+        Approximate cosine nearest neighbours by random-hyperplane LSH. Each
+        of the hash tables keys a row by the signs of its projections on
+        `bits` random hyperplanes, so rows at a small angle tend to share a
+        bucket. A query ranks only the rows in its buckets (and, with
+        probes=1, the buckets one bit away), exactly as CosineNeighbors
+        would. More tables or probes raise recall; more bits make buckets
+        smaller and queries faster. The hyperplanes are never stored: a
+        term's entries are derived from a hash of (seed, term), only for
+        the terms a projected chunk contains.
+        Args:
+            tfidf_matrix (csr_matrix): One row per dish, rows L2-normalized
+            tables (int): Number of hash tables
+            bits (int): Hyperplanes per table, 1 to 30
+            probes (int): 0 to read only the query's own bucket per table,
+                1 to also read the buckets differing from it in one bit
+            seed (int): Hyperplane seed; the same seed builds the same index
+        """
+        if not 1 <= bits <= 30:
+            raise ValueError("bits must be between 1 and 30")
+        if tables < 1 or probes not in (0, 1):
+            raise ValueError("tables must be positive and probes 0 or 1")
+        self.tfidf_matrix = tfidf_matrix
+        self.tables = tables
+        self.bits = bits
+        self.seed = seed
+        self.weights = 1 << np.arange(bits, dtype=np.int32)
+        # Codes to XOR into a query's code: its own bucket, then the neighbouring ones
+        own = np.zeros(1, dtype=np.int32)
+        self.flips = np.concatenate([own, self.weights]) if probes else own
+
+        # Per table, row ids sorted by bucket code, for searchsorted lookups
+        codes = self._codes(tfidf_matrix)
+        self.order = np.ascontiguousarray(np.argsort(codes, axis=0, kind="stable").T.astype(np.int32))
+        self.sorted_codes = np.ascontiguousarray(np.take_along_axis(codes, self.order.T, axis=0).T)
+
+    def planes(self, terms: np.ndarray) -> np.ndarray:
+        """
+        Hyperplane entries of the given term ids: (len(terms), tables * bits)
+        float32 standard normals, by Box-Muller from splitmix64 hashes of
+        (seed, term), two entries per hash.
+        """
+        pairs = -(-self.tables * self.bits // 2)
+        keys = terms.astype(np.uint64)[:, None] * np.uint64(pairs) + np.arange(pairs, dtype=np.uint64)
+        hashes = splitmix64(keys + splitmix64(np.array([self.seed], dtype=np.uint64)))
+        # Uniforms in (0, 1] from the high and low 32 bits
+        scale = np.float32(2.0 ** -32)
+        u1 = ((hashes >> np.uint64(32)).astype(np.float32) + 1) * scale
+        u2 = ((hashes & np.uint64(0xFFFFFFFF)).astype(np.float32) + 1) * scale
+        radius, angle = np.sqrt(-2 * np.log(u1)), np.float32(2 * np.pi) * u2
+        normals = np.stack([radius * np.cos(angle), radius * np.sin(angle)], axis=2).reshape(len(terms), -1)
+        return normals[:, :self.tables * self.bits]
+
+    def _codes(self, matrix) -> np.ndarray:
+        # (rows, tables) bucket codes, projected in chunks to bound memory
+        codes = np.empty((matrix.shape[0], self.tables), dtype=np.int32)
+        for start in range(0, matrix.shape[0], LSH_CHUNK_ROWS):
+            chunk = matrix[start:start + LSH_CHUNK_ROWS].tocsr()
+            # Only the chunk's terms get hyperplane entries, as columns 0..n-1
+            terms, columns = np.unique(chunk.indices, return_inverse=True)
+            local = type(chunk)((chunk.data, columns.reshape(-1), chunk.indptr), shape=(chunk.shape[0], len(terms)))
+            signs = np.asarray(local @ self.planes(terms)) > 0
+            codes[start:start + LSH_CHUNK_ROWS] = signs.reshape(-1, self.tables, self.bits) @ self.weights
+        return codes
+
+    def _candidates(self, code: np.ndarray) -> np.ndarray:
+        probe_codes = code[:, None] ^ self.flips
+        parts = []
+        for table in range(self.tables):
+            lo = np.searchsorted(self.sorted_codes[table], probe_codes[table], "left")
+            hi = np.searchsorted(self.sorted_codes[table], probe_codes[table], "right")
+            parts.extend(self.order[table][a:b] for a, b in zip(lo.tolist(), hi.tolist()) if b > a)
+        return np.unique(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int32)
+
+    def kneighbors(self, query_vecs, n_neighbors=3):
+        """
+        Same contract as CosineNeighbors.kneighbors, over the candidate rows.
+        Queries with fewer than n_neighbors candidates are searched exactly.
+        """
+        rows = self.tfidf_matrix.shape[0]
+        k = min(n_neighbors, rows)
+        codes = self._codes(query_vecs)
+        distances = np.empty((query_vecs.shape[0], k))
+        indices = np.empty((query_vecs.shape[0], k), dtype=np.int64)
+        for i in range(query_vecs.shape[0]):
+            query = query_vecs[i]
+            if not query.nnz:
+                # No known terms: every row is at distance 1, lower row ids win
+                distances[i], indices[i] = 1.0, np.arange(k)
+                continue
+            candidates = self._candidates(codes[i])
+            if len(candidates) < k:
+                similarities = (query @ self.tfidf_matrix.T).tocsr()
+                distances[i], indices[i] = nearest_rows(similarities.indices, similarities.data, k)
+                continue
+            similarities = (query @ self.tfidf_matrix[candidates].T).toarray().ravel()
+            candidate_distances = np.clip(1.0 - similarities, 0.0, 2.0)
+            nearest = np.lexsort((candidates, candidate_distances))[:k]
+            distances[i], indices[i] = candidate_distances[nearest], candidates[nearest]
+        return distances, indices
+
+
+def splitmix64(x: np.ndarray) -> np.ndarray:
+    """
+    SplitMix64 finalizer over a uint64 array: well-mixed, platform
+    independent hash values (arithmetic wraps modulo 2**64).
+    """
+    x = x + SPLITMIX_GAMMA
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+NEIGHBOR_BACKENDS = {"exact": CosineNeighbors, "lsh": LshNeighbors}
+
+
+def build_neighbors(backend: str, tfidf_matrix, options: dict = None):
+    """
+    Nearest-neighbour model for the ML fallback.
+    Args:
+        backend (str): "exact" (CosineNeighbors) or "lsh" (LshNeighbors)
+        tfidf_matrix (csr_matrix): One row per dish, rows L2-normalized
+        options (dict): Keyword arguments for the backend, e.g. {"tables": 16}
+    """
+    if backend not in NEIGHBOR_BACKENDS:
+        raise ValueError(f"Unknown ML neighbours backend: {backend}")
+    return NEIGHBOR_BACKENDS[backend](tfidf_matrix, **(options or {}))
+
+
+def artifact_path(csv_file: str, artifact_root: str) -> str:
+    """
+    Versioned artifact directory for the current contents of csv_file.
+    """
+    return os.path.join(artifact_root, f"v{ARTIFACT_VERSION}-{file_digest(csv_file)[:16]}")
+
+
+def save_model(path: str, vectorizer, tfidf_matrix, catalogue):
+    """
+    Write the fitted vocabulary, CSR TF-IDF arrays and the dataset catalogue
+    (nutrition matrix and text columns) as .npy/.json files. The directory is
+    renamed into place once complete, so readers never see a partial artifact.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(path))
+    try:
+        with open(os.path.join(tmp_dir, "vocabulary.json"), "w", encoding="utf-8") as f:
+            json.dump({term: int(i) for term, i in vectorizer.vocabulary_.items()}, f)
+        np.save(os.path.join(tmp_dir, "idf.npy"), vectorizer.idf_)
+        for part in TFIDF_PARTS:
+            np.save(os.path.join(tmp_dir, f"tfidf_{part}.npy"), getattr(tfidf_matrix, part))
+        catalogue.save(os.path.join(tmp_dir, "catalogue"))
+        with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "version": ARTIFACT_VERSION,
+                "rows": tfidf_matrix.shape[0],
+                "vocabulary_size": tfidf_matrix.shape[1],
+                "numeric_cols": catalogue.numeric_cols,
+            }, f)
+        os.rename(tmp_dir, path)
+    except OSError:
+        # Another process published the same artifact first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.exists(os.path.join(path, "manifest.json")):
+            raise
+
+
+class SavedTfidf:
+    def __init__(self, path: str, rows: int, vocabulary_size: int):
+        """
+        The fitted vectorizer and TF-IDF matrix of an artifact, read on first
+        load() so scikit-learn and SciPy are only imported once a lookup
+        actually needs the ML fallback.
+        """
+        self.path = path
+        self.rows = rows
+        self.vocabulary_size = vocabulary_size
+        self._model = None
+        self._lock = threading.Lock()
+
+    def load(self) -> tuple:
+        """
+        Returns:
+            tuple: (vectorizer, tfidf_matrix), the matrix memory-mapped
+        """
+        with self._lock:
+            if self._model is None:
+                import scipy.sparse as sp
+                from sklearn.feature_extraction.text import TfidfVectorizer
+
+                with open(os.path.join(self.path, "vocabulary.json"), encoding="utf-8") as f:
+                    vectorizer = TfidfVectorizer(vocabulary=json.load(f))
+                vectorizer.idf_ = np.load(os.path.join(self.path, "idf.npy"))
+                parts = tuple(np.load(os.path.join(self.path, f"tfidf_{part}.npy"), mmap_mode="r")
+                              for part in TFIDF_PARTS)
+                tfidf_matrix = sp.csr_matrix(parts, shape=(self.rows, self.vocabulary_size), copy=False)
+                self._model = (vectorizer, tfidf_matrix)
+            return self._model
+
+
+def fit_tfidf(names: list) -> tuple:
+    """
+    Fit a TF-IDF vectorizer on dish names.
+    Returns:
+        tuple: (vectorizer, tfidf_matrix)
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    vectorizer = TfidfVectorizer()
+    return vectorizer, vectorizer.fit_transform(names)
+
+
+def load_model(path: str, numeric_cols):
+    """
+    Load an artifact written by save_model: the catalogue memory-mapped now,
+    the TF-IDF model on demand (see SavedTfidf).
+    Returns:
+        tuple: (SavedTfidf, catalogue), or None if the artifact is missing
+        or was built for a different layout
+    """
+    try:
+        with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest["version"] != ARTIFACT_VERSION or manifest["numeric_cols"] != numeric_cols:
+        return None
+
+    tfidf = SavedTfidf(path, manifest["rows"], manifest["vocabulary_size"])
+    return tfidf, FoodCatalogue.load(os.path.join(path, "catalogue"))
+
+
+if __name__ == "__main__":
+    # Usage: python tracker_model.py <calorie_csv> [artifact_root]
+    args = sys.argv[1:]
+    if len(args) < 1:
+        print("Usage: python tracker_model.py <calorie_csv> [artifact_root]")
+        sys.exit(1)
+    csv_file = args[0]
+    artifact_root = args[1] if len(args) > 1 else os.path.join(os.path.dirname(os.path.abspath(csv_file)), "artifacts")
+    from Calorie_tracker import FoodTracker
+    FoodTracker(csv_file, artifact_root)
+    print(artifact_path(csv_file, artifact_root))